@@ -0,0 +1,119 @@
+"""
+Load benchmark: sync handlers (weaviate_spy.main) vs async handlers (weaviate_spy.async_main).
+Both apps are driven in-process through httpx's ASGI transport against the fake client,
+so the numbers reflect handler scheduling rather than network cost.
+
+Latencies and req/s count successful responses only; the run exits non-zero if any
+request failed. The default concurrencies stay within the sync app's 40-thread pool;
+higher values mostly measure queueing in front of it.
+
+Run with: python -m benchmarks.bench_async --latency 0.01 --concurrency 10 40
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+from loguru import logger
+
+from benchmarks.fake_weaviate import FakeAsyncClient, FakeClient, FakeDataset
+
+
+def load_apps():
+    """Import both apps from a scratch cwd so the static mount resolves."""
+    workdir = tempfile.mkdtemp(prefix="weaviate-spy-bench-")
+    os.makedirs(os.path.join(workdir, "static"))
+    os.chdir(workdir)
+    from weaviate_spy import async_main, main
+    return main, async_main
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def drive(app, path: str, body: dict, requests: int, concurrency: int) -> dict:
+    """Fire requests at the app with the given concurrency and collect latencies of successful responses."""
+    latencies: list[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                # Bypass the sync app's query cache so both apps do the same Weaviate work
+                response = await http.post(path, json=body, headers={"Cache-Control": "no-cache"})
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    if not latencies:
+        return {"p50_ms": float("nan"), "p99_ms": float("nan"), "mean_ms": float("nan"), "rps": 0.0, "errors": errors}
+    return {
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "rps": len(latencies) / elapsed,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=10_000)
+    parser.add_argument("--latency", type=float, default=0.01, help="Fake Weaviate latency per call (s)")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 40])
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    sync_main, async_main = load_apps()
+    data = FakeDataset(n=args.objects, latency=args.latency)
+    sync_main.clients.cluster().attach(FakeClient(data))
+    async_main.client = FakeAsyncClient(data)
+
+    scenarios = [
+        ("fetch", "/class/Filmy", {"limit": args.limit}),
+        ("semantic", "/class/Filmy", {"limit": args.limit, "query": "vesmír"}),
+        ("bm25", "/class/Filmy/bm25", {"limit": args.limit, "query": "vesmír"}),
+    ]
+
+    print(f"objects={args.objects} latency={args.latency * 1000:.1f}ms requests={args.requests}")
+    print(f"{'scenario':<10} {'conc':>5} {'mode':<6} {'p50 ms':>9} {'p99 ms':>9} {'req/s':>9} {'errors':>6}")
+    failed = 0
+    for name, path, body in scenarios:
+        for concurrency in args.concurrency:
+            for mode, app in (("sync", sync_main.app), ("async", async_main.app)):
+                result = asyncio.run(drive(app, path, body, args.requests, concurrency))
+                print(
+                    f"{name:<10} {concurrency:>5} {mode:<6} {result['p50_ms']:>9.2f} "
+                    f"{result['p99_ms']:>9.2f} {result['rps']:>9.1f} {result['errors']:>6}"
+                )
+                failed += result["errors"]
+    if failed:
+        print(f"{failed} requests failed", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Export benchmark: throughput (MB/s) and peak RSS of GET /class/{name}/export.
+Streams a lazily generated fixture (1M objects by default) through the endpoint's
+StreamingResponse body, so the numbers cover iteration and serialization only.
+
+Run with: python -m benchmarks.bench_export --objects 1000000 --format ndjson csv parquet
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from loguru import logger
+
+from benchmarks.fake_weaviate import FakeClient, FakeDataset
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def consume(response) -> int:
+    """Drain a StreamingResponse body and return the number of bytes produced."""
+    total = 0
+    async for chunk in response.body_iterator:
+        total += len(chunk)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=1_000_000)
+    parser.add_argument("--dims", type=int, default=0, help="Vector dimensions (exported when > 0)")
+    parser.add_argument("--format", nargs="+", default=["ndjson", "csv", "parquet"])
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    workdir = tempfile.mkdtemp(prefix="weaviate-spy-bench-")
+    os.makedirs(os.path.join(workdir, "static"))
+    os.chdir(workdir)
+    from weaviate_spy import main as app_main
+
+    data = FakeDataset(n=args.objects, latency=0, lazy=True, dims=args.dims)
+    app_main.clients.cluster().attach(FakeClient(data))
+
+    print(f"objects={args.objects} dims={args.dims} baseline_rss={peak_rss_mb():.1f}MB")
+    print(f"{'format':<8} {'MB':>9} {'seconds':>8} {'MB/s':>8} {'obj/s':>10} {'peak RSS MB':>12}")
+    for fmt in args.format:
+        response = app_main.export_collection("Filmy", format=fmt, include_vector=args.dims > 0)
+        start = time.perf_counter()
+        size = asyncio.run(consume(response))
+        elapsed = time.perf_counter() - start
+        mb = size / (1024 * 1024)
+        print(
+            f"{fmt:<8} {mb:>9.1f} {elapsed:>8.2f} {mb / elapsed:>8.1f} "
+            f"{args.objects / elapsed:>10.0f} {peak_rss_mb():>12.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Serialization microbenchmark: row responses (format_object + jsonable_encoder +
+json) against columnar responses (columnar_objects + orjson) for one result page.
+Reports objects/sec, response bytes and peak traced allocations per page.
+
+Run with: python -m benchmarks.bench_serialize --page 100 --text-words 300
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from loguru import logger
+
+from benchmarks.fake_weaviate import make_objects
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page", type=int, default=100, help="Objects per response page")
+    parser.add_argument("--text-words", type=int, default=300, help="Words in the description property")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Time budget per mode")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    workdir = tempfile.mkdtemp(prefix="weaviate-spy-bench-")
+    os.makedirs(os.path.join(workdir, "static"))
+    os.chdir(workdir)
+    from weaviate_spy import main as app_main
+
+    objects = make_objects(args.page)
+    for obj in objects:
+        words = obj.properties["description"].split()
+        obj.properties["description"] = " ".join(words[i % len(words)] for i in range(args.text_words))
+        obj.properties["tags"] = words[:5]
+    properties = list(objects[0].properties)
+
+    def render(format: str) -> bytes:
+        payload = {
+            "data": app_main.serialize_objects(objects, properties, format),
+            "count": len(objects),
+            "search_type": "semantic",
+        }
+        return app_main.render_response(payload, format, {}).body
+
+    print(f"page={args.page} text_words={args.text_words}")
+    print(f"{'format':<9} {'obj/s':>10} {'KB/page':>9} {'peak alloc KB/page':>19} {'speedup':>8}")
+    baseline = None
+    for format in ("rows", "columnar"):
+        size = len(render(format))
+        pages = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < args.seconds:
+            render(format)
+            pages += 1
+        rate = pages * args.page / (time.perf_counter() - start)
+
+        tracemalloc.start()
+        render(format)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        baseline = baseline or rate
+        print(f"{format:<9} {rate:>10.0f} {size / 1024:>9.1f} {peak / 1024:>19.1f} {rate / baseline:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+Startup benchmark: cold-start time until the UI is served, and first-paint transfer.
+Starts the server (local uvicorn or the image built from the Dockerfile), polls until
+/ answers, then loads index.html and the scripts and stylesheets it references as a
+browser would (Accept-Encoding: br, gzip), and reloads the page with the ETags it got.
+
+Per cold start it reports:
+  ready        process start -> first 200 on /
+  first paint  ready + index.html and its assets
+  wire KB      bytes transferred for the first load
+  reload       requests a browser still makes on reload (immutable assets are skipped),
+               how many of them were answered 304, and their bytes
+
+By default Weaviate is a local listener that accepts connections and never answers,
+so a server that waits for Weaviate before serving shows up in `ready`.
+
+Run with:
+  python -m benchmarks.bench_startup --static frontend/dist              local uvicorn
+  python -m benchmarks.bench_startup --docker aisideskicks-weaviate-spy  container
+Compare against an image built from an earlier commit by passing its tag to --docker.
+"""
+
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSET_LINK = re.compile(r'<(?:script[^>]*\ssrc|link[^>]*\shref)="(/[^"]+)"')
+
+
+def accept_encoding() -> str:
+    """What a current browser sends; br only when httpx can decode it here."""
+    try:
+        import brotli  # noqa: F401
+        return "br, gzip"
+    except ImportError:
+        return "gzip"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def stalled_listener() -> socket.socket:
+    """A listener whose connections complete but are never answered, like an overloaded Weaviate."""
+    listener = socket.socket()
+    listener.bind(("0.0.0.0", 0))
+    listener.listen(128)
+    return listener
+
+
+def launch(
+    args: argparse.Namespace, port: int, workdir: str, weaviate: tuple[str, int, int],
+) -> tuple[subprocess.Popen, list[str] | None]:
+    """Start the server; returns the process and the command that stops it (Docker only)."""
+    host, http_port, grpc_port = weaviate
+    env = {
+        "WEAVIATE_HOST": host,
+        "WEAVIATE_PORT": str(http_port),
+        "WEAVIATE_GRPC_HOST": host,
+        "WEAVIATE_GRPC_PORT": str(grpc_port),
+    }
+    if args.docker:
+        name = f"weaviate-spy-bench-{port}"
+        command = ["docker", "run", "--rm", "--name", name, "-p", f"{port}:7777",
+                   "--add-host", "host.docker.internal:host-gateway"]
+        for key, value in env.items():
+            command += ["-e", f"{key}={value}"]
+        command += [args.docker, "uvicorn", args.app, "--host", "0.0.0.0", "--port", "7777"]
+        return subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL), ["docker", "stop", name]
+    command = [sys.executable, "-m", "uvicorn", args.app, "--host", "127.0.0.1", "--port", str(port)]
+    env = {**os.environ, **env, "PYTHONPATH": REPO_ROOT}
+    return subprocess.Popen(command, cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL), None
+
+
+def wait_ready(http: httpx.Client, process: subprocess.Popen, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if http.get("/").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"Server not ready after {timeout:.0f}s")
+
+
+def load_page(http: httpx.Client, headers: dict) -> tuple[int, list[tuple[str, httpx.Response]]]:
+    """GET / and every asset it links; returns (wire bytes, [(path, response)])."""
+    index = http.get("/", headers=headers)
+    responses = [("/", index)]
+    for path in dict.fromkeys(ASSET_LINK.findall(index.text)):
+        responses.append((path, http.get(path, headers=headers)))
+    return sum(r.num_bytes_downloaded for _, r in responses), responses
+
+
+def reload_page(http: httpx.Client, headers: dict, first: list[tuple[str, httpx.Response]]) -> dict:
+    """Repeat the load like a browser with a warm cache: skip immutable assets, revalidate the rest."""
+    requests = not_modified = wire = 0
+    for path, response in first:
+        if "immutable" in response.headers.get("cache-control", ""):
+            continue
+        conditional = dict(headers)
+        if "etag" in response.headers:
+            conditional["If-None-Match"] = response.headers["etag"]
+        again = http.get(path, headers=conditional)
+        requests += 1
+        not_modified += again.status_code == 304
+        wire += again.num_bytes_downloaded
+    return {"requests": requests, "not_modified": not_modified, "wire_bytes": wire}
+
+
+def cold_start(args: argparse.Namespace, workdir: str) -> dict:
+    port = free_port()
+    headers = {"Accept-Encoding": accept_encoding()}
+    listeners = []
+    if args.weaviate_host:
+        weaviate = (args.weaviate_host, 8080, 50051)
+    else:
+        listeners = [stalled_listener(), stalled_listener()]
+        host = "host.docker.internal" if args.docker else "127.0.0.1"
+        weaviate = (host, listeners[0].getsockname()[1], listeners[1].getsockname()[1])
+    start = time.perf_counter()
+    process, stop = launch(args, port, workdir, weaviate)
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=args.timeout) as http:
+            wait_ready(http, process, args.timeout)
+            ready = time.perf_counter() - start
+            wire, responses = load_page(http, headers)
+            first_paint = time.perf_counter() - start
+            encodings = sorted({r.headers.get("content-encoding", "identity") for _, r in responses})
+            return {
+                "ready_s": ready,
+                "first_paint_s": first_paint,
+                "files": len(responses),
+                "wire_bytes": wire,
+                "encodings": encodings,
+                "reload": reload_page(http, headers, responses),
+            }
+    finally:
+        if stop:
+            subprocess.run(stop, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        process.terminate()
+        process.wait(timeout=30)
+        for listener in listeners:
+            listener.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docker", metavar="IMAGE", help="Run this image instead of a local uvicorn")
+    parser.add_argument("--static", default=os.path.join(REPO_ROOT, "frontend", "dist"),
+                        help="Frontend build served by the local server")
+    parser.add_argument("--app", default="weaviate_spy.main:app", help="e.g. weaviate_spy.async_main:app")
+    parser.add_argument("--weaviate-host", help="Real Weaviate host (ports 8080/50051); default: a stalled listener")
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="weaviate-spy-startup-")
+    if not args.docker:
+        if not os.path.isfile(os.path.join(args.static, "index.html")):
+            print(f"No frontend build in {args.static}; run `npm run build` in frontend/ or pass --static",
+                  file=sys.stderr)
+            return 2
+        os.symlink(os.path.abspath(args.static), os.path.join(workdir, "static"))
+
+    runs = []
+    print(f"{'run':>3} {'ready s':>8} {'paint s':>8} {'files':>5} {'wire KB':>8} {'reload req':>10} {'304':>4} "
+          f"{'reload KB':>9}  encodings")
+    for number in range(1, args.runs + 1):
+        run = cold_start(args, workdir)
+        runs.append(run)
+        reload = run["reload"]
+        print(
+            f"{number:>3} {run['ready_s']:>8.3f} {run['first_paint_s']:>8.3f} {run['files']:>5} "
+            f"{run['wire_bytes'] / 1024:>8.1f} {reload['requests']:>10} {reload['not_modified']:>4} "
+            f"{reload['wire_bytes'] / 1024:>9.1f}  {','.join(run['encodings'])}"
+        )
+    summary = {
+        "ready_s": statistics.median(r["ready_s"] for r in runs),
+        "first_paint_s": statistics.median(r["first_paint_s"] for r in runs),
+    }
+    print(f"median ready {summary['ready_s']:.3f}s, first paint {summary['first_paint_s']:.3f}s")
+
+    if args.output:
+        report = {
+            "meta": {
+                "target": args.docker or "local",
+                "app": args.app,
+                "weaviate_host": args.weaviate_host or "stalled",
+                "runs": args.runs,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            },
+            "runs": runs,
+            "summary": summary,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
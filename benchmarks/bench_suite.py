@@ -0,0 +1,255 @@
+"""
+Endpoint benchmark suite: drives the read endpoints of weaviate_spy.main through
+httpx's ASGI transport at several concurrency levels and page sizes, recording
+requests/sec, latency percentiles and RSS. Throughput and latency count successful
+responses only. Results are compared against a JSON baseline (written on the first run):
+more errors than the baseline, or a slowdown beyond --tolerance, is a regression.
+
+Backends:
+  fake      in-process fake client with a synthetic dataset and per-call latency
+  weaviate  a local Weaviate, e.g. `docker compose -f dummy/docker-compose.yml up -d`
+            with the Filmy collection loaded by dummy/weaviate_dummy.py
+
+Generation (plain and streamed) runs against the fake's canned texts, or needs an LLM
+behind Weaviate; repeats are served from the generation cache, which Cache-Control does
+not bypass. Not covered: export (see bench_export), collection profiles and analysis
+jobs (background scans with persisted state), import (uploads), and the cache, cluster
+and search-gate admin endpoints.
+
+Run with: python -m benchmarks.bench_suite --backend fake --concurrency 1 10 50 --page-size 20 100
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+from loguru import logger
+
+from benchmarks.bench_async import percentile
+from benchmarks.bench_export import peak_rss_mb
+from benchmarks.fake_weaviate import FakeClient, FakeDataset
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def rss_mb() -> float:
+    """Current resident set size in MB (/proc on Linux, peak RSS elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except OSError:
+        return peak_rss_mb()
+
+
+def scenarios(collection: str, object_id: str) -> list[tuple[str, str, str, dict | None, bool]]:
+    """(name, method, path, body, paged) per endpoint; paged scenarios run once per page size."""
+    base = f"/class/{collection}"
+    return [
+        ("health", "GET", "/health", None, False),
+        ("schema", "GET", "/schema", None, False),
+        ("fetch", "POST", base, {}, True),
+        ("fetch_columnar", "POST", f"{base}?format=columnar", {}, True),
+        ("semantic", "POST", base, {"query": "vesmír"}, True),
+        ("bm25", "POST", f"{base}/bm25", {"query": "vesmír"}, True),
+        ("hybrid", "POST", f"{base}/hybrid", {"query": "vesmír", "alpha": 0.5}, True),
+        ("batch", "POST", f"{base}/batch", {"queries": [
+            {"mode": "semantic", "query": "vesmír"},
+            {"mode": "bm25", "query": "vesmír"},
+            {"mode": "hybrid", "query": "vesmír", "alphas": [0.25, 0.75]},
+        ]}, True),
+        ("fusion", "POST", f"{base}/fusion", {"query": "vesmír", "alphas": [0.25, 0.5, 0.75]}, True),
+        ("aggregate", "POST", f"{base}/aggregate", {"group_by": ["genre"], "metrics": ["year"]}, False),
+        ("facets", "GET", f"{base}/facets?group_by=genre,origin", None, False),
+        ("object", "GET", f"{base}/object/{object_id}", None, False),
+        ("generate", "POST", f"{base}/generate", {"query": "vesmír", "prompt": "Shrň {title}", "grouped_task": "Co mají společného?"}, True),
+        ("generate_stream", "POST", f"{base}/generate/stream", {"query": "vesmír", "prompt": "Shrň {title}"}, True),
+        ("projection", "POST", f"{base}/vectors/projection", {"limit": 2000}, False),
+        ("metrics", "GET", "/metrics", None, False),
+    ]
+
+
+async def drive(
+    app, method: str, path: str, body: dict | None, requests: int, concurrency: int, cached: bool, warmup: int,
+) -> dict:
+    """Fire warmup requests, then the measured ones with the given concurrency; latencies count 200s only."""
+    latencies: list[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    headers = {} if cached else {"Cache-Control": "no-cache"}
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as http:
+        for _ in range(warmup):
+            await http.request(method, path, json=body, headers=headers)
+
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                response = await http.request(method, path, json=body, headers=headers)
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    if not latencies:
+        nan = float("nan")
+        return {"rps": 0.0, "p50_ms": nan, "p95_ms": nan, "p99_ms": nan, "mean_ms": nan, "errors": errors}
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "errors": errors,
+    }
+
+
+def compare(results: list[dict], baseline: dict, tolerance: float) -> list[str]:
+    """Describe results with more errors than the baseline, or whose req/s or p99 moved beyond tolerance."""
+    previous = {(r["scenario"], r["concurrency"], r["page_size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        before = previous.get((result["scenario"], result["concurrency"], result["page_size"]))
+        if before is None:
+            continue
+        label = f"{result['scenario']} c={result['concurrency']} page={result['page_size']}"
+        if result["errors"] > before["errors"]:
+            regressions.append(f"{label}: errors {before['errors']} -> {result['errors']}")
+        if result["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{label}: req/s {before['rps']:.1f} -> {result['rps']:.1f}")
+        # NaN when no request succeeded; the comparison is then False and the errors above report it
+        if result["p99_ms"] > before["p99_ms"] * (1 + tolerance):
+            regressions.append(f"{label}: p99 {before['p99_ms']:.2f}ms -> {result['p99_ms']:.2f}ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["fake", "weaviate"], default="fake")
+    parser.add_argument("--collection", default="Filmy")
+    parser.add_argument("--objects", type=int, default=10_000, help="Fake dataset size")
+    parser.add_argument("--latency", type=float, default=0.005, help="Fake Weaviate latency per call (s)")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario and setting")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed requests before each measurement")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--page-size", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--only", nargs="+", help="Run only these scenarios")
+    parser.add_argument("--cached", action="store_true", help="Let the query cache serve repeated requests")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="Overwrite the baseline with this run")
+    parser.add_argument("--output", help="Also write this run's results to a JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    baseline_path = os.path.abspath(args.baseline)
+    output_path = os.path.abspath(args.output) if args.output else None
+
+    workdir = tempfile.mkdtemp(prefix="weaviate-spy-bench-")
+    os.makedirs(os.path.join(workdir, "static"))
+    os.chdir(workdir)
+    from weaviate_spy import main as app_main
+
+    cluster = app_main.clients.cluster()
+    if args.backend == "fake":
+        cluster.attach(FakeClient(FakeDataset(n=args.objects, latency=args.latency, dims=32), name=args.collection))
+    else:
+        cluster.probe()
+        if not cluster.healthy:
+            print(
+                f"No Weaviate at {cluster.config.http_host}:{cluster.config.http_port} ({cluster.last_error}). "
+                "Start one with `docker compose -f dummy/docker-compose.yml up -d` and load dummy/weaviate_dummy.py.",
+                file=sys.stderr,
+            )
+            return 2
+
+    async def first_object_id() -> str:
+        transport = httpx.ASGITransport(app=app_main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            response = await http.post(f"/class/{args.collection}", json={"limit": 1})
+            response.raise_for_status()
+            return response.json()["data"][0]["uuid"]
+
+    object_id = asyncio.run(first_object_id())
+
+    results = []
+    print(f"backend={args.backend} collection={args.collection} requests={args.requests} rss={rss_mb():.1f}MB")
+    print(
+        f"{'scenario':<15} {'conc':>5} {'page':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} "
+        f"{'p99 ms':>9} {'errors':>6} {'RSS MB':>8}"
+    )
+    for name, method, path, body, paged in scenarios(args.collection, object_id):
+        if args.only and name not in args.only:
+            continue
+        for page_size in args.page_size if paged else [None]:
+            request_body = body if page_size is None else {**body, "limit": page_size}
+            for concurrency in args.concurrency:
+                result = asyncio.run(drive(
+                    app_main.app, method, path, request_body, args.requests, concurrency, args.cached, args.warmup,
+                ))
+                result = {
+                    "scenario": name, "concurrency": concurrency, "page_size": page_size,
+                    **result, "rss_mb": rss_mb(), "peak_rss_mb": peak_rss_mb(),
+                }
+                results.append(result)
+                print(
+                    f"{name:<15} {concurrency:>5} {page_size or '-':>5} {result['rps']:>9.1f} "
+                    f"{result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+                    f"{result['errors']:>6} {result['rss_mb']:>8.1f}"
+                )
+
+    run = {
+        "meta": {
+            "backend": args.backend,
+            "collection": args.collection,
+            "objects": args.objects if args.backend == "fake" else None,
+            "latency": args.latency if args.backend == "fake" else None,
+            "requests": args.requests,
+            "cached": args.cached,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+    if output_path:
+        with open(output_path, "w") as f:
+            json.dump(run, f, indent=2)
+
+    if args.update_baseline or not os.path.exists(baseline_path):
+        with open(baseline_path, "w") as f:
+            json.dump(run, f, indent=2)
+        print(f"Baseline written to {baseline_path}")
+        return 0
+
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    if baseline.get("meta", {}).get("backend") != args.backend:
+        print(f"Baseline {baseline_path} was recorded on another backend; not comparing", file=sys.stderr)
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} regression(s) against {baseline_path} (tolerance {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"No regressions against {baseline_path} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""
+Retrieval evaluation: runs a golden query set through the search endpoints of
+weaviate_spy.main over a grid of modes and parameters (semantic certainty, hybrid
+alpha, fusion method) and reports recall@k, MRR@k and nDCG@k next to p50/p95
+latency. Settings on the quality/latency Pareto front (nDCG vs p95) are marked.
+
+Golden sets are JSONL, one query per line:
+  {"query": "space opera", "relevant": ["<uuid>", ...]}              binary relevance
+  {"query": "space opera", "relevant": {"<uuid>": 2, "<uuid>": 1}}   graded relevance
+
+Backends:
+  fake      in-process SearchableDataset (BM25 and vector rankings over synthetic topics)
+            with its own golden set, so no Weaviate or --golden is needed
+  weaviate  a local Weaviate, e.g. `docker compose -f dummy/docker-compose.yml up -d`; needs --golden
+
+Every (setting, query) request is shuffled into one concurrent run, so all settings
+see the same load; requests send Cache-Control: no-cache to bypass the query cache.
+
+Run with: python -m benchmarks.eval_suite --alphas 0 0.25 0.5 0.75 1 --certainties 0.5 0.6 0.7 --output eval.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+from loguru import logger
+
+from benchmarks.bench_async import percentile
+from benchmarks.fake_weaviate import FakeClient, SearchableDataset
+from weaviate_spy.ranking import ndcg_at_k, pareto_front, recall_at_k, reciprocal_rank
+
+
+def load_golden(path: str) -> list[dict]:
+    """Read golden rows, normalising `relevant` to {uuid: grade}."""
+    golden = []
+    with open(path) as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            relevant = row.get("relevant")
+            if not row.get("query") or not relevant:
+                raise ValueError(f"{path}:{number}: expected query and relevant")
+            if isinstance(relevant, list):
+                relevant = {uuid: 1 for uuid in relevant}
+            golden.append({"query": row["query"], "relevant": {str(u): float(g) for u, g in relevant.items()}})
+    return golden
+
+
+def grid(
+    collection: str,
+    modes: list[str],
+    certainties: list[float],
+    alphas: list[float],
+    fusion_methods: list[str],
+) -> list[dict]:
+    """One {label, mode, path, body} per point of the parameter grid."""
+    base = f"/class/{collection}"
+    settings = []
+    if "semantic" in modes:
+        settings += [
+            {"label": f"semantic certainty={c}", "mode": "semantic", "path": base, "body": {"certainty": c}}
+            for c in certainties
+        ]
+    if "bm25" in modes:
+        settings.append({"label": "bm25", "mode": "bm25", "path": f"{base}/bm25", "body": {}})
+    if "hybrid" in modes:
+        settings += [
+            {"label": f"hybrid alpha={a}", "mode": "hybrid", "path": f"{base}/hybrid", "body": {"alpha": a}}
+            for a in alphas
+        ]
+    if "fusion" in modes:
+        settings += [
+            {"label": f"fusion {m}", "mode": "fusion", "path": f"{base}/fusion", "body": {"method": m}}
+            for m in fusion_methods
+        ]
+    return settings
+
+
+async def evaluate(
+    app, settings: list[dict], golden: list[dict], k: int, concurrency: int, repeat: int, warmup: bool, seed: int,
+) -> list[dict]:
+    """Run every setting over the golden set concurrently and score the rankings."""
+    latencies: list[list[float]] = [[] for _ in settings]
+    rankings: list[dict[int, list[str]]] = [{} for _ in settings]
+    errors = [0] * len(settings)
+    semaphore = asyncio.Semaphore(concurrency)
+    headers = {"Cache-Control": "no-cache"}
+    transport = httpx.ASGITransport(app=app)
+
+    def body(setting: dict, query: str) -> dict:
+        request = {**setting["body"], "query": query, "limit": k, "properties": ["title"]}
+        if setting["mode"] != "fusion":
+            request["count"] = "none"  # Only the search itself is timed
+        return request
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://eval", timeout=None) as http:
+        if warmup:
+            for setting in settings:
+                await http.post(setting["path"], json=body(setting, golden[0]["query"]), headers=headers)
+
+        async def one(s: int, q: int):
+            setting = settings[s]
+            async with semaphore:
+                start = time.perf_counter()
+                response = await http.post(setting["path"], json=body(setting, golden[q]["query"]), headers=headers)
+                latencies[s].append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors[s] += 1
+                return
+            rankings[s][q] = [row["uuid"] for row in response.json()["data"]]
+
+        runs = [(s, q) for s in range(len(settings)) for q in range(len(golden)) for _ in range(repeat)]
+        random.Random(seed).shuffle(runs)
+        await asyncio.gather(*(one(s, q) for s, q in runs))
+
+    results = []
+    for s, setting in enumerate(settings):
+        ranked = [rankings[s].get(q, []) for q in range(len(golden))]
+        results.append({
+            "label": setting["label"],
+            "mode": setting["mode"],
+            "params": setting["body"],
+            f"recall@{k}": statistics.fmean(recall_at_k(r, g["relevant"], k) for r, g in zip(ranked, golden)),
+            "mrr": statistics.fmean(reciprocal_rank(r, g["relevant"], k) for r, g in zip(ranked, golden)),
+            f"ndcg@{k}": statistics.fmean(ndcg_at_k(r, g["relevant"], k) for r, g in zip(ranked, golden)),
+            "p50_ms": percentile(latencies[s], 50) * 1000,
+            "p95_ms": percentile(latencies[s], 95) * 1000,
+            "errors": errors[s],
+        })
+    front = pareto_front([(r[f"ndcg@{k}"], r["p95_ms"]) for r in results])
+    for result, optimal in zip(results, front):
+        result["pareto"] = optimal
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["fake", "weaviate"], default="fake")
+    parser.add_argument("--collection", default="Filmy")
+    parser.add_argument("--golden", help="Golden set JSONL (required for --backend weaviate)")
+    parser.add_argument("--queries", type=int, default=50, help="Fake golden set size")
+    parser.add_argument("--objects", type=int, default=2000, help="Fake dataset size")
+    parser.add_argument("--latency", type=float, default=0.002, help="Fake Weaviate latency per call (s)")
+    parser.add_argument("--dump-golden", help="Write the golden set used to this JSONL file")
+    parser.add_argument("--modes", nargs="+", default=["semantic", "bm25", "hybrid", "fusion"],
+                        choices=["semantic", "bm25", "hybrid", "fusion"])
+    parser.add_argument("--certainties", type=float, nargs="+", default=[0.5, 0.6, 0.7])
+    parser.add_argument("--alphas", type=float, nargs="+", default=[0.0, 0.25, 0.5, 0.75, 1.0])
+    parser.add_argument("--fusion-methods", nargs="+", default=["rrf", "relative_score", "combsum"],
+                        choices=["rrf", "relative_score", "combsum"])
+    parser.add_argument("-k", type=int, default=10, help="Cut-off for recall, MRR and nDCG")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight across all settings")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per (setting, query), for steadier latency")
+    parser.add_argument("--no-warmup", action="store_true", help="Skip the untimed request per setting")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    golden_path = os.path.abspath(args.golden) if args.golden else None
+    dump_path = os.path.abspath(args.dump_golden) if args.dump_golden else None
+    output_path = os.path.abspath(args.output) if args.output else None
+
+    workdir = tempfile.mkdtemp(prefix="weaviate-spy-eval-")
+    os.makedirs(os.path.join(workdir, "static"))
+    os.chdir(workdir)
+    from weaviate_spy import main as app_main
+
+    cluster = app_main.clients.cluster()
+    if args.backend == "fake":
+        data = SearchableDataset(n=args.objects, latency=args.latency)
+        cluster.attach(FakeClient(data, name=args.collection))
+        golden = load_golden(golden_path) if golden_path else [
+            {"query": row["query"], "relevant": {uuid: 1.0 for uuid in row["relevant"]}}
+            for row in data.golden(args.queries, seed=args.seed)
+        ]
+    else:
+        if not golden_path:
+            print("--backend weaviate needs a golden set (--golden queries.jsonl)", file=sys.stderr)
+            return 2
+        cluster.probe()
+        if not cluster.healthy:
+            print(
+                f"No Weaviate at {cluster.config.http_host}:{cluster.config.http_port} ({cluster.last_error}). "
+                "Start one with `docker compose -f dummy/docker-compose.yml up -d` and load dummy/weaviate_dummy.py.",
+                file=sys.stderr,
+            )
+            return 2
+        golden = load_golden(golden_path)
+    if not golden:
+        print("Empty golden set", file=sys.stderr)
+        return 2
+
+    if dump_path:
+        with open(dump_path, "w") as f:
+            for row in golden:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    settings = grid(args.collection, args.modes, args.certainties, args.alphas, args.fusion_methods)
+    results = asyncio.run(evaluate(
+        app_main.app, settings, golden, args.k, args.concurrency, args.repeat, not args.no_warmup, args.seed,
+    ))
+
+    k = args.k
+    print(f"backend={args.backend} collection={args.collection} queries={len(golden)} k={k} concurrency={args.concurrency}")
+    print(
+        f"{'setting':<30} {f'recall@{k}':>10} {'MRR':>7} {f'nDCG@{k}':>8} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'errors':>6}  pareto"
+    )
+    for r in sorted(results, key=lambda r: -r[f"ndcg@{k}"]):
+        print(
+            f"{r['label']:<30} {r[f'recall@{k}']:>10.3f} {r['mrr']:>7.3f} {r[f'ndcg@{k}']:>8.3f} "
+            f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['errors']:>6}  {'*' if r['pareto'] else ''}"
+        )
+
+    if output_path:
+        report = {
+            "meta": {
+                "backend": args.backend,
+                "collection": args.collection,
+                "golden": golden_path,
+                "queries": len(golden),
+                "k": k,
+                "concurrency": args.concurrency,
+                "repeat": args.repeat,
+                "objects": args.objects if args.backend == "fake" else None,
+                "latency": args.latency if args.backend == "fake" else None,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            },
+            "results": results,
+            "pareto": [r["label"] for r in results if r["pareto"]],
+        }
+        with open(output_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {output_path}")
+    return 1 if any(r["errors"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,381 @@
+"""
+In-process stand-in for the Weaviate v4 client used by the benchmarks.
+Serves a synthetic N-object dataset with a configurable per-call latency,
+in both sync (WeaviateClient) and async (WeaviateAsyncClient) flavours.
+Aggregates honour group_by and integer/text return_metrics, computed from the data.
+SearchableDataset ranks queries by BM25 and vector similarity for retrieval evaluation.
+"""
+
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from collections import Counter
+from types import SimpleNamespace
+
+import numpy as np
+from weaviate.collections.classes.aggregate import AggregateInteger, AggregateText, TopOccurrence
+
+GENRES = ["Sci-Fi", "Drama", "Komedie", "Thriller"]
+ORIGINS = ["USA", "Česká republika", "Francie", "Jižní Korea"]
+
+
+def generate_objects(n: int, seed: int = 42, dims: int = 0):
+    """Lazily yield n synthetic objects shaped like the dummy Filmy collection."""
+    rnd = random.Random(seed)
+    for i in range(n):
+        yield SimpleNamespace(
+            uuid=uuid.UUID(int=rnd.getrandbits(128)),
+            properties={
+                "title": f"Film {i}",
+                "description": " ".join(rnd.choice(["vesmír", "láska", "vězení", "rodina", "zloděj"]) for _ in range(30)),
+                "genre": rnd.choice(GENRES),
+                "year": rnd.randint(1950, 2024),
+                "origin": rnd.choice(ORIGINS),
+            },
+            metadata=SimpleNamespace(certainty=0.8, distance=0.2, score=1.0, explain_score=""),
+            vector={"default": [rnd.random() for _ in range(dims)]} if dims else {},
+            generative=None,
+        )
+
+
+def make_objects(n: int, seed: int = 42, dims: int = 0) -> list[SimpleNamespace]:
+    """Build n synthetic objects in memory."""
+    return list(generate_objects(n, seed, dims))
+
+
+class FakeDataset:
+    """
+    Shared synthetic data and call log behind both client flavours.
+    With lazy=True nothing is materialised: pages are empty and the
+    collection iterator generates objects on the fly (for 1M-object runs).
+    """
+
+    def __init__(self, n: int = 10_000, latency: float = 0.005, lazy: bool = False, dims: int = 0):
+        self.size = n
+        self.dims = dims
+        self.lazy = lazy
+        self.objects = [] if lazy else make_objects(n, dims=dims)
+        self.latency = latency
+        self.calls: list[str] = []
+        self.config = SimpleNamespace(
+            properties=[
+                SimpleNamespace(name="title", data_type="text"),
+                SimpleNamespace(name="description", data_type="text"),
+                SimpleNamespace(name="genre", data_type="text"),
+                SimpleNamespace(name="year", data_type="int"),
+                SimpleNamespace(name="origin", data_type="text"),
+            ],
+            vectorizer="text2vec-ollama",
+        )
+
+    def page(
+        self, name: str, limit: int | None = None, offset: int | None = None, after: str | None = None, **kwargs,
+    ) -> SimpleNamespace:
+        """Return one page of objects for any query method; after= starts past that uuid, in list order."""
+        self.calls.append(name)
+        start = offset or 0
+        if after is not None:
+            start = next(i for i, obj in enumerate(self.objects) if str(obj.uuid) == str(after)) + 1
+        return SimpleNamespace(objects=self.objects[start:start + (limit or 20)])
+
+    def count(self, name: str, group_by=None, return_metrics=None, **kwargs) -> SimpleNamespace:
+        """Return an aggregate result: total_count, metrics over the data, or one group per value."""
+        self.calls.append(name)
+        if group_by is None:
+            return SimpleNamespace(total_count=self.size, properties=self.metrics(self.objects, return_metrics))
+        groups: dict = {}
+        for obj in self.objects:
+            groups.setdefault(obj.properties.get(group_by.prop), []).append(obj)
+        ordered = sorted(groups.items(), key=lambda item: -len(item[1]))[:group_by.limit]
+        return SimpleNamespace(groups=[
+            SimpleNamespace(
+                grouped_by=SimpleNamespace(prop=group_by.prop, value=value),
+                total_count=len(members),
+                properties=self.metrics(members, return_metrics),
+            )
+            for value, members in ordered
+        ])
+
+    @staticmethod
+    def metrics(objects: list, return_metrics) -> dict:
+        """Integer and text metrics for the requested properties (others are skipped)."""
+        if not return_metrics:
+            return {}
+        result = {}
+        for metric in return_metrics:
+            values = [obj.properties.get(metric.property_name) for obj in objects]
+            values = [v for v in values if v is not None]
+            if type(metric).__name__ == "_MetricsInteger" and values:
+                result[metric.property_name] = AggregateInteger(
+                    count=len(values), maximum=max(values), mean=statistics.fmean(values),
+                    median=statistics.median(values), minimum=min(values),
+                    mode=statistics.mode(values), sum_=sum(values),
+                )
+            elif type(metric).__name__ == "_MetricsText":
+                top = Counter(values).most_common(metric.limit)
+                result[metric.property_name] = AggregateText(
+                    count=len(values), top_occurrences=[TopOccurrence(count=c, value=v) for v, c in top],
+                )
+        return result
+
+    def generate(
+        self,
+        name: str,
+        filters=None,
+        single_prompt: str | None = None,
+        grouped_task: str | None = None,
+        limit: int | None = None,
+        **kwargs,
+    ) -> SimpleNamespace:
+        """
+        Return objects with canned generations, like generate.*: a Filter.by_id() filter picks
+        the objects, otherwise the first page. Texts echo the prompt, so they vary per request.
+        """
+        self.calls.append(name)
+        if filters is not None and getattr(filters, "target", None) == "_id":
+            if not hasattr(self, "_by_id"):
+                self._by_id = {str(obj.uuid): obj for obj in self.objects}
+            objects = [self._by_id[str(v)] for v in filters.value if str(v) in self._by_id][:limit]
+        else:
+            objects = self.objects[:limit or 20]
+        if single_prompt:
+            objects = [
+                SimpleNamespace(**{**vars(obj), "generative": SimpleNamespace(text=f"{single_prompt}: {obj.properties['title']}")})
+                for obj in objects
+            ]
+        grouped = SimpleNamespace(text=f"{grouped_task}: {len(objects)} objects") if grouped_task else None
+        return SimpleNamespace(objects=objects, generative=grouped)
+
+    def by_id(self, name: str, object_id: uuid.UUID | str, return_properties: list[str] | None = None, **kwargs):
+        """Return one object by uuid (None if missing), like query.fetch_object_by_id."""
+        self.calls.append(name)
+        if not hasattr(self, "_by_id"):
+            self._by_id = {str(obj.uuid): obj for obj in self.objects}
+        obj = self._by_id.get(str(object_id))
+        if obj is not None and return_properties is not None:
+            obj = SimpleNamespace(**{**vars(obj), "properties": {p: obj.properties.get(p) for p in return_properties}})
+        return obj
+
+    def iterator(self, include_vector: bool = False, return_properties: list[str] | None = None, **kwargs):
+        """Stream every object, like collection.iterator()."""
+        self.calls.append("iterator")
+        source = generate_objects(self.size, dims=self.dims) if self.lazy else iter(self.objects)
+        for obj in source:
+            if self.latency:
+                time.sleep(self.latency / 1000)  # amortised per-object share of a batch round trip
+            if return_properties is not None:
+                obj = SimpleNamespace(**{**vars(obj), "properties": {p: obj.properties.get(p) for p in return_properties}})
+            yield obj
+
+
+QUERY_METHODS = ("fetch_objects", "near_text", "near_vector", "near_object", "bm25", "hybrid")
+AGGREGATE_METHODS = ("over_all", "near_text", "near_vector", "hybrid")
+
+
+def _sync_call(data: FakeDataset, fn, name: str):
+    def call(*args, **kwargs):
+        time.sleep(data.latency)
+        return fn(name, *args, **kwargs)
+    return call
+
+
+def _async_call(data: FakeDataset, fn, name: str):
+    async def call(*args, **kwargs):
+        await asyncio.sleep(data.latency)
+        return fn(name, *args, **kwargs)
+    return call
+
+
+def _collection(data: FakeDataset, wrap) -> SimpleNamespace:
+    """Build a collection facade whose methods are wrapped sync or async calls."""
+    query = SimpleNamespace(
+        **{m: wrap(data, data.page, m) for m in QUERY_METHODS},
+        fetch_object_by_id=wrap(data, data.by_id, "fetch_object_by_id"),
+    )
+    generate = SimpleNamespace(**{m: wrap(data, data.generate, f"generate.{m}") for m in QUERY_METHODS})
+    aggregate = SimpleNamespace(**{m: wrap(data, data.count, f"aggregate.{m}") for m in AGGREGATE_METHODS})
+    config = SimpleNamespace(get=wrap(data, lambda name: (data.calls.append(name), data.config)[1], "config.get"))
+    return SimpleNamespace(
+        query=query, generate=generate, aggregate=aggregate, config=config, iterator=data.iterator,
+    )
+
+
+class FakeClient:
+    """Sync client facade: collections.get / list_all with blocking latency."""
+
+    def __init__(self, data: FakeDataset, name: str = "Filmy"):
+        self.data = data
+        collection = _collection(data, _sync_call)
+        list_all = _sync_call(data, lambda n: (data.calls.append(n), {name: data.config})[1], "list_all")
+        self.collections = SimpleNamespace(get=lambda _: collection, use=lambda _: collection, list_all=list_all)
+
+    def is_ready(self) -> bool:
+        return True
+
+    def close(self):
+        pass
+
+
+class FakeAsyncClient:
+    """Async client facade: same surface, awaitable with non-blocking latency."""
+
+    def __init__(self, data: FakeDataset, name: str = "Filmy"):
+        self.data = data
+        collection = _collection(data, _async_call)
+        list_all = _async_call(data, lambda n: (data.calls.append(n), {name: data.config})[1], "list_all")
+        self.collections = SimpleNamespace(get=lambda _: collection, use=lambda _: collection, list_all=list_all)
+
+    async def is_ready(self) -> bool:
+        return True
+
+    async def close(self):
+        pass
+
+
+# Topic and filler words of SearchableDataset descriptions; subjects are generated ("téma00", ...)
+TOPICS = ["vesmír", "láska", "vězení", "rodina", "zloděj", "válka", "moře", "hory"]
+FILLER = ["film", "příběh", "život", "svět", "noc", "město", "cesta", "čas", "den", "konec"]
+
+
+class SearchableDataset(FakeDataset):
+    """
+    Synthetic collection with query-dependent rankings, for retrieval evaluation.
+    Each object has a topic and a subject word. Descriptions mix topic words, the subject,
+    stray words of other topics and subjects, and filler. Vectors are the topic direction
+    plus a weaker subject direction plus noise. bm25 scores the words (BM25), near_text /
+    near_vector / near_object the vectors (cosine, certainty = (1 + cos) / 2) and hybrid
+    fuses both like relativeScoreFusion. Filters are ignored.
+    golden() returns queries whose relevant objects share the queried topic and subject.
+    """
+
+    def __init__(
+        self,
+        n: int = 2000,
+        latency: float = 0.002,
+        subjects: int = 25,
+        dims: int = 32,
+        noise: float = 0.8,
+        seed: int = 7,
+    ):
+        super().__init__(n=0, latency=latency)
+        rnd = random.Random(seed)
+        rng = np.random.default_rng(seed)
+        self.subjects = [f"téma{i:02d}" for i in range(subjects)]
+        self.size = n
+
+        # Unit directions per topic and subject; subjects count less than topics
+        topic_vectors = rng.standard_normal((len(TOPICS), dims))
+        subject_vectors = rng.standard_normal((subjects, dims)) * 0.6
+        self.word_vectors = {
+            **{word: topic_vectors[i] for i, word in enumerate(TOPICS)},
+            **{word: subject_vectors[i] for i, word in enumerate(self.subjects)},
+        }
+
+        self.labels: list[tuple[str, str]] = []
+        vectors = np.empty((n, dims))
+        for i in range(n):
+            topic, subject = rnd.randrange(len(TOPICS)), rnd.randrange(subjects)
+            words = [TOPICS[topic]] * rnd.randint(2, 5) + [self.subjects[subject]] * rnd.randint(1, 2)
+            words += [rnd.choice(TOPICS) for _ in range(rnd.randint(0, 3))]
+            words += [rnd.choice(self.subjects) for _ in range(rnd.randint(0, 2))]
+            words += [rnd.choice(FILLER) for _ in range(rnd.randint(10, 20))]
+            rnd.shuffle(words)
+            self.objects.append(SimpleNamespace(
+                uuid=uuid.UUID(int=rnd.getrandbits(128)),
+                properties={
+                    "title": f"Film {i}",
+                    "description": " ".join(words),
+                    "genre": rnd.choice(GENRES),
+                    "year": rnd.randint(1950, 2024),
+                    "origin": rnd.choice(ORIGINS),
+                },
+                metadata=None,
+                vector={},
+                generative=None,
+            ))
+            self.labels.append((TOPICS[topic], self.subjects[subject]))
+            vectors[i] = topic_vectors[topic] + subject_vectors[subject] + rng.standard_normal(dims) * noise
+        self.vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.index = {str(obj.uuid): i for i, obj in enumerate(self.objects)}
+
+        # Term frequencies and BM25 length normalisation (k1 = 1.2, b = 0.75)
+        self.vocabulary = {word: j for j, word in enumerate([*TOPICS, *self.subjects, *FILLER])}
+        self.tf = np.zeros((n, len(self.vocabulary)))
+        for i, obj in enumerate(self.objects):
+            for word in obj.properties["description"].split():
+                self.tf[i, self.vocabulary[word]] += 1
+        lengths = self.tf.sum(axis=1)
+        self.length_norm = 1.2 * (0.25 + 0.75 * lengths / lengths.mean())
+        df = (self.tf > 0).sum(axis=0)
+        self.idf = np.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def bm25(self, query: str) -> np.ndarray:
+        columns = [self.vocabulary[w] for w in query.lower().split() if w in self.vocabulary]
+        tf = self.tf[:, columns]
+        return (self.idf[columns] * tf * 2.2 / (tf + self.length_norm[:, None])).sum(axis=1)
+
+    def embed(self, query: str) -> np.ndarray:
+        vector = sum((self.word_vectors[w] for w in query.lower().split() if w in self.word_vectors), np.zeros(self.vectors.shape[1]))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def page(
+        self,
+        name: str,
+        limit: int | None = None,
+        offset: int | None = None,
+        query: str | None = None,
+        alpha: float = 0.75,
+        certainty: float | None = None,
+        near_vector: list[float] | None = None,
+        near_object: str | None = None,
+        **kwargs,
+    ) -> SimpleNamespace:
+        """Rank the collection for the query method; fetch_objects pages in order."""
+        method = name.split(".")[-1]
+        if method not in ("bm25", "hybrid", "near_text", "near_vector", "near_object"):
+            return super().page(name, limit, offset, **kwargs)
+        self.calls.append(name)
+
+        keyword = self.bm25(query) if method in ("bm25", "hybrid") else None
+        cosine = None
+        if method != "bm25":
+            if method == "near_vector":
+                target = np.asarray(near_vector)
+            elif method == "near_object":
+                target = self.vectors[self.index[str(near_object)]]
+            else:
+                target = self.embed(query)
+            cosine = self.vectors @ target
+
+        if method == "bm25":
+            scores, matches = keyword, keyword > 0
+        elif method == "hybrid":
+            top = keyword.max()
+            scores = alpha * (cosine + 1) / 2 + (1 - alpha) * (keyword / top if top > 0 else keyword)
+            matches = np.ones(len(scores), dtype=bool)
+        else:
+            scores = cosine
+            matches = (cosine + 1) / 2 >= certainty if certainty is not None else np.ones(len(cosine), dtype=bool)
+
+        ranked = [i for i in np.argsort(-scores, kind="stable") if matches[i]]
+        start = offset or 0
+        objects = []
+        for i in ranked[start:start + (limit or 20)]:
+            obj = self.objects[i]
+            metadata = SimpleNamespace(certainty=None, distance=None, score=float(scores[i]), explain_score="")
+            if cosine is not None:
+                metadata.certainty, metadata.distance = float((cosine[i] + 1) / 2), float(1 - cosine[i])
+            objects.append(SimpleNamespace(**{**vars(obj), "metadata": metadata}))
+        return SimpleNamespace(objects=objects)
+
+    def golden(self, queries: int = 50, seed: int = 0) -> list[dict]:
+        """Golden set rows {"query", "relevant"}: objects sharing a topic and subject, at least three per query."""
+        groups: dict[tuple[str, str], list[str]] = {}
+        for obj, label in zip(self.objects, self.labels):
+            groups.setdefault(label, []).append(str(obj.uuid))
+        pairs = sorted(label for label, members in groups.items() if len(members) >= 3)
+        picked = random.Random(seed).sample(pairs, min(queries, len(pairs)))
+        return [{"query": f"{topic} {subject}", "relevant": groups[(topic, subject)]} for topic, subject in picked]
@@ -4,15 +4,15 @@
  */
 
 import { useEffect, useState } from 'react';
-import { Layout, Menu, theme } from 'antd';
+import { Layout, Menu, Select, theme } from 'antd';
 import {
   BorderlessTableOutlined,
   TableOutlined,
   HeartOutlined,
   DatabaseOutlined,
 } from '@ant-design/icons';
-import { getSchema, healthCheck } from './api';
-import { Collection } from './types';
+import { getSchema, healthCheck, listClusters, setCluster } from './api';
+import { Collection, ClusterStatus } from './types';
 import ClassData from './ClassData';
 import Welcome from './Welcome';
 
@@ -24,12 +24,34 @@ export default function App() {
   const [collections, setCollections] = useState<Collection[]>([]);
   const [class2props, setClass2props] = useState<Record<string, Collection['properties']>>({});
   const [collapsed, setCollapsed] = useState(false);
+  const [clusters, setClusters] = useState<ClusterStatus[]>([]);
+  const [defaultCluster, setDefaultCluster] = useState<string | null>(null);
+  const [cluster, setActiveCluster] = useState<string | null>(null);
   
   const {
     token: { colorBgContainer, borderRadiusLG },
   } = theme.useToken();
 
-  // Check health on mount
+  // Load configured clusters on mount
+  useEffect(() => {
+    listClusters()
+      .then((res) => {
+        setClusters(res.clusters);
+        setDefaultCluster(res.default);
+      })
+      .catch((error) => {
+        console.error('Failed to load clusters:', error);
+      });
+  }, []);
+
+  // Switch cluster: later requests carry it, and the view goes back to the schema
+  const onClusterChange = (name: string) => {
+    setCluster(name);
+    setActiveCluster(name);
+    setPathname('/');
+  };
+
+  // Check health on mount and on cluster change
   useEffect(() => {
     healthCheck()
       .then((res) => {
@@ -38,9 +60,9 @@ export default function App() {
       .catch(() => {
         setIsHealthy(false);
       });
-  }, []);
+  }, [cluster]);
 
-  // Load schema on mount
+  // Load schema on mount and on cluster change
   useEffect(() => {
     getSchema()
       .then((schemas) => {
@@ -57,8 +79,10 @@ export default function App() {
       })
       .catch((error) => {
         console.error('Failed to load schema:', error);
+        setCollections([]);
+        setClass2props({});
       });
-  }, []);
+  }, [cluster]);
 
   // Build menu items
   const menuItems = [
@@ -139,8 +163,20 @@ export default function App() {
             display: 'flex',
             alignItems: 'center',
             justifyContent: 'flex-end',
+            gap: 16,
           }}
         >
+          {clusters.length > 1 && (
+            <Select
+              value={cluster ?? defaultCluster ?? undefined}
+              onChange={onClusterChange}
+              style={{ width: 200 }}
+              options={clusters.map((c) => ({
+                value: c.name,
+                label: `${c.name}${c.healthy ? '' : ' (down)'}`,
+              }))}
+            />
+          )}
           {isHealthy !== null && (
             <span
               style={{
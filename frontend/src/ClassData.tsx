@@ -14,8 +14,10 @@ import {
   LeftOutlined,
   RightOutlined,
 } from '@ant-design/icons';
-import { searchClass } from './api';
+import { getObject, searchClass } from './api';
+import { gridFilterToSpec } from './filters';
 import type {
+  FilterSpec,
   SearchMode,
   WeaviateObject,
   Property,
@@ -29,11 +31,36 @@ interface ClassDataProps {
   properties: Property[];
 }
 
+// Long text values arrive cut to this many characters; the full value is fetched on click
+const PREVIEW_CHARS = 500;
+
 // Custom cell renderer for truncated text with tooltip
 const TruncatedCellRenderer = (props: ICellRendererParams) => {
   const value = props.value;
   if (value === null || value === undefined) return <span>-</span>;
   
+  const field = props.colDef?.field;
+  const truncated: string[] = props.data?.truncated ?? [];
+  if (field && truncated.includes(field)) {
+    const collection = (props.context as { collection?: string })?.collection;
+    const expand = async () => {
+      if (!collection) return;
+      const full = await getObject(collection, props.data.uuid, [field]);
+      props.node.setData({
+        ...props.data,
+        [field]: full[field],
+        truncated: truncated.filter((name) => name !== field),
+      });
+    };
+    return (
+      <Tooltip title="Click to load the full value">
+        <span style={{ cursor: 'pointer' }} onClick={expand}>
+          {String(value).substring(0, 50)}... <Tag style={{ fontSize: '11px' }}>more</Tag>
+        </span>
+      </Tooltip>
+    );
+  }
+  
   const displayText = typeof value === 'object' 
     ? JSON.stringify(value) 
     : String(value);
@@ -225,10 +252,13 @@ export default function ClassData({ pathname, properties }: ClassDataProps) {
   const [totalCount, setTotalCount] = useState(0);
   const [currentPage, setCurrentPage] = useState(1);
   const [pageSize, setPageSize] = useState(20);
+  const [filters, setFilters] = useState<FilterSpec | undefined>(undefined);
   
   const gridRef = useRef<AgGridReact>(null);
   const searchInputRef = useRef<HTMLInputElement>(null);
   const isMounted = useRef(true);
+  // Identifies this grid's searches so a newer one cancels the previous on the server
+  const searchSession = useRef(Math.random().toString(36).slice(2));
 
   // Extract collection name from pathname
   const collection = pathname.replace('/class/', '');
@@ -249,7 +279,8 @@ export default function ClassData({ pathname, properties }: ClassDataProps) {
   const gridContext = useMemo(() => ({
     maxScore,
     searchType: searchMode,
-  }), [maxScore, searchMode]);
+    collection,
+  }), [maxScore, searchMode, collection]);
 
   // Build column definitions
   const columnDefs: ColDef[] = [
@@ -274,7 +305,7 @@ export default function ClassData({ pathname, properties }: ClassDataProps) {
       resizable: true,
       cellRenderer: cellRenderer,
       autoHeight: true,
-      filter: 'agTextColumnFilter',
+      filter: ['int', 'number'].includes(prop.data_type) ? 'agNumberColumnFilter' : 'agTextColumnFilter',
       filterParams: {
         buttons: ['apply', 'reset'],
         closeOnApply: true,
@@ -356,7 +387,19 @@ export default function ClassData({ pathname, properties }: ClassDataProps) {
   // Reset page to 1 when search params change
   useEffect(() => {
     setCurrentPage(1);
-  }, [keyword, certainty, alpha, searchMode]);
+  }, [keyword, certainty, alpha, searchMode, filters]);
+
+  // Filters belong to one collection's columns
+  useEffect(() => {
+    gridRef.current?.api?.setFilterModel(null);
+    setFilters(undefined);
+  }, [collection]);
+
+  // Column filters are evaluated by Weaviate, not just on the current page
+  const handleFilterChanged = useCallback(() => {
+    const model = gridRef.current?.api.getFilterModel() ?? {};
+    setFilters(gridFilterToSpec(model, propertyNames));
+  }, [propertyNames]);
 
   // Initial fetch and when search params change
   // Only fetch when properties are available (not empty)
@@ -366,6 +409,8 @@ export default function ClassData({ pathname, properties }: ClassDataProps) {
     }
     
     let cancelled = false;
+    // Abort the stale request when the search changes; the server drops it too
+    const controller = new AbortController();
     const doFetch = async () => {
       setLoading(true);
       
@@ -391,6 +436,15 @@ export default function ClassData({ pathname, properties }: ClassDataProps) {
           alpha,
           mode: searchMode,
           properties: propertyNames,
+          // Keyword/hybrid have no cheap exact total; estimate so the pager can step forward
+          count: searchMode === 'semantic' ? undefined : 'estimated',
+          // Deep pages of a plain fetch are served from the after= cursor instead of offset
+          pagination: 'cursor',
+          // Long text blobs come back as previews; cells load the rest on demand
+          previewChars: PREVIEW_CHARS,
+          filters,
+          session: searchSession.current,
+          signal: controller.signal,
         });
         
         console.log('[ClassData] Response:', response);
@@ -400,6 +454,9 @@ export default function ClassData({ pathname, properties }: ClassDataProps) {
           setTotalCount(response.count);
         }
       } catch (error) {
+        if (cancelled) {
+          return;
+        }
         console.error('[ClassData] Failed to fetch data:', error);
         console.error('[ClassData] Error details:', {
           message: error instanceof Error ? error.message : String(error),
@@ -420,8 +477,9 @@ export default function ClassData({ pathname, properties }: ClassDataProps) {
     
     return () => {
       cancelled = true;
+      controller.abort();
     };
-  }, [collection, keyword, certainty, alpha, searchMode, pageSize, currentPage, propertyNames]);
+  }, [collection, keyword, certainty, alpha, searchMode, pageSize, currentPage, propertyNames, filters]);
 
   // Handle search
   const handleSearch = (value: string) => {
@@ -554,6 +612,7 @@ export default function ClassData({ pathname, properties }: ClassDataProps) {
                 headerHeight={48}
                 rowHeight={48}
                 pagination={false}
+                onFilterChanged={handleFilterChanged}
                 getRowStyle={(params) => {
                   if (params.node.rowIndex !== null && params.node.rowIndex !== undefined) {
                     return {
@@ -8,13 +8,36 @@ import type {
   ApiResponse,
   WeaviateObject,
   SearchMode,
+  CountStrategy,
+  FilterSpec,
   AggregateResponse,
+  BatchQuery,
+  BatchResponse,
+  FusionSource,
+  FusionMethod,
+  FusionResponse,
+  ProjectionResponse,
+  AnalysisJob,
+  DuplicatePair,
+  Outlier,
   HealthResponse,
+  ClustersResponse,
   CollectionInfo,
+  CollectionProfile,
 } from './types';
 
 const API_BASE = '';
 
+// Weaviate cluster sent with every request; null means the server's default
+let activeCluster: string | null = null;
+
+/**
+ * Select the Weaviate cluster used by subsequent requests
+ */
+export function setCluster(name: string | null): void {
+  activeCluster = name;
+}
+
 /**
  * Make an API request with error handling
  */
@@ -23,11 +46,12 @@ async function apiRequest<T>(
   options: RequestInit = {}
 ): Promise<T> {
   const response = await fetch(`${API_BASE}${endpoint}`, {
+    ...options,
     headers: {
       'Content-Type': 'application/json',
+      ...(activeCluster ? { 'X-Weaviate-Cluster': activeCluster } : {}),
       ...options.headers,
     },
-    ...options,
   });
 
   if (!response.ok) {
@@ -52,6 +76,23 @@ export async function getCollectionInfo(collectionName: string): Promise<Collect
   return apiRequest<CollectionInfo>(`/collection/${collectionName}`);
 }
 
+/**
+ * Get a collection's data-quality profile; refresh 'auto' updates it in the background when stale
+ */
+export async function getCollectionProfile(
+  collectionName: string,
+  refresh: 'auto' | 'never' | 'incremental' | 'full' = 'auto'
+): Promise<CollectionProfile> {
+  return apiRequest<CollectionProfile>(`/collection/${collectionName}/profile?refresh=${refresh}`);
+}
+
+/**
+ * List configured Weaviate clusters
+ */
+export async function listClusters(): Promise<ClustersResponse> {
+  return apiRequest<ClustersResponse>('/clusters');
+}
+
 /**
  * Health check
  */
@@ -72,6 +113,13 @@ export async function searchClass(
     alpha?: number;
     mode?: SearchMode;
     properties?: string[];
+    count?: CountStrategy;
+    pagination?: 'offset' | 'cursor';
+    previewChars?: number;
+    filters?: FilterSpec;
+    // Searches sharing a session supersede each other on the server (search-as-you-type)
+    session?: string;
+    signal?: AbortSignal;
   } = {}
 ): Promise<ApiResponse<WeaviateObject>> {
   const {
@@ -82,6 +130,12 @@ export async function searchClass(
     alpha = 0.5,
     mode = 'semantic',
     properties,
+    count,
+    pagination,
+    previewChars,
+    filters,
+    session,
+    signal,
   } = options;
 
   // Build request body
@@ -91,6 +145,23 @@ export async function searchClass(
     properties,
   };
 
+  if (count) {
+    body.count = count;
+  }
+
+  if (previewChars) {
+    body.preview_chars = previewChars;
+  }
+
+  if (filters) {
+    body.filters = filters;
+  }
+
+  // Cursor pagination only applies to the plain fetch (no query) path
+  if (pagination && !query) {
+    body.pagination = pagination;
+  }
+
   // Determine endpoint based on search mode
   let endpoint = `/class/${collection}`;
 
@@ -119,9 +190,23 @@ export async function searchClass(
   return apiRequest<ApiResponse<WeaviateObject>>(endpoint, {
     method: 'POST',
     body: JSON.stringify(body),
+    headers: session ? { 'X-Search-Session': session } : undefined,
+    signal,
   });
 }
 
+/**
+ * Fetch one object's full property values (e.g. to expand a truncated preview)
+ */
+export async function getObject(
+  collection: string,
+  uuid: string,
+  fields?: string[]
+): Promise<WeaviateObject & Record<string, unknown>> {
+  const query = fields && fields.length > 0 ? `?fields=${encodeURIComponent(fields.join(','))}` : '';
+  return apiRequest<WeaviateObject & Record<string, unknown>>(`/class/${collection}/object/${uuid}${query}`);
+}
+
 /**
  * Legacy getClass function for backward compatibility
  */
@@ -182,6 +267,176 @@ export async function hybridSearch(
   });
 }
 
+/**
+ * Run several searches at once and compare their result sets
+ */
+export async function batchSearch(
+  collection: string,
+  queries: BatchQuery[],
+  options: {
+    limit?: number;
+    properties?: string[];
+    previewChars?: number;
+    filters?: FilterSpec;
+  } = {}
+): Promise<BatchResponse> {
+  const { limit = 20, properties, previewChars, filters } = options;
+  const body: Record<string, unknown> = { queries, limit };
+  if (properties) {
+    body.properties = properties;
+  }
+  if (previewChars !== undefined) {
+    body.preview_chars = previewChars;
+  }
+  if (filters) {
+    body.filters = filters;
+  }
+
+  return apiRequest<BatchResponse>(`/class/${collection}/batch`, {
+    method: 'POST',
+    body: JSON.stringify(body),
+  });
+}
+
+/**
+ * Fuse bm25 / semantic / near_object candidates locally, optionally reranking the top
+ */
+export async function fusionSearch(
+  collection: string,
+  query: string,
+  options: {
+    sources?: FusionSource[];
+    nearObject?: string;
+    weights?: Partial<Record<FusionSource, number>>;
+    method?: FusionMethod;
+    candidates?: number;
+    alphas?: number[];
+    limit?: number;
+    properties?: string[];
+    previewChars?: number;
+    filters?: FilterSpec;
+    rerank?: boolean;
+    rerankTop?: number;
+  } = {}
+): Promise<FusionResponse> {
+  const body: Record<string, unknown> = {
+    query,
+    sources: options.sources,
+    near_object: options.nearObject,
+    weights: options.weights,
+    method: options.method,
+    candidates: options.candidates,
+    alphas: options.alphas,
+    limit: options.limit,
+    properties: options.properties,
+    preview_chars: options.previewChars,
+    filters: options.filters,
+    rerank: options.rerank,
+    rerank_top: options.rerankTop,
+  };
+
+  return apiRequest<FusionResponse>(`/class/${collection}/fusion`, {
+    method: 'POST',
+    body: JSON.stringify(body),
+  });
+}
+
+/**
+ * Project object vectors to 2D/3D; points are decoded into one Float32Array (count * dimensions)
+ */
+export async function projectVectors(
+  collection: string,
+  options: {
+    method?: 'pca' | 'random';
+    dimensions?: 2 | 3;
+    limit?: number;
+    vectorName?: string;
+    label?: string;
+  } = {}
+): Promise<ProjectionResponse & { values: Float32Array }> {
+  const body: Record<string, unknown> = {
+    method: options.method ?? 'pca',
+    dimensions: options.dimensions ?? 2,
+    limit: options.limit ?? 10000,
+    encoding: 'base64',
+  };
+  if (options.vectorName) {
+    body.vector_name = options.vectorName;
+  }
+  if (options.label) {
+    body.label = options.label;
+  }
+
+  const response = await apiRequest<ProjectionResponse>(`/class/${collection}/vectors/projection`, {
+    method: 'POST',
+    body: JSON.stringify(body),
+  });
+  const bytes = Uint8Array.from(atob(response.points as string), (ch) => ch.charCodeAt(0));
+  return { ...response, values: new Float32Array(bytes.buffer) };
+}
+
+/**
+ * Start a near-duplicate / outlier job over a collection's vectors
+ */
+export async function startDuplicateAnalysis(
+  collection: string,
+  options: { threshold?: number; neighbors?: number; outlierQuantile?: number; vectorName?: string } = {}
+): Promise<AnalysisJob> {
+  const body: Record<string, unknown> = {};
+  if (options.threshold !== undefined) {
+    body.threshold = options.threshold;
+  }
+  if (options.neighbors !== undefined) {
+    body.neighbors = options.neighbors;
+  }
+  if (options.outlierQuantile !== undefined) {
+    body.outlier_quantile = options.outlierQuantile;
+  }
+  if (options.vectorName) {
+    body.vector_name = options.vectorName;
+  }
+  return apiRequest<AnalysisJob>(`/class/${collection}/analysis/duplicates`, {
+    method: 'POST',
+    body: JSON.stringify(body),
+  });
+}
+
+/**
+ * Poll an analysis job's status and progress
+ */
+export async function getAnalysisJob(jobId: string): Promise<AnalysisJob> {
+  return apiRequest<AnalysisJob>(`/analysis/jobs/${jobId}`);
+}
+
+/**
+ * Cancel a running analysis job
+ */
+export async function cancelAnalysisJob(jobId: string): Promise<AnalysisJob> {
+  return apiRequest<AnalysisJob>(`/analysis/jobs/${jobId}/cancel`, { method: 'POST' });
+}
+
+/**
+ * One page of a finished job's duplicate pairs, most similar first
+ */
+export async function getDuplicates(
+  jobId: string,
+  offset = 0,
+  limit = 100
+): Promise<{ data: DuplicatePair[]; count: number }> {
+  return apiRequest(`/analysis/jobs/${jobId}/duplicates?offset=${offset}&limit=${limit}`);
+}
+
+/**
+ * One page of a finished job's outliers, least dense first
+ */
+export async function getOutliers(
+  jobId: string,
+  offset = 0,
+  limit = 100
+): Promise<{ data: Outlier[]; count: number }> {
+  return apiRequest(`/analysis/jobs/${jobId}/outliers?offset=${offset}&limit=${limit}`);
+}
+
 /**
  * Generative search (RAG)
  */
@@ -218,15 +473,29 @@ export async function generativeSearch(
 }
 
 /**
- * Aggregate collection
+ * Aggregate collection: stats for `metrics` properties (['*'] for all) and value counts per `groupBy` property
  */
 export async function aggregateCollection(
   collection: string,
-  groupBy?: string
+  options: {
+    groupBy?: string[];
+    metrics?: string[];
+    topOccurrences?: number;
+    filters?: FilterSpec;
+  } = {}
 ): Promise<AggregateResponse> {
   const body: Record<string, unknown> = {};
-  if (groupBy) {
-    body.group_by = groupBy;
+  if (options.groupBy && options.groupBy.length > 0) {
+    body.group_by = options.groupBy;
+  }
+  if (options.metrics) {
+    body.metrics = options.metrics;
+  }
+  if (options.topOccurrences !== undefined) {
+    body.top_occurrences = options.topOccurrences;
+  }
+  if (options.filters) {
+    body.filters = options.filters;
   }
   
   return apiRequest<AggregateResponse>(`/class/${collection}/aggregate`, {
@@ -234,3 +503,18 @@ export async function aggregateCollection(
     body: JSON.stringify(body),
   });
 }
+
+/**
+ * Facet panel data: stats for every property plus value counts for `groupBy` properties (cached server-side)
+ */
+export async function getFacets(
+  collection: string,
+  groupBy: string[] = [],
+  top = 10
+): Promise<AggregateResponse> {
+  const params = new URLSearchParams({ top: String(top) });
+  if (groupBy.length > 0) {
+    params.set('group_by', groupBy.join(','));
+  }
+  return apiRequest<AggregateResponse>(`/class/${collection}/facets?${params}`);
+}
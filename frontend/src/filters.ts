@@ -0,0 +1,83 @@
+/**
+ * Grid filters -> server-side filter DSL
+ * Translates the AG Grid filter model into a FilterSpec so filtering runs in Weaviate
+ */
+
+import type { FilterSpec } from './types';
+
+// One AG Grid text/number condition, or a combined (AND/OR) condition
+interface GridCondition {
+  filterType?: string;
+  type?: string;
+  filter?: string | number | null;
+  filterTo?: number | null;
+  operator?: 'AND' | 'OR';
+  conditions?: GridCondition[];
+}
+
+/**
+ * Translate a single grid condition; returns null for conditions Weaviate cannot express
+ */
+function conditionToSpec(field: string, condition: GridCondition): FilterSpec | null {
+  if (condition.conditions && condition.conditions.length > 0) {
+    const parts = condition.conditions
+      .map((c) => conditionToSpec(field, c))
+      .filter((c): c is FilterSpec => c !== null);
+    if (parts.length === 0) return null;
+    if (parts.length === 1) return parts[0];
+    return condition.operator === 'OR' ? { or: parts } : { and: parts };
+  }
+
+  const value = condition.filter;
+  switch (condition.type) {
+    case 'equals':
+      return { field, op: 'equal', value };
+    case 'notEqual':
+      return { field, op: 'not_equal', value };
+    case 'contains':
+      return { field, op: 'like', value: `*${value}*` };
+    case 'notContains':
+      return { not: { field, op: 'like', value: `*${value}*` } };
+    case 'startsWith':
+      return { field, op: 'like', value: `${value}*` };
+    case 'endsWith':
+      return { field, op: 'like', value: `*${value}` };
+    case 'lessThan':
+      return { field, op: 'less_than', value };
+    case 'lessThanOrEqual':
+      return { field, op: 'less_or_equal', value };
+    case 'greaterThan':
+      return { field, op: 'greater_than', value };
+    case 'greaterThanOrEqual':
+      return { field, op: 'greater_or_equal', value };
+    case 'inRange':
+      return { field, op: 'between', value: [value, condition.filterTo] };
+    case 'blank':
+      return { field, op: 'is_none', value: true };
+    case 'notBlank':
+      return { field, op: 'is_none', value: false };
+    default:
+      return null;
+  }
+}
+
+/**
+ * Build one filter from the grid's filter model; columns are ANDed together.
+ * The uuid column maps to the _id metadata field; only the listed fields are sent.
+ */
+export function gridFilterToSpec(
+  model: Record<string, GridCondition>,
+  fields: string[]
+): FilterSpec | undefined {
+  const parts: FilterSpec[] = [];
+  Object.entries(model).forEach(([column, condition]) => {
+    const field = column === 'uuid' ? '_id' : column;
+    if (field !== '_id' && !fields.includes(field)) return;
+    // _id only supports exact matches
+    if (field === '_id' && condition.type !== 'equals' && condition.type !== 'notEqual') return;
+    const spec = conditionToSpec(field, condition);
+    if (spec) parts.push(spec);
+  });
+  if (parts.length === 0) return undefined;
+  return parts.length === 1 ? parts[0] : { and: parts };
+}
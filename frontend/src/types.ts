@@ -73,6 +73,9 @@ interface Collections {
 // Search modes
 type SearchMode = 'semantic' | 'keyword' | 'hybrid';
 
+// How the backend computes ApiResponse.count
+type CountStrategy = 'none' | 'exact' | 'estimated' | 'cached';
+
 // Search parameters
 interface SearchParams {
   mode: SearchMode;
@@ -102,21 +105,170 @@ interface WeaviateObject {
   distance?: number;
   score?: number;
   explain_score?: string;
+  truncated?: string[];  // Properties cut to a preview; full values via getObject
 }
 
+// Server-side filter DSL (compiled to Weaviate Filter objects)
+type FilterOp =
+  | 'equal'
+  | 'not_equal'
+  | 'less_than'
+  | 'less_or_equal'
+  | 'greater_than'
+  | 'greater_or_equal'
+  | 'between'
+  | 'like'
+  | 'contains_any'
+  | 'contains_all'
+  | 'contains_none'
+  | 'is_none';
+
+type FilterSpec =
+  | { and: FilterSpec[] }
+  | { or: FilterSpec[] }
+  | { not: FilterSpec }
+  | { field: string; op: FilterOp; value: unknown };
+
 // API response wrapper
 interface ApiResponse<T> {
   data: T[];
   count: number;
   search_type: SearchMode | 'fetch' | 'generative';
   alpha?: number;
+  next_cursor?: string | null;  // Cursor pagination only
 }
 
 // Aggregation response
+interface AggregateMetrics {
+  count?: number | null;
+  minimum?: number | string | null;
+  maximum?: number | string | null;
+  mean?: number | null;
+  median?: number | string | null;
+  mode?: number | string | boolean | null;
+  sum?: number | null;
+  top_occurrences?: { value: string | null; count: number | null }[];
+  total_true?: number | null;
+  total_false?: number | null;
+  percentage_true?: number | null;
+  percentage_false?: number | null;
+}
+
+interface AggregateGroup {
+  value: unknown;
+  count: number | null;
+  properties?: Record<string, AggregateMetrics>;
+}
+
 interface AggregateResponse {
   total_count?: number;
-  data?: unknown;
-  group_by?: string;
+  properties?: Record<string, AggregateMetrics>;  // Per-property stats when metrics were requested
+  groups?: Record<string, AggregateGroup[]>;  // Value counts per group_by property
+}
+
+// Batch search (POST /class/{name}/batch)
+interface BatchQuery {
+  mode?: 'semantic' | 'bm25' | 'hybrid';
+  query?: string;
+  label?: string;
+  alpha?: number;
+  alphas?: number[];  // Hybrid alpha sweep, one result set per value
+  certainty?: number;
+  filters?: FilterSpec;
+}
+
+interface BatchResult {
+  label: string;
+  mode: 'semantic' | 'bm25' | 'hybrid';
+  query?: string;
+  alpha?: number;
+  certainty?: number;
+  data: WeaviateObject[];
+  count: number;
+  took_ms: number;
+  error?: string;
+}
+
+interface BatchComparison {
+  a: number;
+  b: number;
+  overlap: number;
+  jaccard: number;
+  kendall_tau: number | null;
+}
+
+interface BatchResponse {
+  results: BatchResult[];
+  comparisons: BatchComparison[];
+  took_ms: number;
+}
+
+// Rank fusion (POST /class/{name}/fusion)
+type FusionSource = 'bm25' | 'semantic' | 'near_object';
+type FusionMethod = 'rrf' | 'relative_score' | 'combsum';
+
+interface FusionBreakdown {
+  rank: number | null;  // 1-based rank in the source's candidates, null when missing
+  score: number | null;  // Raw source score (BM25 score or certainty)
+  contribution: number;  // Weighted share of the fused score
+}
+
+interface FusionRow extends WeaviateObject {
+  fusion: Partial<Record<FusionSource, FusionBreakdown>>;
+  rerank_score?: number;
+}
+
+interface FusionResponse {
+  data: FusionRow[];
+  count: number;  // Distinct candidates across sources
+  search_type: 'fusion';
+  method: FusionMethod;
+  sources: { source: FusionSource; weight: number; count: number; took_ms: number; error?: string }[];
+  stages: Record<string, number>;  // candidates, fusion, rerank, serialize, total (ms)
+  sweeps?: { alpha: number; uuids: string[] }[];
+  reranker?: string;
+}
+
+// Vector projection (POST /class/{name}/vectors/projection)
+interface ProjectionResponse {
+  method: 'pca' | 'random';
+  dimensions: 2 | 3;
+  source_dimensions: number;
+  count: number;
+  truncated: boolean;  // The collection has more objects than `limit`
+  uuid: string[];
+  encoding: 'base64' | 'list';
+  points: string | number[][];  // base64 of row-major float32 when encoding is base64
+  explained_variance?: number[];
+  labels?: unknown[];
+}
+
+// Background analysis jobs (/analysis/jobs)
+interface AnalysisJob {
+  id: string;
+  kind: 'duplicates';
+  collection: string;
+  cluster: string;
+  params: Record<string, unknown>;
+  status: 'queued' | 'running' | 'done' | 'failed' | 'cancelled';
+  phase: 'read' | 'compare' | null;
+  processed: number;
+  total: number | null;
+  error: string | null;
+  summary: { objects?: number; pairs?: number; pairs_truncated?: boolean; outliers?: number; outlier_cutoff?: number };
+  created_at: number;
+  finished_at: number | null;
+}
+
+interface DuplicatePair {
+  uuid: string;
+  duplicate_uuid: string;
+  similarity: number;
+}
+
+interface Outlier {
+  uuid: string;
+  density: number;  // Mean cosine similarity to the nearest neighbours
 }
 
 // Health check response
@@ -124,6 +276,23 @@ interface HealthResponse {
   status: 'healthy' | 'unhealthy';
   weaviate?: 'connected' | 'disconnected';
   error?: string;
+  cluster?: ClusterStatus;
+}
+
+// Weaviate cluster with its cached health status
+interface ClusterStatus {
+  name: string;
+  host: string;
+  healthy: boolean;
+  connected: boolean;
+  error: string | null;
+  failures: number;
+  checked_at: number | null;
+}
+
+interface ClustersResponse {
+  default: string;
+  clusters: ClusterStatus[];
 }
 
 // Collection info response
@@ -132,10 +301,59 @@ interface CollectionInfo {
   properties: Array<{
     name: string;
     data_type: string[];
+    profile?: PropertyProfile;  // Present once the collection has been profiled
   }>;
   vectorizer: string | null;
 }
 
+// min/max/mean and p5..p95 of a property's values (ISO strings for dates) or text lengths
+interface ValueDistribution<T = number> {
+  count: number;
+  min?: T;
+  max?: T;
+  mean?: T;
+  quantiles?: Record<string, T>;
+}
+
+interface PropertyProfile {
+  name: string;
+  data_type: string;
+  filled: number;
+  empty: number;
+  fill_rate: number | null;
+  distinct?: number;  // HyperLogLog estimate
+  length?: ValueDistribution;
+  values?: ValueDistribution<number | string>;
+  top?: Array<{ value: string | number; count: number }>;
+  top_error?: number;  // Counts in top may be low by up to this much
+  true?: number;
+  false?: number;
+}
+
+interface ProfileRefresh {
+  mode: 'full' | 'incremental';
+  status: 'running' | 'done' | 'failed' | 'cancelled';
+  processed: number;
+  total: number | null;
+  error: string | null;
+  started_at: number;
+  finished_at: number | null;
+}
+
+// 202 responses carry only collection, status: 'building' and refresh
+interface CollectionProfile {
+  collection: string;
+  status?: 'building';
+  objects?: number;
+  properties?: PropertyProfile[];
+  stale?: { updated: number; deleted: number; drift: number };
+  incremental?: boolean;
+  watermark?: string | null;
+  scanned_at?: string | null;
+  updated_at?: string | null;
+  refresh: ProfileRefresh | null;
+}
+
 // Column configuration for tables
 interface ColumnConfig {
   title: string;
@@ -165,13 +383,37 @@ export type {
   Collection,
   Collections,
   SearchMode,
+  CountStrategy,
+  FilterOp,
+  FilterSpec,
   SearchParams,
   ObjectMetadata,
   WeaviateObject,
   ApiResponse,
+  AggregateMetrics,
+  AggregateGroup,
   AggregateResponse,
+  BatchQuery,
+  BatchResult,
+  BatchComparison,
+  BatchResponse,
+  FusionSource,
+  FusionMethod,
+  FusionBreakdown,
+  FusionRow,
+  FusionResponse,
+  ProjectionResponse,
+  AnalysisJob,
+  DuplicatePair,
+  Outlier,
   HealthResponse,
+  ClusterStatus,
+  ClustersResponse,
   CollectionInfo,
+  ValueDistribution,
+  PropertyProfile,
+  ProfileRefresh,
+  CollectionProfile,
   ColumnConfig,
   PaginationConfig,
 };
@@ -0,0 +1,32 @@
+import os
+
+import pytest
+
+from benchmarks.fake_weaviate import FakeClient, SearchableDataset
+
+
+@pytest.fixture(scope="session")
+def app_main(tmp_path_factory):
+    """weaviate_spy.main, imported from a scratch cwd so the static mount resolves."""
+    workdir = tmp_path_factory.mktemp("app")
+    (workdir / "static").mkdir()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        from weaviate_spy import main
+    finally:
+        os.chdir(cwd)
+    return main
+
+
+@pytest.fixture(scope="session")
+def dataset():
+    """Searchable fake collection with query-dependent bm25 and vector rankings."""
+    return SearchableDataset(n=300, latency=0.0)
+
+
+@pytest.fixture
+def client(app_main, dataset):
+    """The fake collection attached as the default cluster's client."""
+    app_main.clients.cluster().attach(FakeClient(dataset, name="Filmy"))
+    return app_main.clients.cluster()
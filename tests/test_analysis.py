@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from weaviate_spy.analysis import find_duplicates
+
+JOB = SimpleNamespace(check=lambda: None, progress=lambda *args: None)
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    base = rng.standard_normal((40, 16)).astype(np.float32)
+    # Near-copies with growing noise, so pair similarities are spread out
+    noisy = base + rng.standard_normal(base.shape).astype(np.float32) * np.linspace(0.01, 0.6, 40)[:, None]
+    rows = np.concatenate([base, noisy])
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("max_pairs", [1, 5, 12])
+def test_truncated_pairs_are_the_most_similar(vectors, max_pairs):
+    all_pairs, all_scores, _, truncated = find_duplicates(JOB, vectors, 0.5, 5, 7, 10_000)
+    assert not truncated
+    assert len(all_scores) > 2 * max_pairs
+
+    pairs, scores, _, truncated = find_duplicates(JOB, vectors, 0.5, 5, 7, max_pairs)
+
+    assert truncated
+    assert scores.tolist() == all_scores[:max_pairs].tolist()
+    assert {tuple(p) for p in pairs} == {tuple(p) for p in all_pairs[:max_pairs]}
+
+
+@pytest.mark.parametrize("page", ["duplicates", "outliers"])
+@pytest.mark.parametrize("query", ["offset=-1", "limit=0", "limit=-3"])
+def test_result_pages_validate_offset_and_limit(app_main, page, query):
+    response = TestClient(app_main.app).get(f"/analysis/jobs/missing/{page}?{query}")
+    assert response.status_code == 422, response.text
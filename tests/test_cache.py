@@ -0,0 +1,135 @@
+import threading
+import time
+
+import pytest
+
+from weaviate_spy.cache import RefreshingCache, ResponseCache, TTLCache
+
+
+def test_response_cache_new_version_drops_collection_entries():
+    cache = ResponseCache(max_bytes=1024)
+    cache.set("Filmy", "q1", 1, b"one")
+    cache.set("Knihy", "q1", 7, b"book")
+
+    assert cache.get("Filmy", "q1", 1) == b"one"
+    assert cache.get("Filmy", "q1", 2) is None
+    assert cache.get("Knihy", "q1", 7) == b"book"
+    assert cache.stats()["version_invalidations"] == 1
+
+
+def test_response_cache_rejects_sets_from_an_older_version():
+    cache = ResponseCache(max_bytes=1024)
+    assert cache.get("Filmy", "q1", 1) is None
+    # A newer request saw version 2 while the version 1 request was still computing
+    assert cache.get("Filmy", "q2", 2) is None
+    cache.set("Filmy", "q1", 1, b"stale")
+
+    assert cache.get("Filmy", "q1", 2) is None
+    assert cache.stats()["stale_sets"] == 1
+    # The stale set did not roll the version back
+    cache.set("Filmy", "q2", 2, b"fresh")
+    assert cache.get("Filmy", "q2", 2) == b"fresh"
+
+
+def test_refreshing_cache_get_nowait_loads_in_background():
+    cache = RefreshingCache()
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        release.wait(5)
+        return 42
+
+    assert cache.get_nowait("k", load) is None
+    assert cache.get_nowait("k", load, default=-1) == -1
+    release.set()
+    deadline = time.monotonic() + 5
+    while cache.get_nowait("k", load) is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert cache.get_nowait("k", load) == 42
+    assert calls == [1]
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("short", 1, ttl=-1)
+    cache.set("long", 2)
+    assert cache.get("short", "missing") == "missing"
+    assert cache.get("long") == 2
+
+
+def test_ttl_cache_singleflight_shares_one_load():
+    cache = TTLCache(maxsize=10, ttl=60)
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def load():
+        calls.append(1)
+        release.wait(5)
+        return "value"
+
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", load))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while cache.stats()["misses"] < 8 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == ["value"] * 8
+    assert cache.get_or_load("k", load) == "value"
+    assert cache.stats()["hits"] == 1
+
+
+def test_ttl_cache_failed_load_is_not_cached():
+    cache = TTLCache()
+
+    def fail():
+        raise RuntimeError("down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("k", fail)
+    assert cache.get_or_load("k", lambda: 1) == 1
+
+
+def test_refreshing_cache_serves_stale_value_while_refreshing():
+    cache = RefreshingCache(refresh_after=0)
+    values = iter([1, 2])
+    assert cache.get("k", lambda: next(values)) == 1
+
+    assert cache.get("k", lambda: next(values)) == 1  # stale, refresh runs in the background
+    deadline = time.monotonic() + 5
+    while cache.get("k", lambda: 3) != 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.stats()["refreshes"] >= 1
+
+
+def test_refreshing_cache_evicts_least_recently_used():
+    cache = RefreshingCache(maxsize=2)
+    for key in ("a", "b"):
+        cache.get(key, lambda: key)
+    cache.get("a", lambda: "reloaded")
+    cache.get("c", lambda: "c")
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.get("a", lambda: "reloaded") == "a"
+    assert cache.get("c", lambda: "reloaded") == "c"
+    assert cache.get("b", lambda: "reloaded") == "reloaded"
@@ -0,0 +1,71 @@
+import itertools
+
+from weaviate_spy.clients import ClientRegistry, ClusterClient
+
+
+class StubWeaviate:
+    def __init__(self, number: int):
+        self.number = number
+        self.ready = True
+        self.closed = False
+
+    def is_ready(self) -> bool:
+        if self.ready is None:
+            raise ConnectionError("channel closed")
+        return self.ready
+
+    def close(self):
+        self.closed = True
+
+
+class StubConfig:
+    """Stands in for ClusterConfig; every connect() builds a new client."""
+
+    name = "stub"
+    http_host = "stub"
+
+    def __init__(self):
+        self.numbers = itertools.count()
+        self.built: list[StubWeaviate] = []
+
+    def connect(self) -> StubWeaviate:
+        self.built.append(StubWeaviate(next(self.numbers)))
+        return self.built[-1]
+
+
+def test_failed_probe_rebuilds_the_client():
+    config = StubConfig()
+    cluster = ClusterClient(config, backoff=0.0)
+    first = cluster.get()
+
+    first.ready = None
+    cluster.probe()
+    assert first.closed
+    assert cluster.client is None
+    assert not cluster.status()["healthy"]
+    assert cluster.status()["failures"] == 1
+
+    cluster.probe()
+    assert cluster.get() is config.built[1]
+    assert cluster.status()["healthy"]
+    assert cluster.status()["failures"] == 0
+
+
+def test_not_ready_keeps_the_client():
+    cluster = ClusterClient(StubConfig())
+    client = cluster.get()
+    client.ready = False
+    cluster.probe()
+    assert cluster.client is client
+    assert cluster.status()["error"] == "Weaviate not ready"
+
+
+def test_start_waits_for_the_first_probe():
+    registry = ClientRegistry([StubConfig()], probe_interval=60.0)
+    try:
+        registry.start()
+        [status] = registry.status()
+        assert status["checked_at"] is not None
+        assert status["healthy"]
+    finally:
+        registry.close()
@@ -0,0 +1,41 @@
+import pytest
+from fastapi.testclient import TestClient
+
+
+def never():
+    raise AssertionError("the exact count should not be computed")
+
+
+@pytest.mark.parametrize("returned, offset, limit, expected", [
+    (20, 0, 20, 21),  # full page: one more, so pagers offer a next page
+    (20, 40, 20, 61),
+    (7, 40, 20, 47),  # short page: the end is known
+    (0, 100, 20, 100),  # past the end
+    (0, 0, 20, 0),
+])
+def test_estimated_count(app_main, returned, offset, limit, expected):
+    assert app_main.count_results(None, "Filmy", "estimated", returned, offset, limit, never) == expected
+
+
+def test_other_strategies(app_main, client, dataset):
+    assert app_main.count_results(None, "Filmy", "none", 5, 40, 20, never) == 5
+    assert app_main.count_results(None, "Filmy", "exact", 5, 40, 20, lambda: 123) == 123
+    assert app_main.count_results(None, "Filmy", "cached", 5, 40, 20, lambda: 123, filtered=True) == 123
+    c = client.get()
+    assert app_main.count_results(c, "Filmy", "cached", 5, 40, 20, never) == dataset.size
+
+
+def search(http: TestClient, **body) -> dict:
+    response = http.post("/class/Filmy/bm25", json={"query": "vesmír", **body}, headers={"Cache-Control": "no-cache"})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_estimated_count_pages_to_the_exact_total(app_main, client):
+    http = TestClient(app_main.app)
+    matches = len(search(http, limit=1000, count="none")["data"])
+    assert 10 < matches < 300
+
+    assert search(http, limit=10, count="estimated")["count"] == 11
+    assert search(http, limit=10, offset=matches - 3, count="estimated")["count"] == matches
+    assert search(http, limit=10, offset=matches + 50, count="estimated")["count"] == matches + 50
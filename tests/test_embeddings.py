@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from weaviate_spy.embeddings import EmbeddingCache, QueryEmbedder
+
+
+class StubEmbedder:
+    model = "stub"
+
+    def __init__(self, dim: int = 8):
+        self.dim = dim
+        self.calls: list[str] = []
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        self.calls.extend(texts)
+        return [[float(len(text))] * self.dim for text in texts]
+
+
+def reopen(cache: EmbeddingCache, capacity: int | None = None, model: str | None = None) -> EmbeddingCache:
+    """Close a persisted cache's slot log and open its files again."""
+    cache._log.close()
+    return EmbeddingCache(capacity or cache.capacity, cache.path, cache.model if model is None else model)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "query-embeddings.f32")
+
+
+def test_reopen_restores_vectors(path):
+    cache = EmbeddingCache(100, path, "m1")
+    cache.put("space", [1.0] * 8)
+    cache.put("opera", [2.0] * 8)
+
+    cache = reopen(cache)
+    assert cache.stats()["size"] == 2
+    assert cache.stats()["dim"] == 8
+    assert cache.get("space") == [1.0] * 8
+    assert cache.get("opera") == [2.0] * 8
+
+
+def test_reopen_with_other_capacity_rebuilds(path):
+    cache = EmbeddingCache(100, path, "m1")
+    cache.put("space", [1.0] * 8)
+
+    cache = reopen(cache, capacity=200)
+    assert cache.stats()["size"] == 0
+    assert cache.get("space") is None
+    cache.put("space", [3.0] * 8)
+    assert cache.get("space") == [3.0] * 8
+    assert os.path.getsize(path) == 4 * 200 * 8
+
+    cache = reopen(cache)
+    assert cache.get("space") == [3.0] * 8
+
+
+def test_reopen_with_other_model_rebuilds(path):
+    cache = EmbeddingCache(100, path, "m1")
+    cache.put("space", [1.0] * 8)
+
+    cache = reopen(cache, model="m2")
+    assert cache.get("space") is None
+    cache.put("space", [1.0] * 4)
+    assert cache.stats()["dim"] == 4
+
+
+def test_missing_metadata_discards_store(path):
+    cache = EmbeddingCache(100, path, "m1")
+    cache.put("space", [1.0] * 8)
+    os.remove(path + ".json")
+
+    cache = reopen(cache)
+    assert cache.stats()["size"] == 0
+    assert not os.path.exists(path)
+
+
+def test_key_includes_model():
+    assert EmbeddingCache(10, model="m1").key("space") != EmbeddingCache(10, model="m2").key("space")
+
+
+def test_query_embedder_serves_repeats_from_cache():
+    embedder = StubEmbedder()
+    query_embedder = QueryEmbedder(embedder, EmbeddingCache(2))
+
+    assert query_embedder.embed("space") == [5.0] * 8
+    assert query_embedder.embed("space") == [5.0] * 8
+    assert embedder.calls == ["space"]
+    assert query_embedder.cache.stats()["hits"] == 1
@@ -0,0 +1,59 @@
+import asyncio
+import json
+
+import pytest
+
+from benchmarks.eval_suite import evaluate, grid, load_golden
+
+K = 10
+
+
+@pytest.fixture
+def settings():
+    return grid("Filmy", ["semantic", "bm25", "hybrid", "fusion"], [0.5], [0.0, 0.5, 1.0], ["rrf"])
+
+
+def run(app_main, settings: list[dict], golden: list[dict]) -> dict[str, dict]:
+    results = asyncio.run(evaluate(app_main.app, settings, golden, K, concurrency=4, repeat=1, warmup=False, seed=0))
+    return {result["label"]: result for result in results}
+
+
+def test_load_golden_normalises_relevance(tmp_path):
+    path = tmp_path / "golden.jsonl"
+    path.write_text(
+        json.dumps({"query": "space", "relevant": ["u1", "u2"]}) + "\n\n"
+        + json.dumps({"query": "opera", "relevant": {"u3": 2}}) + "\n"
+    )
+    assert load_golden(str(path)) == [
+        {"query": "space", "relevant": {"u1": 1.0, "u2": 1.0}},
+        {"query": "opera", "relevant": {"u3": 2.0}},
+    ]
+
+
+def test_evaluate_scores_every_setting(app_main, client, dataset, settings):
+    golden = [
+        {"query": row["query"], "relevant": {uuid: 1.0 for uuid in row["relevant"]}}
+        for row in dataset.golden(10, seed=0)
+    ]
+    results = run(app_main, settings, golden)
+
+    assert list(results) == [setting["label"] for setting in settings]
+    for result in results.values():
+        assert result["errors"] == 0
+        for metric in (f"recall@{K}", "mrr", f"ndcg@{K}"):
+            assert 0.0 <= result[metric] <= 1.0
+        assert 0 < result["p50_ms"] <= result["p95_ms"]
+    # Every query's relevant objects share its topic and subject, which both rankings pick up
+    assert results["bm25"][f"recall@{K}"] == 1.0
+    assert results["hybrid alpha=0.5"][f"ndcg@{K}"] > 0.9
+    best = max(results.values(), key=lambda result: result[f"ndcg@{K}"])
+    assert best["pareto"]
+
+
+def test_evaluate_scores_zero_without_relevant_hits(app_main, client, settings):
+    golden = [{"query": "vesmír", "relevant": {"00000000-0000-0000-0000-000000000000": 1.0}}]
+    results = run(app_main, settings, golden)
+
+    for result in results.values():
+        assert result["errors"] == 0
+        assert result[f"recall@{K}"] == result["mrr"] == result[f"ndcg@{K}"] == 0.0
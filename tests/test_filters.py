@@ -0,0 +1,70 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from weaviate_spy.filters import FilterSpec, build_filter
+
+
+def spec(data: dict) -> FilterSpec:
+    return FilterSpec.model_validate(data)
+
+
+@pytest.mark.parametrize("data", [
+    {"field": "genre", "op": "equal", "value": "Komedie"},
+    {"field": "tags", "op": "equal", "value": ["a", "b"]},
+    {"field": "year", "op": "greater_or_equal", "value": 1990},
+    {"field": "rating", "op": "between", "value": [2.5, 4]},
+    {"field": "title", "op": "like", "value": "Star*"},
+    {"field": "genre", "op": "contains_any", "value": ["Drama", "Komedie"]},
+    {"field": "origin", "op": "is_none", "value": True},
+    {"field": "_id", "op": "contains_none", "value": ["00000000-0000-0000-0000-000000000001"]},
+    {"field": "_creation_time", "op": "between", "value": ["2024-01-01T00:00:00+00:00", "2024-12-31T00:00:00+00:00"]},
+    {"and": [
+        {"field": "genre", "op": "equal", "value": "Komedie"},
+        {"or": [{"field": "year", "op": "less_than", "value": 1960}, {"not": {"field": "watched", "op": "equal", "value": True}}]},
+    ]},
+])
+def test_valid_filters_compile(data):
+    assert build_filter(spec(data)) is not None
+
+
+@pytest.mark.parametrize("data", [
+    {"field": "year", "op": "equal", "value": {"a": 1}},
+    {"field": "year", "op": "equal"},
+    {"field": "year", "op": "equal", "value": []},
+    {"field": "year", "op": "greater_than", "value": [1990]},
+    {"field": "year", "op": "greater_than", "value": True},
+    {"field": "year", "op": "between", "value": [1990]},
+    {"field": "year", "op": "between", "value": [1990, {"a": 1}]},
+    {"field": "title", "op": "like", "value": 3},
+    {"field": "genre", "op": "contains_any", "value": "Drama"},
+    {"field": "genre", "op": "contains_all", "value": []},
+    {"field": "origin", "op": "is_none", "value": "yes"},
+    {"field": "_id", "op": "like", "value": "x"},
+    {"field": "_update_time", "op": "greater_than", "value": "yesterday"},
+    {"field": "year"},
+    {"field": "year", "op": "equal", "value": 1, "and": [{"field": "genre", "op": "equal", "value": "x"}]},
+    {"and": []},
+    {},
+])
+def test_malformed_filters_are_rejected(data):
+    with pytest.raises(ValidationError):
+        spec(data)
+
+
+def test_build_filter_answers_422_for_values_the_client_rejects():
+    unchecked = FilterSpec.model_construct(field="year", op="equal", value={"a": 1})
+    with pytest.raises(HTTPException) as raised:
+        build_filter(unchecked)
+    assert raised.value.status_code == 422
+
+
+def test_search_with_malformed_filter_is_422(app_main, client):
+    http = TestClient(app_main.app)
+    for filters in ({"field": "year", "op": "equal", "value": {"a": 1}}, {"field": "year", "op": "equal"}):
+        response = http.post("/class/Filmy", json={"limit": 5, "filters": filters})
+        assert response.status_code == 422, response.text
+
+    response = http.post("/class/Filmy", json={"limit": 5, "filters": {"field": "year", "op": "equal", "value": 1990}})
+    assert response.status_code == 200, response.text
@@ -0,0 +1,164 @@
+import asyncio
+
+from fastapi import HTTPException
+from starlette.responses import Response
+
+from weaviate_spy.flow import SESSION_HEADER, SearchGate
+
+
+class FakeRequest:
+    """The parts of a Request the gate reads: the session header and the disconnect message."""
+
+    def __init__(self, session: str | None = None):
+        self.headers = {SESSION_HEADER: session} if session else {}
+        self.gone = asyncio.Event()
+
+    async def receive(self) -> dict:
+        await self.gone.wait()
+        return {"type": "http.disconnect"}
+
+
+class Search:
+    """A compute that blocks until released and counts its calls."""
+
+    def __init__(self, body: bytes = b"result"):
+        self.body = body
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> Response:
+        self.calls += 1
+        await self.release.wait()
+        return Response(self.body, media_type="application/json")
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def status(task: asyncio.Task) -> int:
+    try:
+        return (await task).status_code
+    except HTTPException as e:
+        return e.status_code
+
+
+def run(gate: SearchGate, request: FakeRequest, search: Search, key=None) -> asyncio.Task:
+    return asyncio.create_task(gate.run(request, "Filmy", "semantic", key, search))
+
+
+def test_newer_search_in_a_session_supersedes_the_queued_one():
+    async def scenario():
+        gate = SearchGate(limit=1, max_queue=8)
+        blocker, older, newer = Search(), Search(), Search()
+        running = run(gate, FakeRequest(), blocker)
+        await settle()
+        first = run(gate, FakeRequest("box-1"), older)
+        await settle()
+        second = run(gate, FakeRequest("box-1"), newer)
+        await settle()
+
+        assert await status(first) == 499
+        blocker.release.set()
+        newer.release.set()
+        return await status(running), await status(second), older.calls
+
+    assert asyncio.run(scenario()) == (200, 200, 0)
+
+
+def test_disconnected_client_is_cancelled():
+    async def scenario():
+        gate = SearchGate(limit=1, max_queue=8)
+        blocker = Search()
+        running = run(gate, FakeRequest(), blocker)
+        await settle()
+        request = FakeRequest("box-1")
+        queued = run(gate, request, Search())
+        await settle()
+        request.gone.set()
+        result = await status(queued)
+        blocker.release.set()
+        await running
+        return result
+
+    assert asyncio.run(scenario()) == 499
+
+
+def test_session_queue_limit_answers_429():
+    async def scenario():
+        gate = SearchGate(limit=1, max_queue=1)
+        blocker = Search()
+        running = run(gate, FakeRequest(), blocker)
+        await settle()
+        waiting = run(gate, FakeRequest("box-1"), Search())
+        await settle()
+        assert gate.stats()["waiting"] == {"Filmy": 1}
+        try:
+            await gate.run(FakeRequest("box-1"), "Filmy", "semantic", None, Search())
+        except HTTPException as e:
+            rejected = e
+        blocker.release.set()
+        await running
+        await asyncio.gather(waiting, return_exceptions=True)
+        return rejected
+
+    rejected = asyncio.run(scenario())
+    assert rejected.status_code == 429
+    assert rejected.headers == {"Retry-After": "1"}
+
+
+def test_searches_without_session_always_queue():
+    async def scenario():
+        gate = SearchGate(limit=1, max_queue=0)
+        searches = [Search() for _ in range(5)]
+        tasks = [run(gate, FakeRequest(), search) for search in searches]
+        await settle()
+        for search in searches:
+            search.release.set()
+        return [await status(task) for task in tasks]
+
+    assert asyncio.run(scenario()) == [200] * 5
+
+
+def test_identical_searches_share_one_computation():
+    async def scenario():
+        gate = SearchGate(limit=4, max_queue=8)
+        search = Search(b'{"data": []}')
+        leader = run(gate, FakeRequest(), search, key="same")
+        await settle()
+        followers = [run(gate, FakeRequest(), search, key="same") for _ in range(3)]
+        await settle()
+        assert gate.stats()["in_flight"] == 1
+        search.release.set()
+        return search.calls, await leader, await asyncio.gather(*followers)
+
+    calls, leader, followers = asyncio.run(scenario())
+    assert calls == 1
+    assert "x-cache" not in leader.headers
+    for response in followers:
+        assert response.body == b'{"data": []}'
+        assert response.headers["x-cache"] == "COALESCED"
+
+
+def test_followers_take_over_when_the_leader_is_superseded():
+    async def scenario():
+        gate = SearchGate(limit=1, max_queue=8)
+        blocker = Search()
+        running = run(gate, FakeRequest(), blocker)
+        await settle()
+        search = Search()
+        leader = run(gate, FakeRequest("box-1"), search, key="same")
+        await settle()
+        follower = run(gate, FakeRequest(), search, key="same")
+        await settle()
+        other = Search()
+        newer = run(gate, FakeRequest("box-1"), other, key="other")  # supersedes the queued leader
+        await settle()
+        blocker.release.set()
+        search.release.set()
+        other.release.set()
+        await running
+        return await status(leader), await status(follower), await status(newer), search.calls
+
+    assert asyncio.run(scenario()) == (499, 200, 200, 1)
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from weaviate_spy.fusion import fuse, fusion_matrix, rerank_order, sweep
+
+RANKED = [["a", "b", "c"], ["c", "a"]]
+SCORES = [[3.0, 2.0, 1.0], [0.9, 0.8]]
+
+
+def fused_uuids(method: str, weights: list[float], **kwargs) -> list[str]:
+    uuids, _, _, base = fusion_matrix(RANKED, SCORES, method, **kwargs)
+    order, _, _ = fuse(base, weights)
+    return [uuids[i] for i in order]
+
+
+def test_rrf_order_and_scores():
+    uuids, ranks, raw, base = fusion_matrix(RANKED, SCORES, "rrf", rrf_k=60)
+    order, fused, contributions = fuse(base, [1.0, 1.0])
+
+    assert [uuids[i] for i in order] == ["a", "c", "b"]
+    assert ranks.tolist() == [[1, 2], [2, 0], [3, 1]]
+    assert np.isnan(raw[1, 1])
+    assert fused[0] == pytest.approx(1 / 61 + 1 / 62)
+    assert fused[2] == pytest.approx(1 / 63 + 1 / 61)
+    assert contributions.sum(axis=1) == pytest.approx(fused)
+
+
+def test_weights_change_the_order():
+    assert fused_uuids("rrf", [0.0, 1.0]) == ["c", "a", "b"]
+    assert fused_uuids("relative_score", [1.0, 0.0]) == ["a", "b", "c"]
+    assert fused_uuids("combsum", [1.0, 2.0])[0] == "c"
+
+
+def test_relative_score_normalises_each_source():
+    _, _, _, base = fusion_matrix(RANKED, SCORES, "relative_score")
+    assert base.tolist() == [[1.0, 0.0], [0.5, 0.0], [0.0, 1.0]]
+
+
+def test_duplicate_uuid_keeps_best_rank():
+    _, ranks, raw, _ = fusion_matrix([["a", "b", "a"]], [[3.0, 2.0, 1.0]], "rrf")
+    assert ranks[:, 0].tolist() == [1, 2]
+    assert raw[0, 0] == 3.0
+
+
+def test_sweep_matches_fuse_per_weighting():
+    uuids, _, _, base = fusion_matrix(RANKED, SCORES, "relative_score")
+    weightings = [[1.0, 0.0], [0.5, 0.5], [0.0, 1.0]]
+    for top, weights in zip(sweep(base, weightings, 2), weightings):
+        order, _, _ = fuse(base, weights)
+        assert top.tolist() == order[:2].tolist()
+
+
+def test_rerank_order_keeps_ties_stable():
+    assert rerank_order([0.1, 0.5, 0.5, 0.9]).tolist() == [3, 1, 2, 0]
+
+
+class StubReranker:
+    """Scores passages in reverse of the order they were given, so the reranked top is reversed."""
+
+    model = "stub"
+
+    def __init__(self):
+        self.calls: list[tuple[str, list[str]]] = []
+
+    def score(self, query: str, texts: list[str]) -> list[float]:
+        self.calls.append((query, texts))
+        return [float(i) for i in range(len(texts))]
+
+
+@pytest.fixture
+def http(app_main, client):
+    # Without the lifespan, so the session-wide app's pools are not shut down between tests
+    return TestClient(app_main.app)
+
+
+def fusion(http: TestClient, **body) -> dict:
+    response = http.post("/class/Filmy/fusion", json={"query": "vesmír téma01", "candidates": 30, **body})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_fusion_endpoint_orders_by_fused_score(http):
+    result = fusion(http, limit=10, method="rrf")
+
+    scores = [row["score"] for row in result["data"]]
+    assert scores == sorted(scores, reverse=True)
+    assert [s["source"] for s in result["sources"]] == ["bm25", "semantic"]
+    for row in result["data"]:
+        assert row["score"] == pytest.approx(sum(part["contribution"] for part in row["fusion"].values()))
+        ranks = [part["rank"] for part in row["fusion"].values() if part["rank"]]
+        assert row["score"] == pytest.approx(sum(1 / (60 + rank) for rank in ranks))
+    assert {"candidates", "fusion", "serialize", "total"} <= result["stages"].keys()
+
+
+def test_fusion_endpoint_sweeps_alphas(http):
+    result = fusion(http, limit=5, method="relative_score", alphas=[0.0, 1.0])
+
+    bm25_only = fusion(http, limit=5, method="relative_score", weights={"semantic": 0.0})
+    semantic_only = fusion(http, limit=5, method="relative_score", weights={"bm25": 0.0})
+    assert result["sweeps"][0]["uuids"] == [row["uuid"] for row in bm25_only["data"]]
+    assert result["sweeps"][1]["uuids"] == [row["uuid"] for row in semantic_only["data"]]
+
+
+def test_rerank_without_reranker_is_rejected(http, app_main, monkeypatch):
+    monkeypatch.setattr(app_main, "reranker", None)
+    response = http.post("/class/Filmy/fusion", json={"query": "vesmír", "rerank": True})
+    assert response.status_code == 400
+
+
+def test_rerank_reorders_only_the_top(http, app_main, monkeypatch):
+    stub = StubReranker()
+    monkeypatch.setattr(app_main, "reranker", stub)
+    fused = [row["uuid"] for row in fusion(http, limit=10)["data"]]
+    assert len(fused) == 10
+
+    result = fusion(http, limit=10, rerank=True, rerank_top=5, rerank_properties=["description"])
+
+    assert result["reranker"] == "stub"
+    assert "rerank" in result["stages"]
+    assert [row["uuid"] for row in result["data"]] == fused[:5][::-1] + fused[5:]
+    assert [row.get("rerank_score") for row in result["data"][:5]] == [4.0, 3.0, 2.0, 1.0, 0.0]
+    assert all("rerank_score" not in row for row in result["data"][5:])
+    query, texts = stub.calls[0]
+    assert query == "vesmír téma01"
+    assert len(texts) == 5
@@ -0,0 +1,52 @@
+import asyncio
+import threading
+
+import pytest
+
+from weaviate_spy.flow import RequestCancelled
+
+
+class Client:
+    def __init__(self, disconnected: bool = False):
+        self.disconnected = disconnected
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+def test_no_llm_call_after_disconnect(app_main, monkeypatch):
+    calls = []
+
+    async def scenario():
+        monkeypatch.setattr(app_main, "generation_slots", asyncio.Semaphore(1))
+        with pytest.raises(RequestCancelled):
+            await app_main.run_in_generation_slot(Client(disconnected=True), calls.append, "x")
+        return app_main.generation_slots.locked()
+
+    assert asyncio.run(scenario()) is False
+    assert calls == []
+
+
+def test_cancelled_caller_keeps_the_slot_until_the_call_returns(app_main, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+
+    def llm_call():
+        started.set()
+        release.wait(5)
+        return "text"
+
+    async def scenario():
+        slots = asyncio.Semaphore(1)
+        monkeypatch.setattr(app_main, "generation_slots", slots)
+        task = asyncio.create_task(app_main.run_in_generation_slot(Client(), llm_call))
+        await asyncio.to_thread(started.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        held_after_cancel = slots.locked()
+
+        release.set()
+        await asyncio.wait_for(slots.acquire(), 5)
+        return held_after_cancel
+
+    assert asyncio.run(scenario()) is True
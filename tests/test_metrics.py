@@ -0,0 +1,21 @@
+from fastapi.testclient import TestClient
+
+from weaviate_spy.metrics import request_errors
+
+
+def errors(collection: str) -> float:
+    return request_errors._values.get(("/class/{class_name}", collection, "422"), 0.0)
+
+
+def test_error_labels_only_name_collections_that_answered(app_main, client):
+    http = TestClient(app_main.app)
+    unknown, made_up = errors("unknown"), errors("Made-up-1234")
+
+    assert http.post("/class/Made-up-1234", json={"limit": 0}).status_code == 422
+    assert errors("unknown") == unknown + 1
+    assert errors("Made-up-1234") == made_up == 0
+
+    assert http.post("/class/Filmy", json={"limit": 1}).status_code == 200
+    filmy = errors("Filmy")
+    assert http.post("/class/Filmy", json={"limit": 0}).status_code == 422
+    assert errors("Filmy") == filmy + 1
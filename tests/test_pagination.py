@@ -0,0 +1,39 @@
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def http(app_main, client):
+    return TestClient(app_main.app)
+
+
+def fetch(http: TestClient, **body) -> dict:
+    response = http.post("/class/Filmy", json={"pagination": "cursor", "count": "estimated", **body})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_cursor_pages_through_the_collection(http, dataset):
+    pages = [fetch(http, limit=120)]
+    while pages[-1]["next_cursor"]:
+        pages.append(fetch(http, limit=120, cursor=pages[-1]["next_cursor"]))
+
+    uuids = [row["uuid"] for page in pages for row in page["data"]]
+    assert uuids == [str(obj.uuid) for obj in dataset.objects]
+    # The estimate follows the cursor's position, not the request's (default) offset
+    assert [page["count"] for page in pages] == [121, 241, 300]
+
+
+def test_offset_resolves_to_the_same_page_as_the_cursor(http):
+    first = fetch(http, limit=50)
+    by_cursor = fetch(http, limit=50, cursor=first["next_cursor"])
+    by_offset = fetch(http, limit=50, offset=50)
+    assert by_offset["data"] == by_cursor["data"]
+    assert by_offset["count"] == by_cursor["count"] == 101
+
+
+@pytest.mark.parametrize("body", [{"limit": 0}, {"limit": -5}, {"offset": -1}])
+@pytest.mark.parametrize("pagination", ["offset", "cursor"])
+def test_out_of_range_limit_or_offset_is_422(http, body, pagination):
+    response = http.post("/class/Filmy", json={"pagination": pagination, **body})
+    assert response.status_code == 422, response.text
@@ -0,0 +1,94 @@
+import threading
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from weaviate_spy.profiling import (
+    CollectionProfile,
+    ProfileRefresh,
+    ProfileStore,
+    TiedUpdates,
+    from_millis,
+    to_millis,
+    update_profile,
+)
+
+SCHEMA = [("title", "text")]
+T0 = 1_700_000_000_000  # watermark of the saved profile
+T1 = T0 + 60_000  # one bulk import, every object updated at the same millisecond
+
+
+class TimestampedCollection:
+    """Collection whose fetch_objects filters and sorts on last-update time, stably by uuid on ties."""
+
+    def __init__(self, objects: list[SimpleNamespace]):
+        self.objects = objects
+        self.pages: list[int] = []
+        self.query = SimpleNamespace(fetch_objects=self.fetch_objects)
+        self.aggregate = SimpleNamespace(over_all=lambda total_count: SimpleNamespace(total_count=len(self.objects)))
+
+    def fetch_objects(self, filters, sort, limit, **kwargs):
+        self.pages.append(limit)
+        since = to_millis(filters.value)
+        ascending = sort.sorts[0].ascending
+        matches = [obj for obj in self.objects if to_millis(obj.metadata.last_update_time) >= since]
+        matches.sort(key=lambda obj: (to_millis(obj.metadata.last_update_time) * (1 if ascending else -1), str(obj.uuid)))
+        return SimpleNamespace(objects=matches[:limit])
+
+    def iterator(self, return_properties=None, **kwargs):
+        return iter(self.objects)
+
+
+def make_object(i: int, millis: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        uuid=uuid.UUID(int=i),
+        properties={"title": f"Film {i}"},
+        metadata=SimpleNamespace(creation_time=from_millis(millis), last_update_time=from_millis(millis)),
+    )
+
+
+@pytest.fixture
+def collection():
+    old = [make_object(i, T0 - 1000) for i in range(3)]
+    tied = [make_object(100 + i, T1) for i in range(7)]
+    return TimestampedCollection(old + tied)
+
+
+def saved_profile() -> CollectionProfile:
+    profile = CollectionProfile(SCHEMA)
+    for i in range(3):
+        profile.add(make_object(i, T0 - 1000))
+    profile.watermark = T0
+    return profile
+
+
+def test_tied_update_times_are_read_once(collection):
+    profile = saved_profile()
+    read = update_profile(collection, profile, ProfileRefresh("incremental", threading.Event()), 2, 8)
+
+    assert read == 7
+    assert profile.objects == 10
+    assert profile.updated == 0
+    assert profile.watermark == T1
+    assert profile.boundary == sorted(str(uuid.UUID(int=100 + i)) for i in range(7))
+    assert max(collection.pages) == 8
+
+
+def test_tie_wider_than_max_page_raises(collection):
+    with pytest.raises(TiedUpdates):
+        update_profile(collection, saved_profile(), ProfileRefresh("incremental", threading.Event()), 2, 4)
+    assert max(collection.pages) == 4
+
+
+def test_refresh_falls_back_to_full_scan(collection, tmp_path):
+    store = ProfileStore(str(tmp_path), refresh_after=0, rebuild_ratio=0.5, page_size=2, max_page=4)
+    store._save("default/Filmy", saved_profile())
+    refresh = store.refreshes["default/Filmy"] = ProfileRefresh("incremental", threading.Event())
+
+    store._run("default/Filmy", collection, SCHEMA, refresh)
+
+    assert (refresh.mode, refresh.status) == ("full", "done")
+    profile = store.get("default/Filmy")
+    assert profile.objects == 10
+    assert profile.watermark == T1
@@ -0,0 +1,412 @@
+"""
+Background vector analysis jobs.
+Near-duplicate pairs and low-density outliers over a collection's vectors. Vectors are
+streamed into a memory-mapped float32 file (L2-normalised), then compared block by block
+with NumPy matrix products, so collections larger than RAM only need one block pair in
+memory at a time. Each job persists its status and results in its own directory, so
+results page without recomputation and survive restarts.
+"""
+
+import contextvars
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Literal
+
+import numpy as np
+from loguru import logger
+
+from weaviate_spy.projection import VectorError, pick_vector
+
+JobStatus = Literal["queued", "running", "done", "failed", "cancelled"]
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once cancellation was requested."""
+
+
+class JobRunning(Exception):
+    """Raised when a job's worker did not stop in time to remove its results."""
+
+
+class AnalysisJob:
+    """One analysis run: parameters, progress and the directory holding its results."""
+
+    def __init__(self, job_id: str, directory: str, kind: str, collection: str, cluster: str, params: dict):
+        self.id = job_id
+        self.directory = directory
+        self.kind = kind
+        self.collection = collection
+        self.cluster = cluster
+        self.params = params
+        self.status: JobStatus = "queued"
+        self.phase: str | None = None
+        self.processed = 0
+        self.total: int | None = None
+        self.error: str | None = None
+        self.summary: dict = {}
+        self.created_at = time.time()
+        self.finished_at: float | None = None
+        self._cancel = threading.Event()
+        self._uuids: list[str] | None = None
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def cancel(self):
+        self._cancel.set()
+
+    def check(self):
+        """Raise JobCancelled if cancellation was requested."""
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def progress(self, phase: str, processed: int, total: int | None):
+        self.phase = phase
+        self.processed = processed
+        self.total = total
+
+    def uuids(self) -> list[str]:
+        """Row index -> object uuid, loaded once from the job directory."""
+        if self._uuids is None:
+            with open(self.path("uuids.json")) as f:
+                self._uuids = json.load(f)
+        return self._uuids
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "collection": self.collection,
+            "cluster": self.cluster,
+            "params": self.params,
+            "status": self.status,
+            "phase": self.phase,
+            "processed": self.processed,
+            "total": self.total,
+            "error": self.error,
+            "summary": self.summary,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+    def save(self):
+        tmp = self.path("job.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, self.path("job.json"))
+
+    @classmethod
+    def load(cls, directory: str) -> "AnalysisJob":
+        with open(os.path.join(directory, "job.json")) as f:
+            state = json.load(f)
+        job = cls(state["id"], directory, state["kind"], state["collection"], state["cluster"], state["params"])
+        for key in ("status", "phase", "processed", "total", "error", "summary", "created_at", "finished_at"):
+            setattr(job, key, state[key])
+        if job.status in ("queued", "running"):
+            # The process stopped while the job ran
+            job.status = "failed"
+            job.error = "Interrupted by a restart"
+        return job
+
+
+class JobStore:
+    """Analysis jobs under a root directory, run on a small worker pool."""
+
+    def __init__(self, root: str, max_workers: int = 1):
+        self.root = root
+        self.jobs: dict[str, AnalysisJob] = {}
+        self._futures: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis")
+
+    def create(self, kind: str, collection: str, cluster: str, params: dict) -> AnalysisJob:
+        job_id = uuid.uuid4().hex
+        directory = os.path.join(self.root, job_id)
+        os.makedirs(directory)
+        job = AnalysisJob(job_id, directory, kind, collection, cluster, params)
+        job.save()
+        with self._lock:
+            self.jobs[job_id] = job
+        return job
+
+    def submit(self, job: AnalysisJob, run: Callable[[AnalysisJob], dict]):
+        """Run the job in the worker pool, in a copy of the caller's context (cluster selection)."""
+        future = self._executor.submit(contextvars.copy_context().run, self._run, job, run)
+        with self._lock:
+            self._futures[job.id] = future
+        future.add_done_callback(lambda f: self._finished(job.id, f))
+
+    def _finished(self, job_id: str, future: Future):
+        """Forget the worker's future and log anything _run let escape (e.g. a failed save)."""
+        with self._lock:
+            if self._futures.get(job_id) is future:
+                del self._futures[job_id]
+        if not future.cancelled() and future.exception() is not None:
+            logger.opt(exception=future.exception()).error(f"[analysis] Worker for job {job_id} crashed")
+
+    def _run(self, job: AnalysisJob, run: Callable[[AnalysisJob], dict]):
+        job.status = "running"
+        job.save()
+        try:
+            job.check()
+            job.summary = run(job)
+            job.status = "done"
+        except JobCancelled:
+            job.status = "cancelled"
+        except Exception as e:
+            logger.exception(f"[analysis] {job.kind} job {job.id} on {job.collection} failed")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            job.save()
+
+    def get(self, job_id: str) -> AnalysisJob | None:
+        """Look a job up in memory, falling back to its persisted state."""
+        if not job_id.isalnum():
+            return None
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                directory = os.path.join(self.root, job_id)
+                if not os.path.exists(os.path.join(directory, "job.json")):
+                    return None
+                job = self.jobs[job_id] = AnalysisJob.load(directory)
+            return job
+
+    def list(self) -> list[AnalysisJob]:
+        if os.path.isdir(self.root):
+            for name in os.listdir(self.root):
+                self.get(name)
+        with self._lock:
+            return sorted(self.jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+    def delete(self, job_id: str, timeout: float = 10.0) -> bool:
+        """
+        Cancel the job, wait up to timeout for its worker to stop, then remove its results.
+        Raises JobRunning if the worker is still writing after timeout.
+        """
+        job = self.get(job_id)
+        if job is None:
+            return False
+        job.cancel()
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None and not future.cancel():
+            # Already running: it stops at its next cancellation check
+            if wait([future], timeout=timeout).not_done:
+                raise JobRunning(f"Job {job_id} is still stopping")
+        with self._lock:
+            self.jobs.pop(job_id, None)
+        shutil.rmtree(job.directory, ignore_errors=True)
+        return True
+
+    def close(self):
+        with self._lock:
+            for job in self.jobs.values():
+                job.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def write_vectors(
+    job: AnalysisJob,
+    objects: Iterable[Any],
+    vector_name: str | None,
+    expected: int | None,
+    limit: int | None = None,
+    chunk_rows: int = 4096,
+) -> np.memmap:
+    """
+    Stream object vectors into <job>/vectors.f32 as L2-normalised float32 rows and write
+    the row -> uuid index. Returns the file as a read-only memory map.
+    """
+    uuids: list[str] = []
+    rows: list = []
+    dim = None
+    written = 0
+
+    with open(job.path("vectors.f32"), "wb") as f:
+        def flush():
+            nonlocal written
+            block = np.asarray(rows, dtype=np.float32)
+            norms = np.linalg.norm(block, axis=1, keepdims=True)
+            block /= np.where(norms == 0, 1, norms)
+            f.write(block.tobytes())
+            written += len(rows)
+            rows.clear()
+            job.progress("read", written, expected)
+            job.check()
+
+        for obj in objects:
+            if limit is not None and len(uuids) >= limit:
+                break
+            vector = pick_vector(obj.vector, vector_name) if obj.vector else None
+            if not vector:
+                continue
+            if isinstance(vector[0], (list, tuple)):
+                raise VectorError("Multi-vector embeddings are not supported")
+            if dim is None:
+                dim = len(vector)
+            elif len(vector) != dim:
+                raise VectorError(f"Mixed vector dimensions: {len(vector)} and {dim}")
+            rows.append(vector)
+            uuids.append(str(obj.uuid))
+            if len(rows) >= chunk_rows:
+                flush()
+        if rows:
+            flush()
+
+    if dim is None:
+        raise VectorError("No objects with vectors")
+    with open(job.path("uuids.json"), "w") as f:
+        json.dump(uuids, f)
+    return np.memmap(job.path("vectors.f32"), dtype=np.float32, mode="r", shape=(written, dim))
+
+
+def _update_neighbors(top: np.ndarray, similarities: np.ndarray) -> np.ndarray:
+    """Keep each row's k highest similarities out of its current top-k and a new block."""
+    k = top.shape[1]
+    merged = np.concatenate([top, similarities], axis=1)
+    return np.partition(merged, -k, axis=1)[:, -k:]
+
+
+def _top_pairs(pairs: np.ndarray, scores: np.ndarray, keep: int) -> tuple[np.ndarray, np.ndarray]:
+    """The `keep` most similar pairs, in no particular order."""
+    if len(scores) <= keep:
+        return pairs, scores
+    index = np.argpartition(-scores, keep)[:keep]
+    return pairs[index], scores[index]
+
+
+def find_duplicates(
+    job: AnalysisJob,
+    vectors: np.ndarray,
+    threshold: float,
+    neighbors: int,
+    block_rows: int,
+    max_pairs: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, bool]:
+    """
+    Compare all rows block against block (upper triangle only).
+    Returns (pairs [m, 2] sorted by similarity, similarities, mean similarity of each
+    row's k nearest neighbours, truncated). Past max_pairs only the most similar pairs
+    are kept: candidates buffer up to twice that and are then cut back, and once cut,
+    pairs below the weakest kept similarity are skipped.
+    """
+    n = len(vectors)
+    k = max(1, min(neighbors, n - 1))
+    top = np.full((n, k), -np.inf, dtype=np.float32)
+    found_pairs: list[np.ndarray] = []
+    found_scores: list[np.ndarray] = []
+    pair_count = 0
+    truncated = False
+    floor = -np.inf  # Weakest similarity still kept once truncated
+
+    starts = list(range(0, n, block_rows))
+    total = len(starts) * (len(starts) + 1) // 2
+    done = 0
+    for bi, i in enumerate(starts):
+        a = np.asarray(vectors[i:i + block_rows])
+        for j in starts[bi:]:
+            job.check()
+            b = a if j == i else np.asarray(vectors[j:j + block_rows])
+            similarities = a @ b.T
+            if j == i:
+                np.fill_diagonal(similarities, -np.inf)
+                rows, cols = np.nonzero(np.triu(similarities >= threshold, k=1))
+            else:
+                rows, cols = np.nonzero(similarities >= threshold)
+                top[j:j + len(b)] = _update_neighbors(top[j:j + len(b)], similarities.T)
+            top[i:i + len(a)] = _update_neighbors(top[i:i + len(a)], similarities)
+
+            if len(rows):
+                scores = similarities[rows, cols]
+                if truncated:
+                    keep = scores > floor
+                    rows, cols, scores = rows[keep], cols[keep], scores[keep]
+                found_pairs.append(np.stack([rows + i, cols + j], axis=1).astype(np.int64))
+                found_scores.append(scores)
+                pair_count += len(rows)
+                if pair_count > 2 * max_pairs:
+                    kept_pairs, kept_scores = _top_pairs(np.concatenate(found_pairs), np.concatenate(found_scores), max_pairs)
+                    found_pairs, found_scores, pair_count, truncated = [kept_pairs], [kept_scores], len(kept_scores), True
+                    floor = kept_scores.min() if len(kept_scores) else np.inf
+            done += 1
+            job.progress("compare", done, total)
+
+    pairs = np.concatenate(found_pairs) if found_pairs else np.empty((0, 2), dtype=np.int64)
+    scores = np.concatenate(found_scores) if found_scores else np.empty(0, dtype=np.float32)
+    if len(scores) > max_pairs:
+        pairs, scores = _top_pairs(pairs, scores, max_pairs)
+        truncated = True
+    order = np.argsort(-scores, kind="stable")
+    density = np.where(np.isfinite(top), top, 0).mean(axis=1) if n > 1 else np.zeros(n, dtype=np.float32)
+    return pairs[order], scores[order], density, truncated
+
+
+def run_duplicate_analysis(
+    job: AnalysisJob,
+    objects: Iterable[Any],
+    expected: int | None,
+) -> dict:
+    """Full duplicate/outlier job: read vectors, compare blocks, persist pairs and outliers."""
+    params = job.params
+    try:
+        vectors = write_vectors(job, objects, params["vector_name"], expected, params.get("limit"))
+        pairs, scores, density, truncated = find_duplicates(
+            job, vectors, params["threshold"], params["neighbors"], params["block_rows"], params["max_pairs"],
+        )
+        del vectors
+    finally:
+        # The vector copy is only scratch space; results are the pairs and densities
+        if os.path.exists(job.path("vectors.f32")):
+            os.unlink(job.path("vectors.f32"))
+
+    cutoff = float(np.quantile(density, params["outlier_quantile"])) if len(density) else 0.0
+    outliers = np.nonzero(density <= cutoff)[0]
+    outliers = outliers[np.argsort(density[outliers], kind="stable")][:params["max_outliers"]]
+
+    np.save(job.path("pairs.npy"), pairs)
+    np.save(job.path("pair_scores.npy"), np.minimum(scores, 1).astype(np.float32))  # float32 rounding
+    np.save(job.path("outliers.npy"), outliers)
+    np.save(job.path("density.npy"), density.astype(np.float32))
+    return {
+        "objects": len(density),
+        "pairs": len(pairs),
+        "pairs_truncated": truncated,
+        "outliers": len(outliers),
+        "outlier_cutoff": cutoff,
+    }
+
+
+def page_duplicates(job: AnalysisJob, offset: int, limit: int) -> dict:
+    """One page of duplicate pairs, most similar first, in the grid's data/count shape."""
+    pairs = np.load(job.path("pairs.npy"), mmap_mode="r")
+    scores = np.load(job.path("pair_scores.npy"), mmap_mode="r")
+    uuids = job.uuids()
+    return {
+        "data": [
+            {"uuid": uuids[a], "duplicate_uuid": uuids[b], "similarity": float(score)}
+            for (a, b), score in zip(pairs[offset:offset + limit], scores[offset:offset + limit])
+        ],
+        "count": len(pairs),
+    }
+
+
+def page_outliers(job: AnalysisJob, offset: int, limit: int) -> dict:
+    """One page of outliers, lowest neighbourhood density first, in the grid's data/count shape."""
+    outliers = np.load(job.path("outliers.npy"), mmap_mode="r")
+    density = np.load(job.path("density.npy"), mmap_mode="r")
+    uuids = job.uuids()
+    return {
+        "data": [
+            {"uuid": uuids[row], "density": float(density[row])}
+            for row in outliers[offset:offset + limit]
+        ],
+        "count": len(outliers),
+    }
@@ -0,0 +1,642 @@
+"""
+Weaviate Spy Backend - async mode
+The core browsing endpoints of weaviate_spy.main (schema, collection info, search,
+generate, aggregate, facets) served by async handlers on WeaviateAsyncClient, on the
+default cluster only; see README for what is sync-only.
+Run with: uvicorn weaviate_spy.async_main:app
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable
+
+import weaviate
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
+from loguru import logger
+from pydantic import BaseModel
+from starlette.middleware.cors import CORSMiddleware
+
+from weaviate_spy.cache import RefreshingCache, TTLCache
+from weaviate_spy.clients import ClusterUnavailable
+from weaviate_spy.config import (
+    COUNT_CACHE_REFRESH,
+    FACET_CACHE_REFRESH,
+    FACET_CACHE_SIZE,
+    SCHEMA_CACHE_SIZE,
+    SCHEMA_CACHE_TTL,
+    SEARCH_CONCURRENCY,
+    SEARCH_QUEUE_SIZE,
+    WEAVIATE_GRPC_HOST,
+    WEAVIATE_GRPC_PORT,
+    WEAVIATE_GRPC_SECURE,
+    WEAVIATE_HOST,
+    WEAVIATE_PORT,
+    WEAVIATE_SECURE,
+    get_auth_credentials,
+)
+from weaviate_spy.facets import facet_group_by, groups_payload, properties_payload, property_metrics
+from weaviate_spy.filters import build_filter
+from weaviate_spy.flow import SearchGate
+from weaviate_spy.metrics import MetricsMiddleware, registry, timed, timed_await
+from weaviate_spy.models import (
+    AggregateRequest,
+    BM25SearchRequest,
+    CountStrategy,
+    GenerativeRequest,
+    HybridSearchRequest,
+    SearchRequest,
+)
+from weaviate_spy.serialization import ResponseFormat, format_object, render_response, serialize_objects
+from weaviate_spy.static import PrecompressedStaticFiles
+
+# Global async client reference; connected on first use or by the startup warm-up
+client: weaviate.WeaviateAsyncClient | None = None
+
+# Reconnect backoff, so an unreachable Weaviate is not dialled by every request
+connect_lock = asyncio.Lock()
+connect_failures = 0
+next_connect = 0.0
+
+# Schema/config cache - keys are ("schema",) or ("config", collection_name)
+schema_cache = TTLCache(maxsize=SCHEMA_CACHE_SIZE, ttl=SCHEMA_CACHE_TTL)
+
+# Per-collection total object counts, refreshed in the background
+count_cache = RefreshingCache(refresh_after=COUNT_CACHE_REFRESH)
+
+# Unfiltered aggregate/facet results keyed on (collection, request), refreshed in the background
+facet_cache = RefreshingCache(refresh_after=FACET_CACHE_REFRESH, maxsize=FACET_CACHE_SIZE)
+
+# Coalescing, per-session cancellation and per-collection limits for search endpoints;
+# cancelling a search cancels its in-flight Weaviate calls
+search_gate = SearchGate(limit=SEARCH_CONCURRENCY, max_queue=SEARCH_QUEUE_SIZE, abortable=True)
+
+
+def connect_to_weaviate_async() -> weaviate.WeaviateAsyncClient:
+    """Create an async Weaviate client; call connect() before use."""
+    return weaviate.use_async_with_custom(
+        http_host=WEAVIATE_HOST,
+        http_port=WEAVIATE_PORT,
+        http_secure=WEAVIATE_SECURE,
+        grpc_host=WEAVIATE_GRPC_HOST,
+        grpc_port=WEAVIATE_GRPC_PORT,
+        grpc_secure=WEAVIATE_GRPC_SECURE,
+        auth_credentials=get_auth_credentials(),
+    )
+
+
+async def connect() -> weaviate.WeaviateAsyncClient:
+    """Connect the async client once; failed attempts back off exponentially up to a minute."""
+    global client, connect_failures, next_connect
+    async with connect_lock:
+        if client is not None:
+            return client
+        if time.monotonic() < next_connect:
+            raise ClusterUnavailable("reconnect pending")
+        candidate = connect_to_weaviate_async()
+        try:
+            await candidate.connect()
+        except Exception as e:
+            connect_failures += 1
+            delay = min(60.0, 2.0 ** (connect_failures - 1))
+            next_connect = time.monotonic() + delay
+            logger.warning(f"Failed to connect to Weaviate ({e}), retrying in {delay:.0f}s")
+            raise ClusterUnavailable(str(e)) from e
+        connect_failures = 0
+        client = candidate
+        logger.info("Connected to Weaviate successfully (async)")
+        return client
+
+
+async def warm_up():
+    """Connect and prefetch the schema listing in the background, so startup never waits on Weaviate."""
+    try:
+        c = await connect()
+        await schema_cache.aget_or_load(("schema",), c.collections.list_all)
+        logger.info("Weaviate connection verified")
+    except Exception as e:
+        logger.error(f"Failed to connect to Weaviate: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Manage application lifespan - startup and shutdown."""
+    # Startup: serve at once; the client connects in the background or on the first request
+    warm = asyncio.create_task(warm_up())
+
+    yield
+
+    # Shutdown
+    warm.cancel()
+    if client:
+        await client.close()
+        logger.info("Weaviate connection closed")
+
+
+app = FastAPI(
+    title="Weaviate Spy API (async)",
+    version="0.2.0",
+    lifespan=lifespan,
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["Server-Timing"],
+)
+
+# Per-endpoint latency histograms, in-flight gauges and error counters, plus Server-Timing
+app.add_middleware(MetricsMiddleware)
+
+
+# Helper functions
+async def get_client() -> weaviate.WeaviateAsyncClient:
+    """Get the async Weaviate client, connecting on first use, or raise an error if unavailable."""
+    if client is not None:
+        return client
+    try:
+        return await connect()
+    except ClusterUnavailable:
+        raise HTTPException(status_code=503, detail="Weaviate connection not available")
+
+
+async def get_collection_config(c: weaviate.WeaviateAsyncClient, collection_name: str) -> Any:
+    """Get a collection config, served from the schema cache when fresh."""
+    return await schema_cache.aget_or_load(
+        ("config", collection_name),
+        lambda: timed_await("config", c.collections.get(collection_name).config.get()),
+    )
+
+
+async def get_property_names(
+    c: weaviate.WeaviateAsyncClient,
+    collection_name: str,
+    properties: list[str] | None,
+) -> list[str]:
+    """Return the requested property names, or all collection properties if None."""
+    if properties is not None:
+        return properties
+    config = await get_collection_config(c, collection_name)
+    return [p.name for p in config.properties]
+
+
+async def get_total_count(c: weaviate.WeaviateAsyncClient, collection_name: str) -> int:
+    """Get the collection's total object count from the background-refreshed cache."""
+    async def load():
+        response = await timed_await(
+            "aggregate", c.collections.get(collection_name).aggregate.over_all(total_count=True),
+        )
+        return response.total_count
+
+    return await count_cache.aget(collection_name, load)
+
+
+async def fetch_count(
+    c: weaviate.WeaviateAsyncClient,
+    collection_name: str,
+    strategy: CountStrategy,
+    exact: Callable[[], Awaitable[Any]],
+    filtered: bool = False,
+) -> int | None:
+    """
+    Fetch the count for strategies that need Weaviate, so it can run alongside the query.
+    The cached total covers the whole collection, so filtered requests count exactly instead.
+    """
+    if strategy == "exact" or (strategy == "cached" and filtered):
+        return (await timed_await("aggregate", exact())).total_count
+    if strategy == "cached":
+        return await get_total_count(c, collection_name)
+    return None
+
+
+def finish_count(strategy: CountStrategy, fetched: int | None, returned: int, offset: int, limit: int) -> int | None:
+    """Combine a fetched count with the page size for the remaining strategies."""
+    if strategy == "estimated":
+        return offset + returned + (1 if returned >= limit else 0)
+    if strategy == "none":
+        return returned
+    return fetched
+
+
+# Health check endpoint
+@app.get("/health")
+async def health_check():
+    """Check the health of the API and Weaviate connection."""
+    try:
+        c = await get_client()
+        await c.collections.list_all()
+        return {"status": "healthy", "weaviate": "connected"}
+    except HTTPException:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unhealthy", "weaviate": "disconnected"}
+        )
+    except Exception as e:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unhealthy", "error": str(e)}
+        )
+
+
+# Schema endpoints
+@app.get("/schema")
+async def get_schema():
+    """List all collections with their properties."""
+    c = await get_client()
+    return await schema_cache.aget_or_load(("schema",), c.collections.list_all)
+
+
+@app.get("/schema/cache")
+async def get_schema_cache_stats():
+    """Return schema cache hit/miss counters."""
+    return schema_cache.stats()
+
+
+@app.post("/schema/invalidate")
+async def invalidate_schema(collection: str | None = None):
+    """Invalidate cached schema for one collection, or everything if no collection is given."""
+    if collection is None:
+        dropped = schema_cache.invalidate()
+    else:
+        dropped = schema_cache.invalidate(
+            lambda key: key == ("schema",) or key == ("config", collection)
+        )
+    return {"invalidated": dropped, "collection": collection}
+
+
+@app.get("/search-gate")
+async def get_search_gate_stats():
+    """Running and queued searches per collection, open search sessions and coalescable flights."""
+    return search_gate.stats()
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics: per-endpoint phase latency histograms, in-flight gauges and error counters."""
+    return Response(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/collection/{collection_name}")
+async def get_collection_info(collection_name: str):
+    """Get detailed information about a specific collection."""
+    c = await get_client()
+    try:
+        config = await get_collection_config(c, collection_name)
+        return {
+            "name": collection_name,
+            "properties": [
+                {"name": p.name, "data_type": p.data_type}
+                for p in config.properties
+            ],
+            "vectorizer": str(config.vectorizer) if config.vectorizer else None,
+        }
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=f"Collection not found: {e}")
+
+
+# Search endpoints
+async def gated_search(
+    http_request: Request,
+    class_name: str,
+    endpoint: str,
+    request: BaseModel,
+    format: ResponseFormat,
+    compute: Callable[[], Awaitable[Response]],
+) -> Response:
+    """
+    Run a search through search_gate: identical searches in flight share one execution
+    unless the client sent Cache-Control: no-cache, and superseded searches are aborted.
+    """
+    key = None
+    if "no-cache" not in http_request.headers.get("cache-control", ""):
+        key = (endpoint, format, request.model_dump_json())
+    return await search_gate.run(http_request, class_name, endpoint, key, compute)
+
+
+async def run_semantic(
+    c: weaviate.WeaviateAsyncClient,
+    class_name: str,
+    request: SearchRequest,
+    format: ResponseFormat = "rows",
+) -> Response:
+    """
+    Search a collection using semantic (near_text) search.
+    The query, count aggregate and config lookup run concurrently.
+    """
+    collection = c.collections.get(class_name)
+
+    filters = build_filter(request.filters)
+    paginate = {
+        "limit": request.limit,
+        "offset": request.offset,
+        "return_properties": request.properties,
+        "filters": filters,
+    }
+
+    # Use keyword or query for search
+    search_term = request.keyword or request.query
+
+    if search_term:
+        # Semantic search
+        query = collection.query.near_text(
+            query=search_term,
+            certainty=request.certainty,
+            return_metadata=["certainty", "distance"],
+            **paginate,
+        )
+        exact = lambda: collection.aggregate.near_text(
+            query=search_term,
+            certainty=request.certainty,
+            filters=filters,
+            total_count=True,
+        )
+    else:
+        # Fetch all objects
+        query = collection.query.fetch_objects(**paginate)
+        exact = lambda: collection.aggregate.over_all(filters=filters, total_count=True)
+
+    properties, response, fetched = await asyncio.gather(
+        get_property_names(c, class_name, request.properties),
+        timed_await("query", query),
+        fetch_count(c, class_name, request.count, exact, filtered=filters is not None),
+    )
+
+    with timed("serialize"):
+        data = serialize_objects(response.objects, properties, format, request.preview_chars)
+
+    return render_response({
+        "data": data,
+        "count": finish_count(request.count, fetched, len(response.objects), request.offset, request.limit),
+        "search_type": "semantic" if search_term else "fetch",
+    }, format, {})
+
+
+@app.post("/class/{class_name}")
+async def search_semantic(
+    class_name: str,
+    request: SearchRequest,
+    http_request: Request,
+    format: ResponseFormat = "rows",
+):
+    """Semantic search (or paginated fetch without a query), served through the search gate."""
+    c = await get_client()
+    return await gated_search(
+        http_request, class_name, "semantic", request, format,
+        lambda: run_semantic(c, class_name, request, format),
+    )
+
+
+async def run_bm25(
+    c: weaviate.WeaviateAsyncClient,
+    class_name: str,
+    request: BM25SearchRequest,
+    format: ResponseFormat = "rows",
+) -> Response:
+    """
+    Search a collection using BM25 (keyword) search.
+    Best for exact term matching.
+    """
+    collection = c.collections.get(class_name)
+
+    filters = build_filter(request.filters)
+
+    # Weaviate v4 has no aggregate.bm25 - a keyword-only (alpha=0) hybrid aggregate counts BM25 matches
+    properties, response, fetched = await asyncio.gather(
+        get_property_names(c, class_name, request.properties),
+        timed_await("query", collection.query.bm25(
+            query=request.query,
+            filters=filters,
+            limit=request.limit,
+            offset=request.offset,
+            return_properties=request.properties,
+            return_metadata=["score", "explain_score"],
+        )),
+        fetch_count(
+            c, class_name, request.count,
+            lambda: collection.aggregate.hybrid(query=request.query, alpha=0, filters=filters, total_count=True),
+            filtered=filters is not None,
+        ),
+    )
+
+    with timed("serialize"):
+        data = serialize_objects(response.objects, properties, format, request.preview_chars)
+
+    return render_response({
+        "data": data,
+        "count": finish_count(request.count, fetched, len(response.objects), request.offset, request.limit),
+        "search_type": "bm25",
+    }, format, {})
+
+
+@app.post("/class/{class_name}/bm25")
+async def search_bm25(
+    class_name: str,
+    request: BM25SearchRequest,
+    http_request: Request,
+    format: ResponseFormat = "rows",
+):
+    """BM25 (keyword) search, served through the search gate."""
+    c = await get_client()
+    return await gated_search(
+        http_request, class_name, "bm25", request, format,
+        lambda: run_bm25(c, class_name, request, format),
+    )
+
+
+async def run_hybrid(
+    c: weaviate.WeaviateAsyncClient,
+    class_name: str,
+    request: HybridSearchRequest,
+    format: ResponseFormat = "rows",
+) -> Response:
+    """
+    Search a collection using hybrid search (BM25 + vector).
+    Alpha controls the balance: 0 = pure BM25, 1 = pure vector.
+    """
+    collection = c.collections.get(class_name)
+
+    filters = build_filter(request.filters)
+
+    properties, response, fetched = await asyncio.gather(
+        get_property_names(c, class_name, request.properties),
+        timed_await("query", collection.query.hybrid(
+            query=request.query,
+            alpha=request.alpha,
+            filters=filters,
+            limit=request.limit,
+            offset=request.offset,
+            return_properties=request.properties,
+            return_metadata=["score", "explain_score"],
+        )),
+        fetch_count(
+            c, class_name, request.count,
+            lambda: collection.aggregate.hybrid(
+                query=request.query, alpha=request.alpha, filters=filters, total_count=True,
+            ),
+            filtered=filters is not None,
+        ),
+    )
+
+    with timed("serialize"):
+        data = serialize_objects(response.objects, properties, format, request.preview_chars)
+
+    return render_response({
+        "data": data,
+        "count": finish_count(request.count, fetched, len(response.objects), request.offset, request.limit),
+        "search_type": "hybrid",
+        "alpha": request.alpha,
+    }, format, {})
+
+
+@app.post("/class/{class_name}/hybrid")
+async def search_hybrid(
+    class_name: str,
+    request: HybridSearchRequest,
+    http_request: Request,
+    format: ResponseFormat = "rows",
+):
+    """Hybrid search, served through the search gate."""
+    c = await get_client()
+    return await gated_search(
+        http_request, class_name, "hybrid", request, format,
+        lambda: run_hybrid(c, class_name, request, format),
+    )
+
+
+@app.post("/class/{class_name}/generate")
+async def generative_search(
+    class_name: str,
+    request: GenerativeRequest,
+):
+    """
+    Generative search (RAG) - uses an LLM to generate responses based on retrieved objects.
+    Runs uncached in async mode; the sync app caches generations per object.
+    """
+    if not request.prompt and not request.grouped_task:
+        raise HTTPException(status_code=422, detail="Provide prompt and/or grouped_task")
+    c = await get_client()
+    collection = c.collections.get(class_name)
+
+    generate = {
+        "single_prompt": request.prompt,
+        "grouped_task": request.grouped_task,
+        "filters": build_filter(request.filters),
+        "limit": request.limit,
+    }
+    if request.query and request.search_mode == "bm25":
+        query = collection.generate.bm25(query=request.query, **generate)
+    elif request.query and request.search_mode == "hybrid":
+        query = collection.generate.hybrid(query=request.query, alpha=request.alpha, **generate)
+    elif request.query:
+        query = collection.generate.near_text(
+            query=request.query,
+            certainty=request.certainty,
+            return_metadata=["certainty", "distance"],
+            **generate,
+        )
+    else:
+        query = collection.generate.fetch_objects(**generate)
+
+    properties, response = await asyncio.gather(
+        get_property_names(c, class_name, request.properties),
+        timed_await("generate", query),
+    )
+
+    data = []
+    for obj in response.objects:
+        formatted = format_object(obj, properties)
+        generated = obj.generative.text if obj.generative else None
+        if generated:
+            formatted["generated"] = generated
+        data.append(formatted)
+
+    return {
+        "data": data,
+        "count": len(data),
+        "search_type": "generative",
+        "grouped": response.generative.text if response.generative else None,
+    }
+
+
+async def run_aggregate(
+    c: weaviate.WeaviateAsyncClient,
+    class_name: str,
+    request: AggregateRequest,
+) -> dict:
+    """
+    Aggregate the (filtered) collection: total count and property metrics in one call,
+    plus one grouped aggregate per group_by property, all run concurrently.
+    """
+    collection = c.collections.get(class_name)
+    filters = build_filter(request.filters)
+
+    metrics = None
+    if request.metrics:
+        names = None if request.metrics == ["*"] else request.metrics
+        config = await get_collection_config(c, class_name)
+        metrics = property_metrics(config.properties, names, request.top_occurrences)
+
+    group_by = request.group_by or []
+    responses = await asyncio.gather(
+        timed_await("aggregate", collection.aggregate.over_all(
+            filters=filters, total_count=True, return_metrics=metrics or None,
+        )),
+        *(
+            timed_await("aggregate", collection.aggregate.over_all(
+                filters=filters,
+                group_by=facet_group_by(prop, request.group_limit),
+                total_count=True,
+                return_metrics=metrics if request.group_metrics and metrics else None,
+            ))
+            for prop in group_by
+        ),
+    )
+    response, grouped = responses[0], responses[1:]
+    result = {"total_count": response.total_count}
+    if metrics:
+        result["properties"] = properties_payload(response.properties)
+    if group_by:
+        result["groups"] = {prop: groups_payload(g) for prop, g in zip(group_by, grouped)}
+    return result
+
+
+@app.post("/class/{class_name}/aggregate")
+async def aggregate_collection(
+    class_name: str,
+    request: AggregateRequest,
+):
+    """
+    Aggregate a collection: total count, per-property stats (`metrics`) and value counts
+    per `group_by` property. Unfiltered results come from the background-refreshed facet cache.
+    """
+    c = await get_client()
+    if request.filters is not None:
+        return await run_aggregate(c, class_name, request)
+    key = (class_name, request.model_dump_json())
+    return await facet_cache.aget(key, lambda: run_aggregate(c, class_name, request))
+
+
+@app.get("/class/{class_name}/facets")
+async def get_facets(
+    class_name: str,
+    group_by: str | None = None,
+    top: int = 10,
+):
+    """
+    Facet panel data in one cached call: stats for every aggregatable property,
+    plus value counts for the comma-separated group_by properties.
+    """
+    request = AggregateRequest(
+        metrics=["*"],
+        top_occurrences=top,
+        group_by=[name.strip() for name in group_by.split(",") if name.strip()] if group_by else None,
+    )
+    return await aggregate_collection(class_name, request)
+
+
+# Mount static files for frontend
+app.mount("/", PrecompressedStaticFiles(directory="static", html=True), name="static")
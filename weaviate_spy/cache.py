@@ -0,0 +1,413 @@
+"""
+In-process caches for Weaviate Spy.
+LRU + TTL storage with singleflight loading and hit/miss counters.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Hashable
+
+from loguru import logger
+
+
+class _Flight:
+    """A load in progress that concurrent callers can wait on."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry TTL.
+    Concurrent misses for the same key share a single loader call.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._flights: dict[Hashable, _Flight] = {}
+        self._async_flights: dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, key: Hashable) -> tuple[bool, Any]:
+        """Return (found, value) for a fresh entry; caller holds the lock."""
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return False, None
+        self._data.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Hashable, value: Any, ttl: float | None = None):
+        """Insert a value and evict least recently used entries; caller holds the lock."""
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value without loading it."""
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None):
+        """Store a value, optionally with a custom TTL."""
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], ttl: float | None = None) -> Any:
+        """
+        Return the cached value for key, calling loader on a miss.
+        Only one loader runs per key; other callers wait for its result.
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            with self._lock:
+                self._store(key, flight.value, ttl)
+            return flight.value
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    async def aget_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float | None = None,
+    ) -> Any:
+        """Async variant of get_or_load for use from the event loop."""
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            flight = self._async_flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._async_flights[key] = asyncio.get_running_loop().create_future()
+
+        if not leader:
+            return await asyncio.shield(flight)
+
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as e:
+            flight.set_exception(e)
+            flight.exception()  # mark retrieved when nobody is waiting
+            raise
+        else:
+            with self._lock:
+                self._store(key, value, ttl)
+            flight.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._async_flights.pop(key, None)
+
+    def invalidate(self, predicate: Callable[[Hashable], bool] | None = None) -> int:
+        """Drop entries matching predicate (all entries if None). Returns the number dropped."""
+        with self._lock:
+            if predicate is None:
+                dropped = len(self._data)
+                self._data.clear()
+                return dropped
+            keys = [k for k in self._data if predicate(k)]
+            for k in keys:
+                del self._data[k]
+            return len(keys)
+
+    def stats(self) -> dict:
+        """Return cache size and counters."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+
+class RefreshingCache:
+    """
+    Stale-while-revalidate cache holding at most maxsize entries (least recently used go first).
+    Values older than refresh_after are returned as-is while a background refresh runs.
+    Only the first load for a key blocks the caller.
+    """
+
+    def __init__(self, refresh_after: float = 30.0, max_workers: int = 2, maxsize: int = 1024):
+        self.refresh_after = refresh_after
+        self.maxsize = maxsize
+        self._values: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._flights: dict[Hashable, _Flight] = {}
+        self._refreshing: set[Hashable] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cache-refresh")
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.evictions = 0
+
+    def _peek(self, key: Hashable) -> tuple[bool, Any, bool]:
+        """Return (found, value, needs_refresh) and claim the refresh; caller holds the lock."""
+        entry = self._values.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None, False
+        self.hits += 1
+        self._values.move_to_end(key)
+        fetched_at, value = entry
+        stale = time.monotonic() - fetched_at > self.refresh_after
+        if stale and key not in self._refreshing:
+            self._refreshing.add(key)
+            self.refreshes += 1
+            return True, value, True
+        return True, value, False
+
+    def _put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._values[key] = (time.monotonic(), value)
+            self._values.move_to_end(key)
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+                self.evictions += 1
+
+    def _load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Blocking load shared by concurrent callers of the same key."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+            self._put(key, flight.value)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any]):
+        try:
+            self._put(key, loader())
+        except Exception as e:
+            logger.warning(f"Background refresh failed for {key}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value, refreshing it in a worker thread when stale."""
+        with self._lock:
+            found, value, refresh = self._peek(key)
+        if refresh:
+            self._executor.submit(self._refresh, key, loader)
+        if found:
+            return value
+        return self._load(key, loader)
+
+    def get_nowait(self, key: Hashable, loader: Callable[[], Any], default: Any = None) -> Any:
+        """Like get, but a miss returns default and loads the value in a worker thread instead of blocking."""
+        with self._lock:
+            found, value, refresh = self._peek(key)
+            if not found and key not in self._refreshing:
+                self._refreshing.add(key)
+                refresh = True
+        if refresh:
+            self._executor.submit(self._refresh, key, loader)
+        return value if found else default
+
+    async def aget(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant of get; refreshes run as event loop tasks."""
+        with self._lock:
+            found, value, refresh = self._peek(key)
+        if refresh:
+            async def _arefresh():
+                try:
+                    self._put(key, await loader())
+                except Exception as e:
+                    logger.warning(f"Background refresh failed for {key}: {e}")
+                finally:
+                    with self._lock:
+                        self._refreshing.discard(key)
+
+            task = asyncio.create_task(_arefresh())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        if found:
+            return value
+        value = await loader()
+        self._put(key, value)
+        return value
+
+    def invalidate(self, predicate: Callable[[Hashable], bool] | None = None) -> int:
+        """Drop entries matching predicate (all entries if None). Returns the number dropped."""
+        with self._lock:
+            keys = [k for k in self._values if predicate is None or predicate(k)]
+            for k in keys:
+                del self._values[k]
+            return len(keys)
+
+    def stats(self) -> dict:
+        """Return cache size and counters."""
+        with self._lock:
+            return {
+                "size": len(self._values),
+                "maxsize": self.maxsize,
+                "refresh_after": self.refresh_after,
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "evictions": self.evictions,
+            }
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache of serialized responses bounded by a byte budget.
+    Entries are grouped by collection and tagged with the collection version
+    they were computed against; a get with a new version drops the collection's
+    entries. A set computed against any version other than the latest one seen
+    is ignored, so a slow request cannot store a stale body or roll the version back.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 300.0):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._data: OrderedDict[tuple[str, Hashable], tuple[float, bytes]] = OrderedDict()
+        self._versions: dict[str, Hashable] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_sets = 0
+
+    def _drop(self, key: tuple[str, Hashable]):
+        _, body = self._data.pop(key)
+        self._bytes -= len(body)
+
+    def _check_version(self, collection_name: str, version: Hashable):
+        """Drop a collection's entries when its version changed; caller holds the lock."""
+        if self._versions.get(collection_name, version) != version:
+            for key in [k for k in self._data if k[0] == collection_name]:
+                self._drop(key)
+            self.invalidations += 1
+        self._versions[collection_name] = version
+
+    def get(self, collection_name: str, key: Hashable, version: Hashable) -> bytes | None:
+        """Return the cached body, or None on a miss."""
+        with self._lock:
+            self._check_version(collection_name, version)
+            entry = self._data.get((collection_name, key))
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._drop((collection_name, key))
+                self.misses += 1
+                return None
+            self._data.move_to_end((collection_name, key))
+            self.hits += 1
+            return entry[1]
+
+    def set(self, collection_name: str, key: Hashable, version: Hashable, body: bytes):
+        """Store a body, evicting least recently used entries to stay within the byte budget."""
+        if len(body) > self.max_bytes // 4:
+            return  # one huge page should not flush the whole cache
+        with self._lock:
+            current = self._versions.setdefault(collection_name, version)
+            if current != version:
+                self.stale_sets += 1
+                return
+            if (collection_name, key) in self._data:
+                self._drop((collection_name, key))
+            self._data[(collection_name, key)] = (time.monotonic() + self.ttl, body)
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._data)))
+                self.evictions += 1
+
+    def invalidate(self, collection_name: str | None = None) -> int:
+        """Drop entries for one collection (or all). Returns the number dropped."""
+        with self._lock:
+            keys = [k for k in self._data if collection_name is None or k[0] == collection_name]
+            for key in keys:
+                self._drop(key)
+            return len(keys)
+
+    def stats(self) -> dict:
+        """Return cache size and counters."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "version_invalidations": self.invalidations,
+                "stale_sets": self.stale_sets,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
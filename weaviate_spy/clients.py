@@ -0,0 +1,302 @@
+"""
+Weaviate client registry.
+One lazily connected, pooled client per configured cluster, reconnected with
+exponential backoff, plus a background prober that keeps a cached health status
+so liveness checks never have to call Weaviate. A failed probe drops the client,
+so the next request or probe builds a fresh one instead of reusing dead channels.
+
+Only the HTTP session is pooled (pool_connections / pool_maxsize). The v4 client
+sends every gRPC query over a single channel, multiplexed as HTTP/2 streams; the
+pool settings do not limit or widen it.
+"""
+
+import os
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Mapping
+from urllib.parse import unquote_plus
+
+import weaviate
+from weaviate.classes.init import AdditionalConfig, Timeout
+from weaviate.config import ConnectionConfig
+from loguru import logger
+
+DEFAULT_CLUSTER = "default"
+
+# Cluster selected for the current request (X-Weaviate-Cluster header or ?cluster=)
+current_cluster: ContextVar[str] = ContextVar("weaviate_spy_cluster", default=DEFAULT_CLUSTER)
+
+
+def _env_flag(value: str | None) -> bool:
+    return (value or "").lower() in ("true", "1", "yes")
+
+
+class ClusterUnavailable(Exception):
+    """The cluster has no live client and the next reconnect attempt is not due yet (or failed)."""
+
+
+@dataclass(frozen=True)
+class ClusterConfig:
+    """Connection settings for one Weaviate cluster."""
+    name: str
+    http_host: str = "localhost"
+    http_port: int = 8080
+    http_secure: bool = False
+    grpc_host: str = "localhost"
+    grpc_port: int = 50051
+    grpc_secure: bool = False
+    api_key: str | None = None
+    bearer_token: str | None = None
+    pool_connections: int = 20
+    pool_maxsize: int = 100
+    timeout: float = 30.0
+
+    @classmethod
+    def from_env(cls, name: str, env: Mapping[str, str], defaults: "ClusterConfig") -> "ClusterConfig":
+        """Read WEAVIATE_<NAME>_HOST, _PORT, ... falling back to the default cluster's settings."""
+        prefix = f"WEAVIATE_{name.upper().replace('-', '_')}_"
+
+        def get(key: str, default: Any) -> Any:
+            return env.get(prefix + key, default)
+
+        return cls(
+            name=name,
+            http_host=get("HOST", defaults.http_host),
+            http_port=int(get("PORT", defaults.http_port)),
+            http_secure=_env_flag(get("SECURE", str(defaults.http_secure))),
+            grpc_host=get("GRPC_HOST", get("HOST", defaults.grpc_host)),
+            grpc_port=int(get("GRPC_PORT", defaults.grpc_port)),
+            grpc_secure=_env_flag(get("GRPC_SECURE", str(defaults.grpc_secure))),
+            api_key=get("API_KEY", None),
+            bearer_token=get("BEARER_TOKEN", None),
+            pool_connections=defaults.pool_connections,
+            pool_maxsize=defaults.pool_maxsize,
+            timeout=defaults.timeout,
+        )
+
+    def auth_credentials(self) -> weaviate.auth.AuthCredentials | None:
+        if self.api_key:
+            return weaviate.auth.Auth.api_key(self.api_key)
+        if self.bearer_token:
+            return weaviate.auth.Auth.bearer_token(self.bearer_token)
+        return None
+
+    def connect(self) -> weaviate.WeaviateClient:
+        """Open a client with a pooled HTTP session; gRPC multiplexes over one channel, which the pool does not size."""
+        return weaviate.connect_to_custom(
+            http_host=self.http_host,
+            http_port=self.http_port,
+            http_secure=self.http_secure,
+            grpc_host=self.grpc_host,
+            grpc_port=self.grpc_port,
+            grpc_secure=self.grpc_secure,
+            auth_credentials=self.auth_credentials(),
+            additional_config=AdditionalConfig(
+                connection=ConnectionConfig(
+                    session_pool_connections=self.pool_connections,
+                    session_pool_maxsize=self.pool_maxsize,
+                ),
+                timeout=Timeout(query=self.timeout),
+            ),
+        )
+
+
+def clusters_from_env(default: ClusterConfig, env: Mapping[str, str] = os.environ) -> list[ClusterConfig]:
+    """The default cluster plus every name listed in WEAVIATE_CLUSTERS (comma-separated)."""
+    names = [n.strip() for n in env.get("WEAVIATE_CLUSTERS", "").split(",") if n.strip()]
+    return [default] + [ClusterConfig.from_env(n, env, default) for n in names if n != default.name]
+
+
+class ClusterClient:
+    """A cluster's client, connected on first use and reconnected with exponential backoff."""
+
+    def __init__(self, config: ClusterConfig, backoff: float = 1.0, max_backoff: float = 60.0):
+        self.config = config
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.client: Any = None
+        self.healthy = False
+        self.last_error: str | None = None
+        self.last_checked: float | None = None
+        self.failures = 0
+        self._next_attempt = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        """Return the connected client, connecting if needed. Raises ClusterUnavailable."""
+        client = self.client
+        if client is not None:
+            return client
+        with self._lock:
+            if self.client is not None:
+                return self.client
+            if time.monotonic() < self._next_attempt:
+                raise ClusterUnavailable(self.last_error or "reconnect pending")
+            try:
+                self.client = self.config.connect()
+            except Exception as e:
+                delay = self._fail(e)
+                logger.warning(f"Cluster {self.config.name}: connect failed ({e}), retrying in {delay:.0f}s")
+                raise ClusterUnavailable(str(e)) from e
+            self.failures = 0
+            self.healthy = True
+            self.last_error = None
+            logger.info(f"Cluster {self.config.name}: connected to Weaviate")
+            return self.client
+
+    def _fail(self, error: Exception) -> float:
+        """Record a failure and schedule the next connect attempt; caller holds the lock. Returns the delay."""
+        self.failures += 1
+        delay = min(self.max_backoff, self.backoff * 2 ** (self.failures - 1))
+        self._next_attempt = time.monotonic() + delay
+        self.healthy = False
+        self.last_error = str(error)
+        return delay
+
+    def _discard(self, client: Any, error: Exception):
+        """Drop a client whose probe failed, unless it was already replaced; the next get() reconnects."""
+        with self._lock:
+            if self.client is not client:
+                return
+            self.client = None
+            delay = self._fail(error)
+        logger.warning(f"Cluster {self.config.name}: probe failed ({error}), reconnecting in {delay:.0f}s")
+        try:
+            client.close()
+        except Exception as e:
+            logger.debug(f"Cluster {self.config.name}: closing the old client failed: {e}")
+
+    def attach(self, client: Any):
+        """Use an already built client (benchmarks, tests)."""
+        with self._lock:
+            self.client = client
+            self.healthy = True
+            self.last_error = None
+            self.failures = 0
+
+    def probe(self):
+        """
+        Refresh the cached health status; connects (respecting backoff) when there is no client.
+        A probe that raises drops the client, so its broken HTTP session and gRPC channel are rebuilt.
+        """
+        try:
+            client = self.get()
+        except ClusterUnavailable:
+            self.last_checked = time.time()
+            return
+        try:
+            ready = client.is_ready()
+            self.healthy = bool(ready)
+            self.last_error = None if ready else "Weaviate not ready"
+        except Exception as e:
+            self._discard(client, e)
+        self.last_checked = time.time()
+
+    def status(self) -> dict:
+        return {
+            "name": self.config.name,
+            "host": self.config.http_host,
+            "healthy": self.healthy,
+            "connected": self.client is not None,
+            "error": self.last_error,
+            "failures": self.failures,
+            "checked_at": self.last_checked,
+        }
+
+    def close(self):
+        with self._lock:
+            if self.client is not None:
+                self.client.close()
+                self.client = None
+                self.healthy = False
+
+
+class ClientRegistry:
+    """Clusters by name, with a background health prober."""
+
+    def __init__(self, configs: list[ClusterConfig], probe_interval: float = 10.0, startup_wait: float = 5.0):
+        self.clusters = {config.name: ClusterClient(config) for config in configs}
+        self.probe_interval = probe_interval
+        self.startup_wait = startup_wait
+        self._stop = threading.Event()
+        self._first_pass = threading.Event()
+        self._prober: threading.Thread | None = None
+
+    def cluster(self, name: str | None = None) -> ClusterClient:
+        """Look up a cluster by name (the request's cluster if None). Raises KeyError."""
+        return self.clusters[name or current_cluster.get()]
+
+    def get(self, name: str | None = None) -> Any:
+        """Client for a cluster. Raises KeyError for unknown names, ClusterUnavailable when down."""
+        return self.cluster(name).get()
+
+    def probe_all(self):
+        for cluster in self.clusters.values():
+            cluster.probe()
+
+    def _run_prober(self):
+        while not self._stop.is_set():
+            self.probe_all()
+            self._first_pass.set()
+            self._stop.wait(self.probe_interval)
+
+    def start(self):
+        """
+        Start the prober thread and wait up to startup_wait seconds for its first pass, so
+        /health reports real status from the first request. Slower clusters keep connecting
+        in the background and report unhealthy until they answer.
+        """
+        if self._prober is None:
+            self._stop.clear()
+            self._first_pass.clear()
+            self._prober = threading.Thread(target=self._run_prober, name="weaviate-prober", daemon=True)
+            self._prober.start()
+        if not self._first_pass.wait(self.startup_wait):
+            logger.warning(f"First health probe still running after {self.startup_wait:.0f}s, continuing startup")
+
+    def close(self):
+        self._stop.set()
+        if self._prober is not None:
+            self._prober.join(timeout=5)
+            self._prober = None
+        for cluster in self.clusters.values():
+            try:
+                cluster.close()
+            except Exception as e:
+                logger.warning(f"Cluster {cluster.config.name}: close failed: {e}")
+
+    def status(self) -> list[dict]:
+        return [cluster.status() for cluster in self.clusters.values()]
+
+
+class ClusterMiddleware:
+    """ASGI middleware selecting the request's cluster from X-Weaviate-Cluster or ?cluster=."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        name = None
+        for key, value in scope.get("headers", []):
+            if key == b"x-weaviate-cluster":
+                name = value.decode()
+                break
+        if name is None:
+            for pair in scope.get("query_string", b"").decode().split("&"):
+                key, _, value = pair.partition("=")
+                if key == "cluster" and value:
+                    name = unquote_plus(value)
+                    break
+        if not name:
+            await self.app(scope, receive, send)
+            return
+        token = current_cluster.set(name)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_cluster.reset(token)
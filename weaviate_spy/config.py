@@ -0,0 +1,84 @@
+"""
+Weaviate Spy configuration.
+Settings read from the environment (and .env), shared by the sync app
+(weaviate_spy.main) and the async app (weaviate_spy.async_main).
+"""
+
+import os
+
+import weaviate
+from dotenv import load_dotenv
+
+load_dotenv()
+
+WEAVIATE_HOST = os.getenv("WEAVIATE_HOST", "localhost")
+WEAVIATE_PORT = int(os.getenv("WEAVIATE_PORT", "8080"))
+WEAVIATE_SECURE = os.getenv("WEAVIATE_SECURE", "").lower() in ("true", "1", "yes")
+WEAVIATE_GRPC_HOST = os.getenv("WEAVIATE_GRPC_HOST", "localhost")
+WEAVIATE_GRPC_PORT = int(os.getenv("WEAVIATE_GRPC_PORT", "50051"))
+WEAVIATE_GRPC_SECURE = os.getenv("WEAVIATE_GRPC_SECURE", "").lower() in ("true", "1", "yes")
+WEAVIATE_API_KEY = os.getenv("WEAVIATE_API_KEY", None)
+WEAVIATE_BEARER_TOKEN = os.getenv("WEAVIATE_BEARER_TOKEN", None)
+# Extra clusters (comma-separated names), each configured by WEAVIATE_<NAME>_HOST, _PORT, _GRPC_HOST, ...
+WEAVIATE_CLUSTERS = os.getenv("WEAVIATE_CLUSTERS", "")
+WEAVIATE_POOL_CONNECTIONS = int(os.getenv("WEAVIATE_POOL_CONNECTIONS", "20"))
+WEAVIATE_POOL_MAXSIZE = int(os.getenv("WEAVIATE_POOL_MAXSIZE", "100"))
+WEAVIATE_TIMEOUT = float(os.getenv("WEAVIATE_TIMEOUT", "30"))
+HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "10"))
+HEALTH_PROBE_STARTUP_WAIT = float(os.getenv("HEALTH_PROBE_STARTUP_WAIT", "5"))
+SCHEMA_CACHE_TTL = float(os.getenv("SCHEMA_CACHE_TTL", "60"))
+SCHEMA_CACHE_SIZE = int(os.getenv("SCHEMA_CACHE_SIZE", "256"))
+COUNT_CACHE_REFRESH = float(os.getenv("COUNT_CACHE_REFRESH", "30"))
+FACET_CACHE_REFRESH = float(os.getenv("FACET_CACHE_REFRESH", "60"))
+FACET_CACHE_SIZE = int(os.getenv("FACET_CACHE_SIZE", "1024"))
+CURSOR_INDEX_SIZE = int(os.getenv("CURSOR_INDEX_SIZE", "100000"))
+QUERY_CACHE_BYTES = int(os.getenv("QUERY_CACHE_BYTES", str(64 * 1024 * 1024)))
+QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", "300"))
+# Search flow control: searches running at once per collection, and how many more may wait
+# Default matches the threadpool (40 workers) that runs sync handlers
+SEARCH_CONCURRENCY = int(os.getenv("SEARCH_CONCURRENCY", "40"))
+SEARCH_QUEUE_SIZE = int(os.getenv("SEARCH_QUEUE_SIZE", "8"))
+# Vector projections: max points per request, cache byte budget and TTL (seconds)
+PROJECTION_MAX_POINTS = int(os.getenv("PROJECTION_MAX_POINTS", "100000"))
+PROJECTION_CACHE_BYTES = int(os.getenv("PROJECTION_CACHE_BYTES", str(256 * 1024 * 1024)))
+PROJECTION_CACHE_TTL = float(os.getenv("PROJECTION_CACHE_TTL", "3600"))
+# Background vector analysis: result directory and jobs running at once
+ANALYSIS_DIR = os.getenv("ANALYSIS_DIR", "analysis")
+ANALYSIS_CONCURRENCY = int(os.getenv("ANALYSIS_CONCURRENCY", "1"))
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_REFRESH = float(os.getenv("PROFILE_REFRESH", "300"))
+PROFILE_REBUILD_RATIO = float(os.getenv("PROFILE_REBUILD_RATIO", "0.2"))
+PROFILE_MAX_PAGE = int(os.getenv("PROFILE_MAX_PAGE", "10000"))
+# Opt-in: embed search text in weaviate-spy ("ollama") instead of letting Weaviate vectorize it.
+# The model must match the collection's vectorizer.
+QUERY_EMBEDDER = os.getenv("QUERY_EMBEDDER", "")
+QUERY_EMBEDDER_URL = os.getenv("QUERY_EMBEDDER_URL", "http://localhost:11434")
+QUERY_EMBEDDER_MODEL = os.getenv("QUERY_EMBEDDER_MODEL", "granite-embedding:278m")
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", None)
+# Max LLM generation calls in flight across all streaming requests
+GENERATION_CONCURRENCY = int(os.getenv("GENERATION_CONCURRENCY", "2"))
+GENERATION_CACHE_SIZE = int(os.getenv("GENERATION_CACHE_SIZE", "10000"))
+GENERATION_CACHE_TTL = float(os.getenv("GENERATION_CACHE_TTL", "86400"))
+# Batch search: max queries per request (after alpha sweeps expand) and parallel Weaviate queries
+BATCH_MAX_QUERIES = int(os.getenv("BATCH_MAX_QUERIES", "32"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+# Rank fusion: max candidates per source; opt-in local reranker ("cross-encoder", needs sentence-transformers)
+FUSION_MAX_CANDIDATES = int(os.getenv("FUSION_MAX_CANDIDATES", "1000"))
+RERANKER = os.getenv("RERANKER", "")
+RERANKER_MODEL = os.getenv("RERANKER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+# Bulk import: fixed-size batching defaults, and how long / how many failed objects are kept for retry
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "200"))
+IMPORT_CONCURRENT_REQUESTS = int(os.getenv("IMPORT_CONCURRENT_REQUESTS", "2"))
+IMPORT_FAILED_TTL = float(os.getenv("IMPORT_FAILED_TTL", "3600"))
+IMPORT_MAX_FAILED = int(os.getenv("IMPORT_MAX_FAILED", "10000"))
+
+
+def get_auth_credentials() -> weaviate.auth.AuthCredentials | None:
+    """Get authentication credentials from environment variables."""
+    if WEAVIATE_API_KEY:
+        return weaviate.auth.Auth.api_key(WEAVIATE_API_KEY)
+    elif WEAVIATE_BEARER_TOKEN:
+        return weaviate.auth.Auth.bearer_token(WEAVIATE_BEARER_TOKEN)
+    return None
@@ -0,0 +1,228 @@
+"""
+Query embedding for Weaviate Spy.
+Embeds search text in-process through a pluggable embedder and caches the
+vectors in a bounded LRU, optionally backed by a memory-mapped float32 file,
+so repeated searches can use near_vector / hybrid(vector=...) without
+re-vectorizing the query inside Weaviate.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Protocol
+
+import httpx
+import numpy as np
+from loguru import logger
+
+
+class Embedder(Protocol):
+    """Anything that turns texts into vectors. Tests can pass a stub."""
+
+    model: str
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        ...
+
+
+class OllamaEmbedder:
+    """Embedder backed by Ollama's /api/embed endpoint."""
+
+    def __init__(self, endpoint: str, model: str, timeout: float = 30.0):
+        self.endpoint = endpoint.rstrip("/")
+        self.model = model
+        self._http = httpx.Client(timeout=timeout)
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        response = self._http.post(
+            f"{self.endpoint}/api/embed",
+            json={"model": self.model, "input": texts},
+        )
+        response.raise_for_status()
+        return response.json()["embeddings"]
+
+
+class EmbeddingCache:
+    """
+    LRU of text -> float32 vector with a fixed number of slots.
+    Vectors live in one (capacity, dim) array, memory-mapped to `path` when given;
+    an append-only slot log and a metadata file (capacity, dim, model) next to it
+    let the cache survive restarts. A store written with another capacity or model
+    is discarded on open.
+    """
+
+    def __init__(self, capacity: int = 10_000, path: str | None = None, model: str = ""):
+        self.capacity = capacity
+        self.path = path
+        self.model = model
+        self._slots: OrderedDict[str, int] = OrderedDict()
+        self._free = list(range(capacity - 1, -1, -1))
+        self._vectors: np.ndarray | None = None
+        self._log = None
+        self._log_lines = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            self._load()
+
+    def key(self, text: str) -> str:
+        return hashlib.sha1(f"{self.model}\0{text}".encode()).hexdigest()
+
+    def _allocate(self, dim: int):
+        """Create the vector store once the dimension is known."""
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            if os.path.exists(self.path):
+                self._vectors = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(self.capacity, dim))
+            else:
+                self._vectors = np.memmap(self.path, dtype=np.float32, mode="w+", shape=(self.capacity, dim))
+                meta = {"capacity": self.capacity, "dim": dim, "model": self.model}
+                with open(self.path + ".json.tmp", "w") as f:
+                    json.dump(meta, f)
+                os.replace(self.path + ".json.tmp", self.path + ".json")
+            self._log = open(self.path + ".idx", "a")
+        else:
+            self._vectors = np.zeros((self.capacity, dim), dtype=np.float32)
+
+    def _discard(self, reason: str):
+        """Remove a persisted store that cannot be reopened as is."""
+        logger.warning(f"Discarding query embedding cache {self.path}: {reason}")
+        for suffix in ("", ".idx", ".json"):
+            try:
+                os.remove(self.path + suffix)
+            except FileNotFoundError:
+                pass
+
+    def _load(self):
+        """Reopen a persisted store and replay its slot log."""
+        log_path = self.path + ".idx"
+        try:
+            with open(self.path + ".json") as f:
+                meta = json.load(f)
+            dim = int(meta["dim"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self._discard("missing or unreadable metadata")
+            return
+        if meta.get("capacity") != self.capacity or meta.get("model") != self.model:
+            self._discard(
+                f"written for capacity {meta.get('capacity')} and model {meta.get('model')!r}, "
+                f"now {self.capacity} and {self.model!r}"
+            )
+            return
+        if dim <= 0 or os.path.getsize(self.path) != 4 * self.capacity * dim:
+            self._discard("file size does not match its metadata")
+            return
+        if not os.path.exists(log_path):
+            self._discard("missing slot log")
+            return
+        # Replay the log: an entry is live if its slot was not reassigned later
+        key_of_slot: dict[int, str] = {}
+        slot_of_key: dict[str, int] = {}
+        with open(log_path) as f:
+            for line in f:
+                key, _, slot = line.strip().partition("\t")
+                if slot.isdigit() and int(slot) < self.capacity:
+                    key_of_slot[int(slot)] = key
+                    slot_of_key[key] = int(slot)
+        self._allocate(dim)
+        for key, slot in slot_of_key.items():
+            if key_of_slot.get(slot) == key:
+                self._slots[key] = slot
+        used = set(self._slots.values())
+        self._free = [s for s in range(self.capacity - 1, -1, -1) if s not in used]
+        self._log_lines = len(self._slots)
+        logger.info(f"Loaded {len(self._slots)} cached query embeddings from {self.path}")
+
+    def _compact_log(self):
+        """Rewrite the slot log with only live entries."""
+        self._log.close()
+        with open(self.path + ".idx", "w") as f:
+            for key, slot in self._slots.items():
+                f.write(f"{key}\t{slot}\n")
+        self._log = open(self.path + ".idx", "a")
+        self._log_lines = len(self._slots)
+
+    def get(self, text: str) -> list[float] | None:
+        key = self.key(text)
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                self.misses += 1
+                return None
+            self._slots.move_to_end(key)
+            self.hits += 1
+            return self._vectors[slot].tolist()
+
+    def put(self, text: str, vector: list[float]):
+        key = self.key(text)
+        with self._lock:
+            if self._vectors is None:
+                self._allocate(len(vector))
+            if len(vector) != self._vectors.shape[1]:
+                raise ValueError(f"Embedding dimension {len(vector)} does not match cache dimension {self._vectors.shape[1]}")
+            slot = self._slots.get(key)
+            if slot is None:
+                if self._free:
+                    slot = self._free.pop()
+                else:
+                    _, slot = self._slots.popitem(last=False)
+            self._slots[key] = slot
+            self._slots.move_to_end(key)
+            self._vectors[slot] = vector
+            if self._log is not None:
+                self._log.write(f"{key}\t{slot}\n")
+                self._log.flush()
+                self._log_lines += 1
+                if self._log_lines > 4 * self.capacity:
+                    self._compact_log()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._slots),
+                "capacity": self.capacity,
+                "dim": None if self._vectors is None else self._vectors.shape[1],
+                "persistent": self.path is not None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+
+class QueryEmbedder:
+    """Embeds query text through an Embedder, serving repeats from an EmbeddingCache."""
+
+    def __init__(self, embedder: Embedder, cache: EmbeddingCache):
+        self.embedder = embedder
+        self.cache = cache
+
+    def embed(self, text: str) -> list[float]:
+        vector = self.cache.get(text)
+        if vector is None:
+            vector = self.embedder.embed([text])[0]
+            self.cache.put(text, vector)
+        return vector
+
+
+def build_query_embedder(
+    kind: str,
+    endpoint: str,
+    model: str,
+    cache_size: int,
+    cache_dir: str | None,
+) -> QueryEmbedder | None:
+    """Build the configured query embedder, or None when the mode is off."""
+    if not kind:
+        return None
+    if kind != "ollama":
+        raise ValueError(f"Unknown query embedder: {kind}")
+    path = None
+    if cache_dir:
+        safe_model = re.sub(r"[^A-Za-z0-9_.-]", "_", model)
+        path = os.path.join(cache_dir, f"query-embeddings-{safe_model}.f32")
+    return QueryEmbedder(OllamaEmbedder(endpoint, model), EmbeddingCache(cache_size, path, model))
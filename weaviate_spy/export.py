@@ -0,0 +1,133 @@
+"""
+Streaming collection export.
+Row generators that turn a Weaviate object iterator into NDJSON, CSV or
+Parquet chunks without holding more than one batch in memory.
+"""
+
+import csv
+import io
+import json
+from typing import Any, Iterable, Iterator
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def vector_columns(vector: Any) -> dict:
+    """Flatten a v4 object vector into columns: `vector` for the default, `vector_<name>` for named vectors."""
+    if not vector:
+        return {}
+    if isinstance(vector, dict):
+        return {
+            "vector" if name == "default" else f"vector_{name}": list(values)
+            for name, values in vector.items()
+        }
+    return {"vector": list(vector)}
+
+
+def object_row(obj: Any, property_names: list[str] | None, include_vector: bool) -> dict:
+    """Build one export row: uuid, properties (projected if names given) and optional vectors."""
+    row = {"uuid": str(obj.uuid)}
+    if property_names is None:
+        row.update(obj.properties)
+    else:
+        for prop in property_names:
+            row[prop] = obj.properties.get(prop)
+    if include_vector:
+        row.update(vector_columns(obj.vector))
+    return row
+
+
+def iter_ndjson(rows: Iterable[dict], chunk_rows: int = 500) -> Iterator[bytes]:
+    """Yield newline-delimited JSON, a chunk of rows at a time."""
+    buffer = []
+    for row in rows:
+        buffer.append(json.dumps(row, ensure_ascii=False, default=str))
+        if len(buffer) >= chunk_rows:
+            yield ("\n".join(buffer) + "\n").encode()
+            buffer.clear()
+    if buffer:
+        yield ("\n".join(buffer) + "\n").encode()
+
+
+def _csv_value(value: Any) -> Any:
+    """Render nested values (lists, dicts) as JSON so they survive a CSV round trip."""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return value
+
+
+def iter_csv(rows: Iterable[dict], chunk_rows: int = 500) -> Iterator[bytes]:
+    """Yield CSV with a header taken from the first row."""
+    out = io.StringIO()
+    writer = None
+    pending = 0
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(out, fieldnames=list(row), extrasaction="ignore")
+            writer.writeheader()
+        writer.writerow({k: _csv_value(v) for k, v in row.items()})
+        pending += 1
+        if pending >= chunk_rows:
+            yield out.getvalue().encode()
+            out.seek(0)
+            out.truncate()
+            pending = 0
+    if out.tell():
+        yield out.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose contents are drained after every row group."""
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def iter_parquet(rows: Iterable[dict], batch_rows: int = 10_000) -> Iterator[bytes]:
+    """
+    Yield a Parquet file one row group at a time.
+    The schema is inferred from the first batch. Requires pyarrow.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    writer = None
+    batch: list[dict] = []
+
+    def flush():
+        nonlocal writer
+        if writer is None:
+            table = pa.Table.from_pylist(batch)
+            writer = pq.ParquetWriter(sink, table.schema)
+        else:
+            table = pa.Table.from_pylist(batch, schema=writer.schema)
+        writer.write_table(table)
+        batch.clear()
+        return sink.drain()
+
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_rows:
+            yield flush()
+    if batch:
+        yield flush()
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
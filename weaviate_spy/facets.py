@@ -0,0 +1,78 @@
+"""
+Facet aggregation.
+Builds Weaviate v4 aggregate metrics from a collection's property types and turns
+aggregate results (plain or grouped by a property) into JSON-ready dicts.
+"""
+
+from dataclasses import asdict
+from typing import Any
+
+from weaviate.classes.aggregate import GroupByAggregate, Metrics
+
+# Property data types with aggregate metrics; array types aggregate over their elements
+NUMERIC_TYPES = ("int", "int[]", "number", "number[]")
+TEXT_TYPES = ("text", "text[]")
+BOOLEAN_TYPES = ("boolean", "boolean[]")
+DATE_TYPES = ("date", "date[]")
+
+
+def data_type_name(prop: Any) -> str:
+    return getattr(prop.data_type, "value", prop.data_type)
+
+
+def property_metrics(properties: list, names: list[str] | None, top_occurrences: int = 10) -> list:
+    """
+    Metrics for the named properties (every aggregatable property if names is None).
+    Numbers get min/max/mean/median/mode/sum, text the top occurrences, booleans and dates their totals.
+    """
+    wanted = None if names is None else set(names)
+    metrics = []
+    for prop in properties:
+        if wanted is not None and prop.name not in wanted:
+            continue
+        data_type = data_type_name(prop)
+        metric = Metrics(prop.name)
+        if data_type in NUMERIC_TYPES:
+            build = metric.integer if data_type.startswith("int") else metric.number
+            metrics.append(build(
+                count=True, minimum=True, maximum=True, mean=True, median=True, mode=True, sum_=True,
+            ))
+        elif data_type in TEXT_TYPES:
+            metrics.append(metric.text(
+                count=True, top_occurrences_count=True, top_occurrences_value=True, limit=top_occurrences,
+            ))
+        elif data_type in BOOLEAN_TYPES:
+            metrics.append(metric.boolean(
+                count=True, total_true=True, total_false=True, percentage_true=True, percentage_false=True,
+            ))
+        elif data_type in DATE_TYPES:
+            metrics.append(metric.date_(count=True, minimum=True, maximum=True, median=True, mode=True))
+    return metrics
+
+
+def facet_group_by(prop: str, limit: int | None) -> GroupByAggregate:
+    return GroupByAggregate(prop=prop, limit=limit)
+
+
+def _metric_payload(value: Any) -> dict:
+    payload = asdict(value)
+    if "sum_" in payload:
+        payload["sum"] = payload.pop("sum_")
+    return payload
+
+
+def properties_payload(properties: dict) -> dict:
+    """Aggregate metrics per property as plain dicts."""
+    return {name: _metric_payload(value) for name, value in properties.items()}
+
+
+def groups_payload(response: Any) -> list[dict]:
+    """One entry per group value with its count and (if requested) per-group metrics."""
+    return [
+        {
+            "value": group.grouped_by.value,
+            "count": group.total_count,
+            **({"properties": properties_payload(group.properties)} if group.properties else {}),
+        }
+        for group in response.groups
+    ]
@@ -0,0 +1,154 @@
+"""
+JSON filter DSL for search, generate and aggregate requests.
+Conditions combine with and/or/not and compile to Weaviate v4 Filter objects,
+so narrowing happens inside Weaviate instead of in the grid.
+
+    {"and": [
+        {"field": "genre", "op": "equal", "value": "Komedie"},
+        {"field": "year", "op": "between", "value": [1990, 1999]},
+        {"not": {"field": "_id", "op": "contains_any", "value": ["..."]}}
+    ]}
+"""
+
+from datetime import datetime
+from typing import Any, Literal
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from weaviate.classes.query import Filter
+
+FilterOp = Literal[
+    "equal",
+    "not_equal",
+    "less_than",
+    "less_or_equal",
+    "greater_than",
+    "greater_or_equal",
+    "between",  # [low, high], both inclusive
+    "like",
+    "contains_any",
+    "contains_all",
+    "contains_none",
+    "is_none",
+]
+
+# Object metadata usable as a field, with the operators Weaviate supports on it
+METADATA_FIELDS: dict[str, tuple[str, ...]] = {
+    "_id": ("equal", "not_equal", "contains_any", "contains_none"),
+    "_creation_time": (
+        "equal", "not_equal", "less_than", "less_or_equal", "greater_than",
+        "greater_or_equal", "between", "contains_any", "contains_none",
+    ),
+    "_update_time": (
+        "equal", "not_equal", "less_than", "less_or_equal", "greater_than",
+        "greater_or_equal", "between", "contains_any", "contains_none",
+    ),
+}
+
+ORDERED_OPS = ("less_than", "less_or_equal", "greater_than", "greater_or_equal", "between")
+
+
+def _is_scalar(value: Any) -> bool:
+    return isinstance(value, (str, int, float, bool))
+
+
+def _check_value(op: str, value: Any):
+    """Raise ValueError unless value has the shape op needs."""
+    if op == "is_none":
+        if not isinstance(value, bool):
+            raise ValueError("is_none needs a boolean value")
+    elif op == "between":
+        if not (isinstance(value, list) and len(value) == 2 and all(_is_scalar(v) for v in value)):
+            raise ValueError("between needs a [low, high] value")
+    elif op.startswith("contains"):
+        if not (isinstance(value, list) and value and all(_is_scalar(v) for v in value)):
+            raise ValueError(f"{op} needs a non-empty list of values")
+    elif op == "like":
+        if not isinstance(value, str):
+            raise ValueError("like needs a string pattern")
+    elif op in ORDERED_OPS:
+        if not _is_scalar(value) or isinstance(value, bool):
+            raise ValueError(f"{op} needs a number, string or timestamp value")
+    elif not (_is_scalar(value) or isinstance(value, list) and value and all(_is_scalar(v) for v in value)):
+        # equal / not_equal also compare array properties against a list
+        raise ValueError(f"{op} needs a value (string, number, boolean or a list of them)")
+
+
+class FilterSpec(BaseModel):
+    """One filter node: exactly one of and / or / not, or a field-op-value condition."""
+    model_config = ConfigDict(populate_by_name=True)
+
+    all_of: list["FilterSpec"] | None = Field(default=None, alias="and")
+    any_of: list["FilterSpec"] | None = Field(default=None, alias="or")
+    negate: "FilterSpec | None" = Field(default=None, alias="not")
+    field: str | None = None  # Property name, or _id / _creation_time / _update_time
+    op: FilterOp | None = None
+    value: Any = None
+
+    @model_validator(mode="after")
+    def check_shape(self) -> "FilterSpec":
+        kinds = [self.all_of is not None, self.any_of is not None, self.negate is not None, self.field is not None]
+        if sum(kinds) != 1:
+            raise ValueError("A filter needs exactly one of: and, or, not, field")
+        if self.field is None:
+            if self.all_of == [] or self.any_of == []:
+                raise ValueError("and/or need at least one condition")
+            return self
+        if self.op is None:
+            raise ValueError(f"Filter on {self.field!r} needs an op")
+        allowed = METADATA_FIELDS.get(self.field)
+        if allowed is not None and self.op not in allowed:
+            raise ValueError(f"Operator {self.op!r} is not supported on {self.field}")
+        _check_value(self.op, self.value)
+        if self.field in ("_creation_time", "_update_time"):
+            _timestamps(self.value)  # raises ValueError on malformed timestamps
+        return self
+
+
+def _timestamps(value: Any) -> Any:
+    """Parse ISO timestamps (or lists of them) for the creation/update time fields."""
+    if isinstance(value, list):
+        return [_timestamps(v) for v in value]
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _condition(spec: FilterSpec) -> Any:
+    if spec.field == "_id":
+        target = Filter.by_id()
+        value = spec.value
+    elif spec.field in ("_creation_time", "_update_time"):
+        target = Filter.by_creation_time() if spec.field == "_creation_time" else Filter.by_update_time()
+        value = _timestamps(spec.value)
+    else:
+        target = Filter.by_property(spec.field)
+        value = spec.value
+
+    if spec.op == "between":
+        low, high = value
+        return Filter.all_of([target.greater_or_equal(low), target.less_or_equal(high)])
+    return getattr(target, spec.op)(value)
+
+
+def _compile(spec: FilterSpec) -> Any:
+    if spec.all_of is not None:
+        return Filter.all_of([_compile(s) for s in spec.all_of])
+    if spec.any_of is not None:
+        return Filter.any_of([_compile(s) for s in spec.any_of])
+    if spec.negate is not None:
+        return Filter.not_(_compile(spec.negate))
+    return _condition(spec)
+
+
+def build_filter(spec: FilterSpec | None) -> Any:
+    """
+    Compile a filter spec to a Weaviate Filter (None when no filter is given).
+    Values the Weaviate client still rejects are answered 422, like a malformed spec.
+    """
+    if spec is None:
+        return None
+    try:
+        return _compile(spec)
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid filter: {e}")
@@ -0,0 +1,283 @@
+"""
+Search flow control for search-as-you-type traffic.
+Identical in-flight searches share one execution (singleflight), a newer search
+from the same session or a client disconnect cancels the older one, and each
+collection runs a bounded number of searches at once. Only searches of one session
+have a bounded queue; independent clients wait for a slot but are never refused.
+"""
+
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from fastapi import HTTPException, Request
+from fastapi.responses import Response
+
+from weaviate_spy.metrics import Counter, Gauge, Histogram, registry, timed
+
+T = TypeVar("T")
+
+# Sent by the browser with every search of one search box; a newer search supersedes older ones
+SESSION_HEADER = "x-search-session"
+
+search_queue_depth = registry.register(Gauge(
+    "weaviate_spy_search_queue_depth",
+    "Searches waiting for a per-collection slot",
+    ("collection",),
+))
+search_running = registry.register(Gauge(
+    "weaviate_spy_search_running",
+    "Searches holding a per-collection slot",
+    ("collection",),
+))
+search_queue_seconds = registry.register(Histogram(
+    "weaviate_spy_search_queue_wait_seconds",
+    "Time searches waited for a per-collection slot",
+    ("collection",),
+))
+search_coalesced = registry.register(Counter(
+    "weaviate_spy_search_coalesced_total",
+    "Searches answered by an identical search already in flight",
+    ("endpoint",),
+))
+search_cancelled = registry.register(Counter(
+    "weaviate_spy_search_cancelled_total",
+    "Searches abandoned because a newer one arrived (superseded) or the client went away (disconnected)",
+    ("endpoint", "reason"),
+))
+search_rejected = registry.register(Counter(
+    "weaviate_spy_search_rejected_total",
+    "Searches refused with 429 because their session already had the maximum number queued",
+    ("collection",),
+))
+
+
+class RequestCancelled(Exception):
+    """The search was superseded or its client disconnected."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class QueueFull(Exception):
+    """A session already has the maximum number of searches waiting for a collection."""
+
+
+class CancelToken:
+    """
+    Cancellation signal of one search. Set on the event loop; checked by the
+    request's worker thread through check_cancelled() between Weaviate calls.
+    """
+
+    def __init__(self):
+        self.reason: str | None = None
+        self._event = asyncio.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.reason is not None
+
+    def cancel(self, reason: str):
+        if self.reason is None:
+            self.reason = reason
+            self._event.set()
+
+    def check(self):
+        if self.reason is not None:
+            raise RequestCancelled(self.reason)
+
+    async def race(self, awaitable: Awaitable[T]) -> T:
+        """Await awaitable; if the token fires first, cancel it and raise RequestCancelled."""
+        task = asyncio.ensure_future(awaitable)
+        waiter = asyncio.ensure_future(self._event.wait())
+        try:
+            await asyncio.wait((task, waiter), return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            task.cancel()
+            raise
+        finally:
+            waiter.cancel()
+        if task.done():
+            return task.result()
+        task.cancel()
+        await asyncio.wait((task,))
+        raise RequestCancelled(self.reason)
+
+
+# Token of the search being handled; run_in_threadpool copies it into the worker thread
+current_token: ContextVar[CancelToken | None] = ContextVar("weaviate_spy_cancel_token", default=None)
+
+
+def check_cancelled():
+    """Raise RequestCancelled if the current search was cancelled; no-op outside a gated search."""
+    token = current_token.get()
+    if token is not None:
+        token.check()
+
+
+async def watch_disconnect(http_request: Request, token: CancelToken):
+    """Cancel the token once the client disconnects (the body has already been read)."""
+    while (await http_request.receive())["type"] != "http.disconnect":
+        pass
+    token.cancel("disconnected")
+
+
+class SearchGate:
+    """
+    Flow control in front of search handlers (event loop only).
+    limit searches run per collection; a session may have up to max_queue more waiting
+    per collection, searches without a session always queue. When abortable,
+    cancelling a search cancels its coroutine too (async Weaviate client); otherwise
+    the compute runs in a worker thread that stops at its next check_cancelled().
+    """
+
+    def __init__(self, limit: int, max_queue: int, abortable: bool = False):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.abortable = abortable
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._waiting: dict[str, int] = {}
+        self._session_waiting: dict[Hashable, int] = {}
+        self._running: dict[str, int] = {}
+        self._sessions: dict[Hashable, CancelToken] = {}
+        self._flights: dict[Hashable, asyncio.Future] = {}
+
+    async def _limited(
+        self,
+        collection: str,
+        session_key: Hashable | None,
+        token: CancelToken,
+        compute: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Run compute once a collection slot is free; a session's waiting searches count toward its queue."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Semaphores belong to one event loop (test clients and benchmarks start new ones)
+            self._loop = loop
+            self._semaphores.clear()
+        semaphore = self._semaphores.get(collection)
+        if semaphore is None:
+            semaphore = self._semaphores[collection] = asyncio.Semaphore(self.limit)
+        if session_key is not None:
+            if self._session_waiting.get(session_key, 0) >= self.max_queue and semaphore.locked():
+                raise QueueFull(collection)
+            self._session_waiting[session_key] = self._session_waiting.get(session_key, 0) + 1
+
+        self._waiting[collection] = self._waiting.get(collection, 0) + 1
+        search_queue_depth.inc(collection)
+        start = time.perf_counter()
+        try:
+            with timed("queue"):
+                await token.race(semaphore.acquire())
+        finally:
+            self._waiting[collection] -= 1
+            if session_key is not None:
+                self._session_waiting[session_key] -= 1
+                if not self._session_waiting[session_key]:
+                    del self._session_waiting[session_key]
+            search_queue_depth.dec(collection)
+            search_queue_seconds.observe(time.perf_counter() - start, collection)
+
+        self._running[collection] = self._running.get(collection, 0) + 1
+        search_running.inc(collection)
+        try:
+            token.check()
+            if self.abortable:
+                return await token.race(compute())
+            return await compute()
+        finally:
+            semaphore.release()
+            self._running[collection] -= 1
+            search_running.dec(collection)
+
+    async def _coalesced(
+        self,
+        collection: str,
+        endpoint: str,
+        key: Hashable,
+        session_key: Hashable | None,
+        token: CancelToken,
+        compute: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        """Join an identical search in flight, or lead one. Followers take over if the leader is cancelled."""
+        flight_key = (collection, key)
+        while (flight := self._flights.get(flight_key)) is not None:
+            try:
+                with timed("coalesce"):
+                    response = await token.race(asyncio.shield(flight))
+            except RequestCancelled:
+                if token.cancelled:
+                    raise
+                continue
+            search_coalesced.inc(endpoint)
+            return Response(response.body, media_type=response.media_type, headers={"X-Cache": "COALESCED"})
+
+        flight = self._flights[flight_key] = asyncio.get_running_loop().create_future()
+        try:
+            response = await self._limited(collection, session_key, token, compute)
+        except BaseException as e:
+            del self._flights[flight_key]
+            flight.set_exception(e if isinstance(e, Exception) else RequestCancelled("abandoned"))
+            flight.exception()  # mark retrieved when nobody is waiting
+            raise
+        del self._flights[flight_key]
+        flight.set_result(response)
+        return response
+
+    async def run(
+        self,
+        http_request: Request,
+        collection: str,
+        endpoint: str,
+        key: Hashable | None,
+        compute: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        """
+        Run a search through the gate. key identifies identical searches (None: never coalesce).
+        Cancelled searches get 499, searches refused by their session's full queue 429.
+        """
+        token = CancelToken()
+        session = http_request.headers.get(SESSION_HEADER)
+        session_key = (session, collection) if session else None
+        if session_key is not None:
+            previous = self._sessions.get(session_key)
+            self._sessions[session_key] = token
+            if previous is not None:
+                previous.cancel("superseded")
+
+        watcher = asyncio.create_task(watch_disconnect(http_request, token))
+        context = current_token.set(token)
+        try:
+            if key is None:
+                return await self._limited(collection, session_key, token, compute)
+            return await self._coalesced(collection, endpoint, key, session_key, token, compute)
+        except RequestCancelled as e:
+            search_cancelled.inc(endpoint, e.reason)
+            detail = "Superseded by a newer search" if e.reason == "superseded" else "Client disconnected"
+            raise HTTPException(status_code=499, detail=detail)
+        except QueueFull:
+            search_rejected.inc(collection)
+            raise HTTPException(
+                status_code=429,
+                detail=f"Too many searches queued for {collection} in this session",
+                headers={"Retry-After": "1"},
+            )
+        finally:
+            watcher.cancel()
+            current_token.reset(context)
+            if session_key is not None and self._sessions.get(session_key) is token:
+                del self._sessions[session_key]
+
+    def stats(self) -> dict[str, Any]:
+        """Slots in use and queued searches per collection, open sessions and coalescable flights."""
+        return {
+            "limit": self.limit,
+            "max_queue": self.max_queue,
+            "waiting": {name: n for name, n in self._waiting.items() if n},
+            "running": {name: n for name, n in self._running.items() if n},
+            "sessions": len(self._sessions),
+            "in_flight": len(self._flights),
+        }
@@ -0,0 +1,79 @@
+"""
+Rank fusion.
+Combines candidate lists from several search modes (bm25, near_text,
+near_object) into one ranking with NumPy: reciprocal rank fusion, relative
+score fusion (min-max normalised scores, as Weaviate's relativeScoreFusion)
+or weighted CombSUM over z-scored scores. Per-source scores form an
+(items, sources) matrix, so any set of weights is a single matrix product and
+every fused item keeps its per-source rank, raw score and contribution.
+"""
+
+from typing import Literal
+
+import numpy as np
+
+FusionMethod = Literal["rrf", "relative_score", "combsum"]
+
+
+def _normalize(raw: np.ndarray, present: np.ndarray, method: FusionMethod) -> np.ndarray:
+    """Normalise each source's (column's) scores over the items it returned; missing items get 0."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if method == "relative_score":
+            lo = np.where(present, raw, np.inf).min(axis=0)
+            hi = np.where(present, raw, -np.inf).max(axis=0)
+            span = hi - lo
+            # A source whose items all score the same gives each of them full credit
+            norm = np.where(span > 0, (raw - lo) / span, 1.0)
+        else:
+            counts = np.maximum(present.sum(axis=0), 1)
+            mean = np.where(present, raw, 0.0).sum(axis=0) / counts
+            std = np.sqrt(np.where(present, (raw - mean) ** 2, 0.0).sum(axis=0) / counts)
+            norm = np.where(std > 0, (raw - mean) / std, 0.0)
+    return np.where(present, norm, 0.0)
+
+
+def fusion_matrix(
+    ranked: list[list[str]],
+    scores: list[list[float]],
+    method: FusionMethod = "rrf",
+    rrf_k: int = 60,
+) -> tuple[list[str], np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Align per-source ranked uuid lists (best first) and their scores (higher is better).
+    Returns (uuids, 1-based ranks with 0 for missing, raw scores with NaN for missing,
+    unweighted per-source fusion scores), the arrays shaped (items, sources).
+    """
+    uuids = list(dict.fromkeys(uuid for items in ranked for uuid in items))
+    index = {uuid: i for i, uuid in enumerate(uuids)}
+    ranks = np.zeros((len(uuids), len(ranked)), dtype=np.int32)
+    raw = np.full((len(uuids), len(ranked)), np.nan, dtype=np.float64)
+    for j, (items, values) in enumerate(zip(ranked, scores)):
+        rows = np.fromiter((index[uuid] for uuid in items), dtype=np.intp, count=len(items))
+        # Written worst first, so a uuid listed twice keeps its best rank
+        ranks[rows[::-1], j] = np.arange(len(items), 0, -1)
+        raw[rows[::-1], j] = np.asarray(values, dtype=np.float64)[::-1]
+
+    present = ranks > 0
+    if method == "rrf":
+        base = np.where(present, 1.0 / (rrf_k + ranks), 0.0)
+    else:
+        base = _normalize(raw, present, method)
+    return uuids, ranks, raw, base
+
+
+def fuse(base: np.ndarray, weights: list[float]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Weight the per-source scores; returns (item order best first, fused scores, contributions)."""
+    contributions = base * np.asarray(weights, dtype=np.float64)
+    fused = contributions.sum(axis=1)
+    return np.argsort(-fused, kind="stable"), fused, contributions
+
+
+def sweep(base: np.ndarray, weights: list[list[float]], limit: int) -> np.ndarray:
+    """Top limit item indices for each weight vector, shaped (len(weights), limit or fewer)."""
+    fused = base @ np.asarray(weights, dtype=np.float64).T
+    return np.argsort(-fused, axis=0, kind="stable")[:limit].T
+
+
+def rerank_order(scores: list[float]) -> np.ndarray:
+    """Positions sorted by reranker score, best first; ties keep the fused order."""
+    return np.argsort(-np.asarray(scores, dtype=np.float64), kind="stable")
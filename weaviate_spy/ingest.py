@@ -0,0 +1,215 @@
+"""
+Streaming collection import.
+Incremental NDJSON, CSV and Parquet parsers over an iterator of uploaded byte
+chunks, and a batch loop that feeds Weaviate v4 dynamic, fixed-size or
+rate-limited batching while reporting progress. Rows use the export layout
+(uuid, properties, vector / vector_<name>), so exports import back as-is.
+"""
+
+import codecs
+import csv
+import json
+import os
+import tempfile
+import time
+from typing import Any, Callable, Iterable, Iterator, Literal
+
+# "dynamic" - v4 client sizes batches from Weaviate's queue; "fixed" - batch_size objects
+# with concurrent_requests in flight; "rate_limit" - at most requests_per_minute objects
+Batching = Literal["dynamic", "fixed", "rate_limit"]
+
+# (line or row number, parsed row, parse error)
+ParsedRow = tuple[int, dict | None, str | None]
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Decode UTF-8 chunks into lines (newline kept), handling lines and characters split across chunks."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def iter_ndjson_rows(chunks: Iterable[bytes]) -> Iterator[ParsedRow]:
+    """Parse newline-delimited JSON objects; blank lines are skipped."""
+    for number, line in enumerate(iter_lines(chunks), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "Expected a JSON object"
+            continue
+        yield number, row, None
+
+
+def _csv_value(value: str, data_type: str | None) -> Any:
+    """Convert a CSV cell back to the property's type; nested values were exported as JSON."""
+    if value == "":
+        return None
+    if data_type in ("int",):
+        return int(value)
+    if data_type in ("number",):
+        return float(value)
+    if data_type in ("boolean",):
+        return value.lower() in ("true", "1", "yes")
+    if data_type in ("text", "date", "uuid", "blob"):
+        return value
+    if value[0] in "[{":
+        return json.loads(value)
+    return value
+
+
+def iter_csv_rows(chunks: Iterable[bytes], data_types: dict[str, str]) -> Iterator[ParsedRow]:
+    """Parse CSV with a header row, converting cells by the collection's property types."""
+    reader = csv.DictReader(iter_lines(chunks))
+    for row in reader:
+        try:
+            yield reader.line_num, {
+                name: _csv_value(value, data_types.get(name))
+                for name, value in row.items()
+                if name is not None and value is not None
+            }, None
+        except ValueError as e:
+            yield reader.line_num, None, f"Invalid value: {e}"
+
+
+def iter_parquet_rows(chunks: Iterable[bytes], batch_rows: int = 1000) -> Iterator[ParsedRow]:
+    """
+    Parse Parquet row groups. The footer sits at the end of the file, so the upload
+    is spooled to a temporary file first and then read a batch at a time. Requires pyarrow.
+    """
+    import pyarrow.parquet as pq
+
+    fd, path = tempfile.mkstemp(prefix="weaviate-spy-import-", suffix=".parquet")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        number = 0
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows):
+            for row in batch.to_pylist():
+                number += 1
+                yield number, row, None
+    finally:
+        os.unlink(path)
+
+
+def row_to_object(row: dict) -> dict:
+    """Split an export-style row into add_object arguments: uuid, properties and vectors."""
+    properties = {}
+    vectors = {}
+    object_id = None
+    for key, value in row.items():
+        if key in ("uuid", "id"):
+            object_id = value
+        elif key == "vector" or key.startswith("vector_"):
+            if isinstance(value, str):
+                value = json.loads(value)
+            if value is not None:
+                vectors["default" if key == "vector" else key[len("vector_"):]] = value
+        elif value is not None:
+            properties[key] = value
+    obj: dict = {"properties": properties}
+    if object_id:
+        obj["uuid"] = object_id
+    if vectors:
+        obj["vector"] = vectors["default"] if list(vectors) == ["default"] else vectors
+    return obj
+
+
+def iter_objects(rows: Iterable[ParsedRow]) -> Iterator[ParsedRow]:
+    """Turn parsed rows into add_object arguments, passing parse errors through."""
+    for number, row, error in rows:
+        if error is not None:
+            yield number, None, error
+            continue
+        try:
+            yield number, row_to_object(row), None
+        except ValueError as e:
+            yield number, None, f"Invalid vector: {e}"
+
+
+def open_batch(
+    collection: Any,
+    batching: Batching,
+    batch_size: int,
+    concurrent_requests: int,
+    requests_per_minute: int | None,
+) -> Any:
+    """The collection's batch context manager for the chosen batching mode."""
+    if batching == "fixed":
+        return collection.batch.fixed_size(batch_size=batch_size, concurrent_requests=concurrent_requests)
+    if batching == "rate_limit":
+        if not requests_per_minute:
+            raise ValueError("rate_limit batching needs requests_per_minute")
+        return collection.batch.rate_limit(requests_per_minute=requests_per_minute)
+    return collection.batch.dynamic()
+
+
+def failed_object(error: Any) -> dict:
+    """The add_object arguments of a batch ErrorObject, so it can be retried as-is."""
+    obj = error.object_
+    failed = {"uuid": str(obj.uuid), "properties": obj.properties or {}}
+    if obj.vector is not None:
+        failed["vector"] = obj.vector
+    return failed
+
+
+def import_objects(
+    collection: Any,
+    objects: Iterable[ParsedRow],
+    batch: Any,
+    emit: Callable[[str, dict], None],
+    progress_every: float = 1.0,
+) -> tuple[dict, list]:
+    """
+    Add objects (add_object arguments) through the batch context manager, emitting
+    `progress` at most every progress_every seconds and `error` per unparsable row.
+    Time spent blocked in add_object is the batcher waiting on Weaviate (vectorizer queue
+    or rate limit) and is reported as backpressure.
+    Returns the final stats and the batch's failed objects.
+    """
+    start = time.perf_counter()
+    last_report = start
+    blocked = 0.0
+    stats = {"queued": 0, "parse_errors": 0, "errors": 0}
+
+    def snapshot(errors: int) -> dict:
+        elapsed = time.perf_counter() - start
+        return {
+            **stats,
+            "errors": errors,
+            "elapsed_s": round(elapsed, 3),
+            "objects_per_sec": round(stats["queued"] / elapsed, 1) if elapsed else 0.0,
+            "backpressure": round(blocked / elapsed, 3) if elapsed else 0.0,
+        }
+
+    with batch as b:
+        for number, obj, error in objects:
+            if error is not None:
+                stats["parse_errors"] += 1
+                emit("error", {"row": number, "detail": error})
+                continue
+            t = time.perf_counter()
+            b.add_object(**obj)
+            now = time.perf_counter()
+            blocked += now - t
+            stats["queued"] += 1
+            if now - last_report >= progress_every:
+                last_report = now
+                emit("progress", snapshot(b.number_errors))
+
+    failed = list(collection.batch.failed_objects)
+    return snapshot(len(failed)), failed
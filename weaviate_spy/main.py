@@ -4,80 +4,240 @@ Refactored to leverage Weaviate Client v4 features
 Uses JSON body for POST requests
 """
 
-import os
+import asyncio
+import contextvars
+import hashlib
+import json
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from typing import Any
+from typing import Any, Callable, Literal
+from uuid import UUID, uuid4
 
+import anyio
+import numpy as np
 import weaviate
-from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from loguru import logger
 from pydantic import BaseModel
+from weaviate.classes.query import Filter
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.cors import CORSMiddleware
-from starlette.staticfiles import StaticFiles
-
-load_dotenv()
-
-# Configuration
-WEAVIATE_HOST = os.getenv("WEAVIATE_HOST", "localhost")
-WEAVIATE_PORT = int(os.getenv("WEAVIATE_PORT", "8080"))
-WEAVIATE_SECURE = os.getenv("WEAVIATE_SECURE", "").lower() in ("true", "1", "yes")
-WEAVIATE_GRPC_HOST = os.getenv("WEAVIATE_GRPC_HOST", "localhost")
-WEAVIATE_GRPC_PORT = int(os.getenv("WEAVIATE_GRPC_PORT", "50051"))
-WEAVIATE_GRPC_SECURE = os.getenv("WEAVIATE_GRPC_SECURE", "").lower() in ("true", "1", "yes")
-WEAVIATE_API_KEY = os.getenv("WEAVIATE_API_KEY", None)
-WEAVIATE_BEARER_TOKEN = os.getenv("WEAVIATE_BEARER_TOKEN", None)
-
-# Global client reference
-client: weaviate.WeaviateClient | None = None
-
-
-def get_auth_credentials() -> weaviate.auth.AuthCredentials | None:
-    """Get authentication credentials from environment variables."""
-    if WEAVIATE_API_KEY:
-        return weaviate.auth.Auth.api_key(WEAVIATE_API_KEY)
-    elif WEAVIATE_BEARER_TOKEN:
-        return weaviate.auth.Auth.bearer_token(WEAVIATE_BEARER_TOKEN)
-    return None
 
+from weaviate_spy.analysis import JobRunning, JobStore, page_duplicates, page_outliers, run_duplicate_analysis
+from weaviate_spy.cache import RefreshingCache, ResponseCache, TTLCache
+from weaviate_spy.clients import (
+    DEFAULT_CLUSTER,
+    ClientRegistry,
+    ClusterConfig,
+    ClusterMiddleware,
+    ClusterUnavailable,
+    clusters_from_env,
+    current_cluster,
+)
+from weaviate_spy.config import (
+    ANALYSIS_CONCURRENCY,
+    ANALYSIS_DIR,
+    BATCH_CONCURRENCY,
+    BATCH_MAX_QUERIES,
+    COUNT_CACHE_REFRESH,
+    CURSOR_INDEX_SIZE,
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_SIZE,
+    FACET_CACHE_REFRESH,
+    FACET_CACHE_SIZE,
+    FUSION_MAX_CANDIDATES,
+    GENERATION_CACHE_SIZE,
+    GENERATION_CACHE_TTL,
+    GENERATION_CONCURRENCY,
+    HEALTH_PROBE_INTERVAL,
+    HEALTH_PROBE_STARTUP_WAIT,
+    IMPORT_BATCH_SIZE,
+    IMPORT_CONCURRENT_REQUESTS,
+    IMPORT_FAILED_TTL,
+    IMPORT_MAX_FAILED,
+    PROFILE_DIR,
+    PROFILE_MAX_PAGE,
+    PROFILE_REBUILD_RATIO,
+    PROFILE_REFRESH,
+    PROJECTION_CACHE_BYTES,
+    PROJECTION_CACHE_TTL,
+    PROJECTION_MAX_POINTS,
+    QUERY_CACHE_BYTES,
+    QUERY_CACHE_TTL,
+    QUERY_EMBEDDER,
+    QUERY_EMBEDDER_MODEL,
+    QUERY_EMBEDDER_URL,
+    RERANKER,
+    RERANKER_MODEL,
+    SCHEMA_CACHE_SIZE,
+    SCHEMA_CACHE_TTL,
+    SEARCH_CONCURRENCY,
+    SEARCH_QUEUE_SIZE,
+    WEAVIATE_API_KEY,
+    WEAVIATE_BEARER_TOKEN,
+    WEAVIATE_GRPC_HOST,
+    WEAVIATE_GRPC_PORT,
+    WEAVIATE_GRPC_SECURE,
+    WEAVIATE_HOST,
+    WEAVIATE_POOL_CONNECTIONS,
+    WEAVIATE_POOL_MAXSIZE,
+    WEAVIATE_PORT,
+    WEAVIATE_SECURE,
+    WEAVIATE_TIMEOUT,
+)
+from weaviate_spy.embeddings import QueryEmbedder, build_query_embedder
+from weaviate_spy.export import EXPORT_MEDIA_TYPES, iter_csv, iter_ndjson, iter_parquet, object_row
+from weaviate_spy.facets import data_type_name, facet_group_by, groups_payload, properties_payload, property_metrics
+from weaviate_spy.filters import build_filter
+from weaviate_spy.flow import RequestCancelled, SearchGate, check_cancelled
+from weaviate_spy.fusion import fuse, fusion_matrix, rerank_order, sweep
+from weaviate_spy.ingest import (
+    Batching,
+    failed_object,
+    import_objects,
+    iter_csv_rows,
+    iter_ndjson_rows,
+    iter_objects,
+    iter_parquet_rows,
+    open_batch,
+)
+from weaviate_spy.metrics import MetricsMiddleware, registry, timed
+from weaviate_spy.models import (
+    AggregateRequest,
+    BM25SearchRequest,
+    BatchQuery,
+    BatchSearchRequest,
+    CountStrategy,
+    DuplicateAnalysisRequest,
+    FusionRequest,
+    FusionSource,
+    GenerativeRequest,
+    HybridSearchRequest,
+    ProjectionRequest,
+    SearchRequest,
+)
+from weaviate_spy.pagination import CursorIndex, decode_cursor, encode_cursor
+from weaviate_spy.profiling import ProfileStore
+from weaviate_spy.projection import (
+    VectorError,
+    collect_vectors,
+    encode_points,
+    pca,
+    random_projection,
+)
+from weaviate_spy.ranking import overlap_stats
+from weaviate_spy.rerank import Reranker, build_reranker
+from weaviate_spy.serialization import ORJSONResponse, ResponseFormat, format_object, render_response, serialize_objects
+from weaviate_spy.static import PrecompressedStaticFiles
 
-def connect_to_weaviate() -> weaviate.WeaviateClient:
-    """Create and return a Weaviate client connection."""
-    return weaviate.connect_to_custom(
+# Weaviate clients by cluster name; "default" comes from the WEAVIATE_* settings in weaviate_spy.config
+clients = ClientRegistry(
+    clusters_from_env(ClusterConfig(
+        name=DEFAULT_CLUSTER,
         http_host=WEAVIATE_HOST,
         http_port=WEAVIATE_PORT,
         http_secure=WEAVIATE_SECURE,
         grpc_host=WEAVIATE_GRPC_HOST,
         grpc_port=WEAVIATE_GRPC_PORT,
         grpc_secure=WEAVIATE_GRPC_SECURE,
-        auth_credentials=get_auth_credentials(),
-    )
+        api_key=WEAVIATE_API_KEY,
+        bearer_token=WEAVIATE_BEARER_TOKEN,
+        pool_connections=WEAVIATE_POOL_CONNECTIONS,
+        pool_maxsize=WEAVIATE_POOL_MAXSIZE,
+        timeout=WEAVIATE_TIMEOUT,
+    )),
+    probe_interval=HEALTH_PROBE_INTERVAL,
+    startup_wait=HEALTH_PROBE_STARTUP_WAIT,
+)
+
+# Schema/config cache - keys are ("schema",) or ("config", collection_name)
+schema_cache = TTLCache(maxsize=SCHEMA_CACHE_SIZE, ttl=SCHEMA_CACHE_TTL)
+
+# Per-collection total object counts, refreshed in the background
+count_cache = RefreshingCache(refresh_after=COUNT_CACHE_REFRESH)
+
+# Unfiltered aggregate/facet results keyed on (collection, request), refreshed in the background
+facet_cache = RefreshingCache(refresh_after=FACET_CACHE_REFRESH, maxsize=FACET_CACHE_SIZE)
+
+# Page number -> after-UUID anchors for cursor pagination
+cursor_index = CursorIndex(max_entries=CURSOR_INDEX_SIZE)
+
+# Serialized search responses keyed on (collection, endpoint, request)
+query_cache = ResponseCache(max_bytes=QUERY_CACHE_BYTES, ttl=QUERY_CACHE_TTL)
+
+# Coalescing, per-session cancellation and per-collection limits for search endpoints
+search_gate = SearchGate(limit=SEARCH_CONCURRENCY, max_queue=SEARCH_QUEUE_SIZE)
+
+# Serialized vector projections, dropped when the collection version changes
+projection_cache = ResponseCache(max_bytes=PROJECTION_CACHE_BYTES, ttl=PROJECTION_CACHE_TTL)
+
+# Duplicate/outlier jobs, persisted under ANALYSIS_DIR
+analysis_jobs = JobStore(ANALYSIS_DIR, max_workers=ANALYSIS_CONCURRENCY)
+
+# Collection data-quality profiles, persisted under PROFILE_DIR and updated incrementally
+profile_store = ProfileStore(
+    PROFILE_DIR, refresh_after=PROFILE_REFRESH, rebuild_ratio=PROFILE_REBUILD_RATIO, max_page=PROFILE_MAX_PAGE,
+)
+
+# Query embedder with its vector cache; None unless QUERY_EMBEDDER is set
+query_embedder: QueryEmbedder | None = build_query_embedder(
+    QUERY_EMBEDDER,
+    QUERY_EMBEDDER_URL,
+    QUERY_EMBEDDER_MODEL,
+    EMBEDDING_CACHE_SIZE,
+    EMBEDDING_CACHE_DIR,
+)
+
+# Reranker for fusion searches, loaded on first use; None unless RERANKER is set
+reranker: Reranker | None = build_reranker(RERANKER, RERANKER_MODEL)
+
+# Shared cap on in-flight generations; waiters are served FIFO so streams interleave
+generation_slots = asyncio.Semaphore(GENERATION_CONCURRENCY)
+
+# Generated texts keyed on ("single", prompt, uuid, content hash) or
+# ("grouped", task, ((uuid, content hash), ...)), so unchanged objects skip the LLM
+generation_cache = TTLCache(maxsize=GENERATION_CACHE_SIZE, ttl=GENERATION_CACHE_TTL)
+
+# Shared worker pool for batch search fan-out, so concurrent batches cannot flood Weaviate
+batch_pool = ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY, thread_name_prefix="batch-search")
+
+# Failed objects of finished imports keyed on (collection, import_id), for POST .../import/{id}/retry
+import_failures = TTLCache(maxsize=100, ttl=IMPORT_FAILED_TTL)
+
+
+
+def warm_up():
+    """Prefetch each cluster's schema listing, so the UI's first request is a cache hit."""
+    for name in clients.clusters:
+        token = current_cluster.set(name)
+        try:
+            get_schema()
+        except Exception as e:
+            logger.info(f"Cluster {name}: schema warm-up skipped ({getattr(e, 'detail', e)})")
+        finally:
+            current_cluster.reset(token)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan - startup and shutdown."""
-    global client
-    
-    # Startup
-    try:
-        client = connect_to_weaviate()
-        logger.info("Connected to Weaviate successfully")
-        
-        # Verify connection
-        client.collections.list_all()
-        logger.info("Weaviate connection verified")
-    except Exception as e:
-        logger.error(f"Failed to connect to Weaviate: {e}")
-        client = None
+    # Startup: the prober's first pass connects the clusters; wait briefly for it so /health is accurate
+    clients.start()
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    logger.info(f"Weaviate clusters: {', '.join(clients.clusters)}")
     
     yield
     
     # Shutdown
-    if client:
-        client.close()
-        logger.info("Weaviate connection closed")
+    analysis_jobs.close()
+    profile_store.close()
+    clients.close()
+    logger.info("Weaviate connections closed")
 
 
 app = FastAPI(
@@ -92,110 +252,245 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Cache"],
 )
 
+# Per-endpoint latency histograms, in-flight gauges and error counters, plus Server-Timing
+app.add_middleware(MetricsMiddleware)
 
-# Pydantic models for request/response
-class SearchRequest(BaseModel):
-    """Base search request model."""
-    query: str | None = None
-    keyword: str | None = None  # For semantic search
-    limit: int = 20
-    offset: int = 0
-    certainty: float = 0.65
-    properties: list[str] | None = None
+# Selects the cluster for each request from X-Weaviate-Cluster or ?cluster=
+app.add_middleware(ClusterMiddleware)
 
 
-class HybridSearchRequest(BaseModel):
-    """Hybrid search request model."""
-    query: str
-    alpha: float = 0.5  # Balance between BM25 (0) and vector (1)
-    limit: int = 20
-    offset: int = 0
-    properties: list[str] | None = None
 
+# Helper functions
+def get_client() -> weaviate.WeaviateClient:
+    """Get the request's cluster client, connecting if needed, or raise an error if unavailable."""
+    try:
+        return clients.get()
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown cluster: {current_cluster.get()}")
+    except ClusterUnavailable:
+        raise HTTPException(status_code=503, detail="Weaviate connection not available")
 
-class BM25SearchRequest(BaseModel):
-    """BM25 (keyword) search request model."""
-    query: str
-    limit: int = 20
-    offset: int = 0
-    properties: list[str] | None = None
 
+def scoped(collection_name: str) -> str:
+    """Cache key for a collection on the request's cluster, so clusters never share entries."""
+    return f"{current_cluster.get()}/{collection_name}"
 
-class GenerativeRequest(BaseModel):
-    """Generative search request model."""
-    prompt: str
-    query: str | None = None
-    limit: int = 10
-    certainty: float = 0.65
-    properties: list[str] | None = None
 
+def get_collection_config(c: weaviate.WeaviateClient, collection_name: str) -> Any:
+    """Get a collection config, served from the schema cache when fresh."""
+    def load():
+        with timed("config"):
+            return c.collections.get(collection_name).config.get()
 
-class AggregateRequest(BaseModel):
-    """Aggregate request model."""
-    group_by: str | None = None
-    metric: str = "count"
+    return schema_cache.get_or_load(("config", scoped(collection_name)), load)
 
 
-# Helper functions
-def get_client() -> weaviate.WeaviateClient:
-    """Get the Weaviate client or raise an error if not connected."""
-    if client is None:
-        raise HTTPException(status_code=503, detail="Weaviate connection not available")
-    return client
+def get_property_names(
+    c: weaviate.WeaviateClient,
+    collection_name: str,
+    properties: list[str] | None,
+) -> list[str]:
+    """Return the requested property names, or all collection properties if None."""
+    if properties is not None:
+        return properties
+    config = get_collection_config(c, collection_name)
+    return [p.name for p in config.properties]
 
 
-def extract_properties(obj: Any, property_names: list[str]) -> dict:
-    """Extract properties from a Weaviate object."""
-    result = {}
-    for prop in property_names:
-        value = obj.properties.get(prop)
-        if isinstance(value, list):
-            result[prop] = ", ".join(str(v) for v in value)
-        else:
-            result[prop] = value
-    return result
+def invalidate_schema_cache(collection_name: str | None = None) -> int:
+    """Drop cached schema entries for one collection (plus the schema listing) or all of them."""
+    if collection_name is None:
+        return schema_cache.invalidate()
+    schema_key = ("schema", current_cluster.get())
+    return schema_cache.invalidate(
+        lambda key: key == schema_key or key == ("config", scoped(collection_name))
+    )
+
+
+def get_total_count(c: weaviate.WeaviateClient, collection_name: str, wait: bool = True) -> int | None:
+    """
+    Get the collection's total object count from the background-refreshed cache.
+    With wait=False a cold count returns None and is loaded in the background instead.
+    """
+    def load():
+        with timed("aggregate"):
+            return c.collections.get(collection_name).aggregate.over_all(total_count=True).total_count
+
+    if not wait:
+        return count_cache.get_nowait(scoped(collection_name), load)
+    return count_cache.get(scoped(collection_name), load)
+
+
+def count_results(
+    c: weaviate.WeaviateClient,
+    collection_name: str,
+    strategy: CountStrategy,
+    returned: int,
+    offset: int,
+    limit: int,
+    exact: Callable[[], int | None],
+    filtered: bool = False,
+) -> int | None:
+    """
+    Compute the response count for the requested strategy; exact() is only called when needed.
+    The cached total covers the whole collection, so filtered requests count exactly instead.
+    """
+    if strategy == "exact" or (strategy == "cached" and filtered):
+        check_cancelled()
+        with timed("aggregate"):
+            return exact()
+    if strategy == "estimated":
+        return offset + returned + (1 if returned >= limit else 0)
+    if strategy == "cached":
+        return get_total_count(c, collection_name)
+    return returned
+
+
+def embed_query(text: str) -> list[float] | None:
+    """Embed search text with the configured query embedder, or None to let Weaviate vectorize it."""
+    if query_embedder is None:
+        return None
+    return query_embedder.embed(text)
+
+
+def collection_version(c: weaviate.WeaviateClient, collection_name: str) -> tuple | None:
+    """
+    Cheap collection version for cache invalidation: the cached total count plus a
+    fingerprint of the cached config. Never waits on an aggregate: while the count is
+    cold it is loaded in the background and None is returned, so callers skip the cache.
+    """
+    total = get_total_count(c, collection_name, wait=False)
+    if total is None:
+        return None
+    config = get_collection_config(c, collection_name)
+    return total, hash(repr(config))
+
+
+
+def compute_response(compute: Callable[[], dict], format: ResponseFormat, cache_status: str) -> JSONResponse:
+    """Compute and serialize a search payload, stopping early if the search was cancelled meanwhile."""
+    check_cancelled()
+    payload = compute()
+    check_cancelled()
+    with timed("serialize"):
+        return render_response(payload, format, {"X-Cache": cache_status})
+
+
+async def respond_search(
+    c: weaviate.WeaviateClient,
+    http_request: Request,
+    collection_name: str,
+    endpoint: str,
+    request: BaseModel,
+    compute: Callable[[], dict],
+    format: ResponseFormat = "rows",
+) -> Response:
+    """
+    Serve a search response from the query cache, computing and storing it on a miss.
+    Misses run through search_gate: identical searches in flight share one computation
+    (X-Cache: COALESCED), a newer search from the same X-Search-Session or a disconnect
+    cancels this one (499), and a full per-collection queue answers 429.
+    Sends X-Cache: HIT/MISS, or BYPASS when the client asked for Cache-Control: no-cache.
+    """
+    if "no-cache" in http_request.headers.get("cache-control", ""):
+        return await search_gate.run(
+            http_request, scoped(collection_name), endpoint, None,
+            lambda: run_in_threadpool(compute_response, compute, format, "BYPASS"),
+        )
+
+    key = (endpoint, format, request.model_dump_json())
+
+    def lookup() -> tuple[tuple | None, bytes | None]:
+        version = collection_version(c, collection_name)
+        if version is None:
+            return None, None
+        return version, query_cache.get(scoped(collection_name), key, version)
+
+    version, body = await run_in_threadpool(lookup)
+    if body is not None:
+        return Response(body, media_type="application/json", headers={"X-Cache": "HIT"})
+
+    async def load() -> Response:
+        response = await run_in_threadpool(compute_response, compute, format, "MISS")
+        if version is not None:
+            query_cache.set(scoped(collection_name), key, version, response.body)
+        return response
+
+    return await search_gate.run(http_request, scoped(collection_name), endpoint, key, load)
+
+
+def fetch_cursor_page(
+    collection: Any, class_name: str, request: SearchRequest, version: int,
+) -> tuple[list, str | None, int]:
+    """
+    Fetch one page with the after= cursor. Returns (objects, next_cursor, offset of the page).
+    `version` (the cached total count) drops page anchors recorded before objects were added or removed.
+    """
+    limit = request.limit
+    cursor_index.sync(scoped(class_name), version)
+    if request.cursor:
+        try:
+            after, page = decode_cursor(class_name, request.cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        page = request.offset // limit + 1
+
+        def walk(walk_after: str | None, walk_limit: int) -> list[str]:
+            with timed("query"):
+                response = collection.query.fetch_objects(after=walk_after, limit=walk_limit, return_properties=[])
+            return [str(obj.uuid) for obj in response.objects]
+
+        after, exists = cursor_index.resolve(scoped(class_name), limit, page, walk)
+        if not exists:
+            return [], None, request.offset
+    # Tokens without a page number do not say where they are; fall back to the request's offset
+    offset = (page - 1) * limit if page is not None else request.offset
+
+    with timed("query"):
+        objects = collection.query.fetch_objects(
+            after=after, limit=limit, return_properties=request.properties,
+        ).objects
+    if len(objects) < limit:
+        return objects, None, offset
+
+    last = str(objects[-1].uuid)
+    next_page = page + 1 if page is not None else None
+    if next_page is not None:
+        cursor_index.record(scoped(class_name), limit, next_page, last)
+    return objects, encode_cursor(class_name, last, next_page), offset
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data), ensure_ascii=False)}\n\n"
 
 
-def format_object(obj: Any, property_names: list[str]) -> dict:
-    """Format a Weaviate object for API response."""
-    result = extract_properties(obj, property_names)
-    result["uuid"] = str(obj.uuid)
-    result["key"] = str(obj.uuid)
-    
-    # Add metadata if available
-    if obj.metadata:
-        if hasattr(obj.metadata, "certainty"):
-            result["certainty"] = obj.metadata.certainty
-        if hasattr(obj.metadata, "distance"):
-            result["distance"] = obj.metadata.distance
-        if hasattr(obj.metadata, "score"):
-            result["score"] = obj.metadata.score
-        if hasattr(obj.metadata, "explain_score"):
-            result["explain_score"] = obj.metadata.explain_score
-    
-    return result
 
 
 # Health check endpoint
 @app.get("/health")
 def health_check():
-    """Check the health of the API and Weaviate connection."""
+    """Check the health of the API and Weaviate connection, from the prober's cached status."""
     try:
-        c = get_client()
-        c.collections.list_all()
-        return {"status": "healthy", "weaviate": "connected"}
-    except HTTPException:
-        return JSONResponse(
-            status_code=503,
-            content={"status": "unhealthy", "weaviate": "disconnected"}
-        )
-    except Exception as e:
-        return JSONResponse(
-            status_code=503,
-            content={"status": "unhealthy", "error": str(e)}
-        )
+        status = clients.cluster().status()
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown cluster: {current_cluster.get()}")
+    if status["healthy"]:
+        return {"status": "healthy", "weaviate": "connected", "cluster": status}
+    return JSONResponse(
+        status_code=503,
+        content={"status": "unhealthy", "weaviate": "disconnected", "error": status["error"], "cluster": status}
+    )
+
+
+@app.get("/clusters")
+def list_clusters():
+    """List configured Weaviate clusters with their cached health status."""
+    return {"default": DEFAULT_CLUSTER, "clusters": clients.status()}
 
 
 # Schema endpoints
@@ -203,7 +498,73 @@ def health_check():
 def get_schema():
     """List all collections with their properties."""
     c = get_client()
-    return c.collections.list_all()
+    return schema_cache.get_or_load(("schema", current_cluster.get()), c.collections.list_all)
+
+
+@app.get("/schema/cache")
+def get_schema_cache_stats():
+    """Return schema cache hit/miss counters."""
+    return schema_cache.stats()
+
+
+@app.post("/schema/invalidate")
+def invalidate_schema(collection: str | None = None):
+    """Invalidate cached schema for one collection, or everything if no collection is given."""
+    dropped = invalidate_schema_cache(collection)
+    return {"invalidated": dropped, "collection": collection}
+
+
+@app.get("/query-cache")
+def get_query_cache_stats():
+    """Return query result cache size and hit/miss counters."""
+    return query_cache.stats()
+
+
+@app.post("/query-cache/invalidate")
+def invalidate_query_cache(collection: str | None = None):
+    """Drop cached search results for one collection, or all of them."""
+    dropped = query_cache.invalidate(scoped(collection) if collection else None)
+    return {"invalidated": dropped, "collection": collection}
+
+
+@app.get("/facet-cache")
+def get_facet_cache_stats():
+    """Return facet cache size and hit/miss/refresh counters."""
+    return facet_cache.stats()
+
+
+@app.post("/facet-cache/invalidate")
+def invalidate_facet_cache(collection: str | None = None):
+    """Drop cached aggregates for one collection, or all of them."""
+    predicate = (lambda key: key[0] == scoped(collection)) if collection else None
+    dropped = facet_cache.invalidate(predicate)
+    return {"invalidated": dropped, "collection": collection}
+
+
+@app.get("/projection-cache")
+def get_projection_cache_stats():
+    """Return projection cache size and hit/miss counters."""
+    return projection_cache.stats()
+
+
+@app.get("/search-gate")
+async def get_search_gate_stats():
+    """Running and queued searches per collection, open search sessions and coalescable flights."""
+    return search_gate.stats()
+
+
+@app.get("/metrics")
+def get_metrics():
+    """Prometheus metrics: per-endpoint phase latency histograms, in-flight gauges and error counters."""
+    return Response(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/embedding-cache")
+def get_embedding_cache_stats():
+    """Return query embedding cache counters, or enabled=false when the mode is off."""
+    if query_embedder is None:
+        return {"enabled": False}
+    return {"enabled": True, "model": query_embedder.embedder.model, **query_embedder.cache.stats()}
 
 
 @app.get("/collection/{collection_name}")
@@ -211,12 +572,14 @@ def get_collection_info(collection_name: str):
     """Get detailed information about a specific collection."""
     c = get_client()
     try:
-        collection = c.collections.get(collection_name)
-        config = collection.config.get()
+        config = get_collection_config(c, collection_name)
+        # Statistics from the last persisted profile, if any; never triggers a scan
+        profile = profile_store.get(scoped(collection_name))
+        stats = {prop["name"]: prop for prop in profile.summary()["properties"]} if profile else {}
         return {
             "name": collection_name,
             "properties": [
-                {"name": p.name, "data_type": p.data_type}
+                {"name": p.name, "data_type": p.data_type, **({"profile": stats[p.name]} if p.name in stats else {})}
                 for p in config.properties
             ],
             "vectorizer": str(config.vectorizer) if config.vectorizer else None,
@@ -225,224 +588,1296 @@ def get_collection_info(collection_name: str):
         raise HTTPException(status_code=404, detail=f"Collection not found: {e}")
 
 
+@app.get("/collection/{collection_name}/profile")
+def get_collection_profile(
+    collection_name: str,
+    refresh: Literal["auto", "never", "incremental", "full"] = "auto",
+):
+    """
+    Data-quality profile per property: fill rate, distinct count, text length and value
+    quantiles, most frequent values. Served from the persisted profile; "auto" refreshes
+    it in the background once older than PROFILE_REFRESH seconds (reading only objects
+    changed since), "full" rescans. 202 with progress while the first scan runs.
+    """
+    c = get_client()
+    try:
+        config = get_collection_config(c, collection_name)
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=f"Collection not found: {e}")
+    schema = [(p.name, data_type_name(p)) for p in config.properties]
+    key = scoped(collection_name)
+    profile = profile_store.get(key)
+    if refresh in ("incremental", "full") or (refresh == "auto" and profile_store.stale(key, schema)):
+        profile_store.refresh(key, c.collections.get(collection_name), schema, full=refresh == "full")
+    if profile is None:
+        if refresh == "never":
+            raise HTTPException(status_code=404, detail=f"No profile of {collection_name} yet")
+        return JSONResponse(
+            status_code=202,
+            content={"collection": collection_name, "status": "building", "refresh": profile_store.status(key)},
+        )
+    return {"collection": collection_name, **profile.summary(), "refresh": profile_store.status(key)}
+
+
 # Search endpoints
-@app.post("/class/{class_name}")
-def search_semantic(
+def run_semantic(
+    c: weaviate.WeaviateClient,
     class_name: str,
     request: SearchRequest,
-):
+    format: ResponseFormat = "rows",
+) -> dict:
     """
     Search a collection using semantic (near_text) search.
     If no keyword/query is provided, fetches objects with pagination.
     """
-    c = get_client()
     collection = c.collections.get(class_name)
     
     # Get property names if not provided
-    properties = request.properties
-    if properties is None:
-        config = collection.config.get()
-        properties = [p.name for p in config.properties]
+    properties = get_property_names(c, class_name, request.properties)
     
-    paginate = {"limit": request.limit, "offset": request.offset}
+    filters = build_filter(request.filters)
+    paginate = {
+        "limit": request.limit,
+        "offset": request.offset,
+        "return_properties": request.properties,
+        "filters": filters,
+    }
     
     # Use keyword or query for search
     search_term = request.keyword or request.query
     
-    if search_term:
-        # Semantic search
-        response = collection.query.near_text(
-            query=search_term,
+    vector = embed_query(search_term) if search_term else None
+    
+    if vector is not None:
+        # Semantic search with a locally embedded (cached) query vector
+        with timed("query"):
+            response = collection.query.near_vector(
+                near_vector=vector,
+                certainty=request.certainty,
+                return_metadata=["certainty", "distance"],
+                **paginate,
+            )
+        exact = lambda: collection.aggregate.near_vector(
+            near_vector=vector,
             certainty=request.certainty,
-            return_metadata=["certainty", "distance"],
-            **paginate,
-        )
-        count_response = collection.aggregate.near_text(
+            filters=filters,
+            total_count=True,
+        ).total_count
+    elif search_term:
+        # Semantic search
+        with timed("query"):
+            response = collection.query.near_text(
+                query=search_term,
+                certainty=request.certainty,
+                return_metadata=["certainty", "distance"],
+                **paginate,
+            )
+        exact = lambda: collection.aggregate.near_text(
             query=search_term,
             certainty=request.certainty,
+            filters=filters,
             total_count=True,
+        ).total_count
+    elif request.pagination == "cursor" and filters is None:
+        # Fetch all objects, paging with the after= cursor (Weaviate's cursor cannot be filtered)
+        objects, next_cursor, offset = fetch_cursor_page(
+            collection, class_name, request, get_total_count(c, class_name),
         )
+        with timed("serialize"):
+            data = serialize_objects(objects, properties, format, request.preview_chars)
+        return {
+            "data": data,
+            "count": count_results(
+                c, class_name, request.count, len(objects), offset, request.limit,
+                lambda: collection.aggregate.over_all(total_count=True).total_count,
+            ),
+            "search_type": "fetch",
+            "next_cursor": next_cursor,
+        }
     else:
         # Fetch all objects
-        response = collection.query.fetch_objects(**paginate)
-        count_response = collection.aggregate.over_all(total_count=True)
+        with timed("query"):
+            response = collection.query.fetch_objects(**paginate)
+        exact = lambda: collection.aggregate.over_all(filters=filters, total_count=True).total_count
     
-    data = [format_object(obj, properties) for obj in response.objects]
+    with timed("serialize"):
+        data = serialize_objects(response.objects, properties, format, request.preview_chars)
     
     return {
         "data": data,
-        "count": count_response.total_count,
+        "count": count_results(
+            c, class_name, request.count, len(response.objects), request.offset, request.limit, exact,
+            filtered=filters is not None,
+        ),
         "search_type": "semantic" if search_term else "fetch",
     }
 
 
-@app.post("/class/{class_name}/bm25")
-def search_bm25(
+@app.post("/class/{class_name}")
+async def search_semantic(
     class_name: str,
-    request: BM25SearchRequest,
+    request: SearchRequest,
+    http_request: Request,
+    format: ResponseFormat = "rows",
 ):
+    """Semantic search (or paginated fetch without a query), served through the query cache."""
+    c = await run_in_threadpool(get_client)
+    return await respond_search(
+        c, http_request, class_name, "semantic", request,
+        lambda: run_semantic(c, class_name, request, format),
+        format,
+    )
+
+
+def run_bm25(
+    c: weaviate.WeaviateClient,
+    class_name: str,
+    request: BM25SearchRequest,
+    format: ResponseFormat = "rows",
+) -> dict:
     """
     Search a collection using BM25 (keyword) search.
     Best for exact term matching.
     """
-    c = get_client()
     collection = c.collections.get(class_name)
     
     # Get property names if not provided
-    properties = request.properties
-    if properties is None:
-        config = collection.config.get()
-        properties = [p.name for p in config.properties]
-    
-    # Debug logging
-    logger.info(f"[BM25] Searching collection: {class_name}")
-    logger.info(f"[BM25] Query: {request.query}")
-    logger.info(f"[BM25] Properties: {properties}")
-    logger.info(f"[BM25] Limit: {request.limit}, Offset: {request.offset}")
-    
-    response = collection.query.bm25(
-        query=request.query,
-        limit=request.limit,
-        offset=request.offset,
-        return_metadata=["score", "explain_score"],
-    )
+    properties = get_property_names(c, class_name, request.properties)
     
-    logger.info(f"[BM25] Response objects count: {len(response.objects)}")
+    filters = build_filter(request.filters)
     
-    # Get total count using over_all aggregate (Weaviate v4 doesn't have aggregate.bm25)
-    # Note: This returns total count of all objects in collection, not filtered by BM25 query
-    # For accurate BM25 count, we would need to use a larger limit and count manually
-    count_response = collection.aggregate.over_all(
-        total_count=True,
-    )
+    with timed("query"):
+        response = collection.query.bm25(
+            query=request.query,
+            filters=filters,
+            limit=request.limit,
+            offset=request.offset,
+            return_properties=request.properties,
+            return_metadata=["score", "explain_score"],
+        )
     
-    logger.info(f"[BM25] Total count: {count_response.total_count}")
+    with timed("serialize"):
+        data = serialize_objects(response.objects, properties, format, request.preview_chars)
     
-    data = [format_object(obj, properties) for obj in response.objects]
+    # Weaviate v4 has no aggregate.bm25 - a keyword-only (alpha=0) hybrid aggregate counts BM25 matches
+    count = count_results(
+        c, class_name, request.count, len(response.objects), request.offset, request.limit,
+        lambda: collection.aggregate.hybrid(
+            query=request.query,
+            alpha=0,
+            filters=filters,
+            total_count=True,
+        ).total_count,
+        filtered=filters is not None,
+    )
     
     return {
         "data": data,
-        "count": len(data),
+        "count": count,
         "search_type": "bm25",
     }
 
 
-@app.post("/class/{class_name}/hybrid")
-def search_hybrid(
+@app.post("/class/{class_name}/bm25")
+async def search_bm25(
     class_name: str,
-    request: HybridSearchRequest,
+    request: BM25SearchRequest,
+    http_request: Request,
+    format: ResponseFormat = "rows",
 ):
+    """BM25 (keyword) search, served through the query cache."""
+    c = await run_in_threadpool(get_client)
+    return await respond_search(
+        c, http_request, class_name, "bm25", request,
+        lambda: run_bm25(c, class_name, request, format),
+        format,
+    )
+
+
+def run_hybrid(
+    c: weaviate.WeaviateClient,
+    class_name: str,
+    request: HybridSearchRequest,
+    format: ResponseFormat = "rows",
+) -> dict:
     """
     Search a collection using hybrid search (BM25 + vector).
     Alpha controls the balance: 0 = pure BM25, 1 = pure vector.
     """
-    c = get_client()
     collection = c.collections.get(class_name)
     
     # Get property names if not provided
-    properties = request.properties
-    if properties is None:
-        config = collection.config.get()
-        properties = [p.name for p in config.properties]
-    
-    response = collection.query.hybrid(
-        query=request.query,
-        alpha=request.alpha,
-        limit=request.limit,
-        offset=request.offset,
-        return_metadata=["score", "explain_score"],
-    )
+    properties = get_property_names(c, class_name, request.properties)
     
-    # Get total count using over_all aggregate (Weaviate v4 doesn't have aggregate.hybrid)
-    # Note: This returns total count of all objects in collection, not filtered by hybrid query
-    count_response = collection.aggregate.over_all(
-        total_count=True,
-    )
+    # Vector part comes from the query embedder when enabled, otherwise Weaviate vectorizes the query
+    vector = embed_query(request.query)
+    filters = build_filter(request.filters)
+    
+    with timed("query"):
+        response = collection.query.hybrid(
+            query=request.query,
+            alpha=request.alpha,
+            vector=vector,
+            filters=filters,
+            limit=request.limit,
+            offset=request.offset,
+            return_properties=request.properties,
+            return_metadata=["score", "explain_score"],
+        )
     
-    data = [format_object(obj, properties) for obj in response.objects]
+    with timed("serialize"):
+        data = serialize_objects(response.objects, properties, format, request.preview_chars)
+    
+    count = count_results(
+        c, class_name, request.count, len(response.objects), request.offset, request.limit,
+        lambda: collection.aggregate.hybrid(
+            query=request.query,
+            alpha=request.alpha,
+            vector=vector,
+            filters=filters,
+            total_count=True,
+        ).total_count,
+        filtered=filters is not None,
+    )
     
     return {
         "data": data,
-        "count": len(data),
+        "count": count,
         "search_type": "hybrid",
         "alpha": request.alpha,
     }
 
 
-@app.post("/class/{class_name}/generate")
-def generative_search(
+@app.post("/class/{class_name}/hybrid")
+async def search_hybrid(
     class_name: str,
-    request: GenerativeRequest,
+    request: HybridSearchRequest,
+    http_request: Request,
+    format: ResponseFormat = "rows",
+):
+    """Hybrid search, served through the query cache."""
+    c = await run_in_threadpool(get_client)
+    return await respond_search(
+        c, http_request, class_name, "hybrid", request,
+        lambda: run_hybrid(c, class_name, request, format),
+        format,
+    )
+
+
+def expand_batch(request: BatchSearchRequest) -> list[BatchQuery]:
+    """Expand alpha sweeps into one hybrid query per alpha."""
+    expanded = []
+    for spec in request.queries:
+        if spec.mode == "hybrid" and spec.alphas:
+            for alpha in spec.alphas:
+                expanded.append(spec.model_copy(update={
+                    "alpha": alpha,
+                    "alphas": None,
+                    "label": f"{spec.label or 'hybrid'} alpha={alpha}",
+                }))
+        else:
+            expanded.append(spec)
+    return expanded
+
+
+def run_batch_query(
+    c: weaviate.WeaviateClient,
+    class_name: str,
+    spec: BatchQuery,
+    request: BatchSearchRequest,
+    properties: list[str],
+) -> dict:
+    """Run one batch entry through the matching search function, timing it."""
+    shared = {
+        "limit": request.limit,
+        "properties": properties,
+        "preview_chars": request.preview_chars,
+        "count": request.count,
+        "filters": spec.filters or request.filters,
+    }
+    start = time.perf_counter()
+    try:
+        if spec.mode == "bm25":
+            result = run_bm25(c, class_name, BM25SearchRequest(query=spec.query or "", **shared))
+        elif spec.mode == "hybrid":
+            result = run_hybrid(c, class_name, HybridSearchRequest(query=spec.query or "", alpha=spec.alpha, **shared))
+        else:
+            result = run_semantic(c, class_name, SearchRequest(query=spec.query, certainty=spec.certainty, **shared))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.warning(f"[batch] {spec.mode} query {spec.query!r} on {class_name} failed: {e}")
+        result = {"data": [], "count": 0, "error": str(e)}
+    result.update({
+        "label": spec.label or spec.mode,
+        "mode": spec.mode,
+        "query": spec.query,
+        "took_ms": round((time.perf_counter() - start) * 1000, 2),
+    })
+    if spec.mode == "hybrid":
+        result["alpha"] = spec.alpha
+    if spec.mode == "semantic":
+        result["certainty"] = spec.certainty
+    return result
+
+
+@app.post("/class/{class_name}/batch")
+def search_batch(
+    class_name: str,
+    request: BatchSearchRequest,
 ):
     """
-    Generative search (RAG) - uses an LLM to generate responses based on retrieved objects.
+    Run several searches (modes, queries, alpha sweeps) concurrently in one request.
+    The property list is resolved once and shared; results come back in request order with
+    per-query timings and pairwise overlap / Kendall tau between the result sets.
     """
+    queries = expand_batch(request)
+    if not queries:
+        raise HTTPException(status_code=422, detail="Provide at least one query")
+    if len(queries) > BATCH_MAX_QUERIES:
+        raise HTTPException(status_code=422, detail=f"At most {BATCH_MAX_QUERIES} queries per batch")
     c = get_client()
-    collection = c.collections.get(class_name)
     
-    # Get property names if not provided
-    properties = request.properties
-    if properties is None:
-        config = collection.config.get()
-        properties = [p.name for p in config.properties]
+    start = time.perf_counter()
+    properties = get_property_names(c, class_name, request.properties)
     
+    # Each worker runs in a copy of this request's context (cluster, metrics timings)
+    futures = [
+        batch_pool.submit(
+            contextvars.copy_context().run, run_batch_query, c, class_name, spec, request, properties,
+        )
+        for spec in queries
+    ]
+    results = [future.result() for future in futures]
+    
+    ranked = [[row["uuid"] for row in result["data"]] for result in results]
+    comparisons = [
+        {"a": i, "b": j, **overlap_stats(ranked[i], ranked[j])}
+        for i in range(len(ranked))
+        for j in range(i + 1, len(ranked))
+    ]
+    
+    return {
+        "results": results,
+        "comparisons": comparisons,
+        "took_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+
+
+def candidate_score(obj: Any, source: FusionSource) -> float:
+    """Source score of a candidate, higher is better: BM25 score, else certainty (1 - distance)."""
+    metadata = obj.metadata
+    if source == "bm25":
+        return metadata.score or 0.0
+    if metadata.certainty is not None:
+        return metadata.certainty
+    return 1.0 - (metadata.distance or 0.0)
+
+
+def fetch_candidates(
+    c: weaviate.WeaviateClient,
+    class_name: str,
+    source: FusionSource,
+    request: FusionRequest,
+    properties: list[str],
+    filters: Any,
+) -> dict:
+    """Fetch one source's candidates with their scores and timing; failures are reported, not raised."""
+    collection = c.collections.get(class_name)
+    common = {"limit": request.candidates, "filters": filters, "return_properties": properties}
+    start = time.perf_counter()
+    try:
+        with timed("query"):
+            if source == "bm25":
+                response = collection.query.bm25(query=request.query, return_metadata=["score"], **common)
+            elif source == "near_object":
+                response = collection.query.near_object(
+                    near_object=request.near_object,
+                    certainty=request.certainty,
+                    return_metadata=["certainty", "distance"],
+                    **common,
+                )
+            elif (vector := embed_query(request.query)) is not None:
+                response = collection.query.near_vector(
+                    near_vector=vector,
+                    certainty=request.certainty,
+                    return_metadata=["certainty", "distance"],
+                    **common,
+                )
+            else:
+                response = collection.query.near_text(
+                    query=request.query,
+                    certainty=request.certainty,
+                    return_metadata=["certainty", "distance"],
+                    **common,
+                )
+        objects = response.objects
+        error = None
+    except Exception as e:
+        logger.warning(f"[fusion] {source} candidates for {request.query!r} on {class_name} failed: {e}")
+        objects, error = [], str(e)
+    result = {
+        "source": source,
+        "objects": objects,
+        "scores": [candidate_score(obj, source) for obj in objects],
+        "took_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+    if error is not None:
+        result["error"] = error
+    return result
+
+
+def rerank_text(obj: Any, properties: list[str] | None) -> str:
+    """Text of an object for the reranker: the named properties, or every text value."""
+    values = obj.properties or {}
+    names = properties if properties is not None else list(values)
+    return "\n".join(str(values[name]) for name in names if isinstance(values.get(name), str))
+
+
+@app.post("/class/{class_name}/fusion")
+def search_fusion(
+    class_name: str,
+    request: FusionRequest,
+):
+    """
+    Fetch candidates from bm25, near_text and optionally near_object in parallel, fuse them
+    locally (rrf, relative_score or combsum) and optionally rerank the top with the configured
+    cross-encoder. Each row carries its per-source rank, raw score and contribution; `alphas`
+    adds the ranking for each bm25/semantic weighting without fetching again.
+    """
+    sources = request.sources or ["bm25", "semantic", *(["near_object"] if request.near_object else [])]
+    if "near_object" in sources and not request.near_object:
+        raise HTTPException(status_code=422, detail="The near_object source needs near_object")
+    if not 0 < request.candidates <= FUSION_MAX_CANDIDATES:
+        raise HTTPException(status_code=422, detail=f"candidates must be between 1 and {FUSION_MAX_CANDIDATES}")
+    if request.rerank and reranker is None:
+        raise HTTPException(status_code=400, detail="No reranker configured (set RERANKER)")
+    c = get_client()
+
+    start = time.perf_counter()
+    properties = get_property_names(c, class_name, request.properties)
+    fetch_properties = list(dict.fromkeys(properties + (request.rerank_properties or [])))
+    filters = build_filter(request.filters)
+
+    # Each worker runs in a copy of this request's context (cluster, metrics timings)
+    futures = [
+        batch_pool.submit(
+            contextvars.copy_context().run,
+            fetch_candidates, c, class_name, source, request, fetch_properties, filters,
+        )
+        for source in sources
+    ]
+    fetched = [future.result() for future in futures]
+    stages = {"candidates": round((time.perf_counter() - start) * 1000, 2)}
+
+    objects: dict[str, Any] = {}
+    for result in fetched:
+        for obj in result["objects"]:
+            objects.setdefault(str(obj.uuid), obj)
+
+    t = time.perf_counter()
+    with timed("fusion"):
+        uuids, ranks, raw, base = fusion_matrix(
+            [[str(obj.uuid) for obj in result["objects"]] for result in fetched],
+            [result["scores"] for result in fetched],
+            request.method,
+            request.rrf_k,
+        )
+        weights = [(request.weights or {}).get(source, 1.0) for source in sources]
+        order, fused, contributions = fuse(base, weights)
+        sweeps = None
+        if request.alphas:
+            sweep_weights = [
+                [1 - alpha if s == "bm25" else alpha if s == "semantic" else w for s, w in zip(sources, weights)]
+                for alpha in request.alphas
+            ]
+            sweeps = [
+                {"alpha": alpha, "uuids": [uuids[i] for i in top]}
+                for alpha, top in zip(request.alphas, sweep(base, sweep_weights, request.limit))
+            ]
+    stages["fusion"] = round((time.perf_counter() - t) * 1000, 2)
+
+    rerank_scores: dict[str, float] = {}
+    if request.rerank and uuids:
+        top = order[:request.rerank_top]
+        t = time.perf_counter()
+        with timed("rerank"):
+            scores = reranker.score(
+                request.query, [rerank_text(objects[uuids[i]], request.rerank_properties) for i in top],
+            )
+        rerank_scores = {uuids[i]: score for i, score in zip(top, scores)}
+        order = np.concatenate([top[rerank_order(scores)], order[len(top):]])
+        stages["rerank"] = round((time.perf_counter() - t) * 1000, 2)
+
+    t = time.perf_counter()
+    with timed("serialize"):
+        data = []
+        for i in order[:request.limit]:
+            uuid = uuids[i]
+            row = format_object(objects[uuid], properties, request.preview_chars)
+            # Metadata of whichever source returned the object first would be misleading here
+            for key in ("certainty", "distance", "explain_score"):
+                row.pop(key, None)
+            row["score"] = float(fused[i])
+            row["fusion"] = {
+                source: {
+                    "rank": int(ranks[i, j]) or None,
+                    "score": None if np.isnan(raw[i, j]) else float(raw[i, j]),
+                    "contribution": float(contributions[i, j]),
+                }
+                for j, source in enumerate(sources)
+            }
+            if uuid in rerank_scores:
+                row["rerank_score"] = rerank_scores[uuid]
+            data.append(row)
+    stages["serialize"] = round((time.perf_counter() - t) * 1000, 2)
+    stages["total"] = round((time.perf_counter() - start) * 1000, 2)
+
+    response = {
+        "data": data,
+        "count": len(uuids),
+        "search_type": "fusion",
+        "method": request.method,
+        "sources": [
+            {"source": r["source"], "weight": w, "count": len(r["objects"]), "took_ms": r["took_ms"],
+             **({"error": r["error"]} if "error" in r else {})}
+            for r, w in zip(fetched, weights)
+        ],
+        "stages": stages,
+    }
+    if sweeps is not None:
+        response["sweeps"] = sweeps
+    if request.rerank:
+        response["reranker"] = reranker.model
+    return response
+
+
+def content_hash(obj: Any) -> str:
+    """Stable hash of an object's properties, used to key cached generations."""
+    raw = json.dumps(obj.properties, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def retrieve_for_generation(c: weaviate.WeaviateClient, class_name: str, request: GenerativeRequest) -> Any:
+    """Run the plain retrieval query behind a generative search."""
+    collection = c.collections.get(class_name)
+    filters = build_filter(request.filters)
+
+    if request.query and request.search_mode == "bm25":
+        return collection.query.bm25(
+            query=request.query,
+            filters=filters,
+            limit=request.limit,
+            return_metadata=["score", "explain_score"],
+        )
+    if request.query and request.search_mode == "hybrid":
+        return collection.query.hybrid(
+            query=request.query,
+            alpha=request.alpha,
+            vector=embed_query(request.query),
+            filters=filters,
+            limit=request.limit,
+            return_metadata=["score", "explain_score"],
+        )
     if request.query:
-        # Generative search with semantic query
-        response = collection.generate.near_text(
+        vector = embed_query(request.query)
+        if vector is not None:
+            return collection.query.near_vector(
+                near_vector=vector,
+                certainty=request.certainty,
+                filters=filters,
+                limit=request.limit,
+                return_metadata=["certainty", "distance"],
+            )
+        return collection.query.near_text(
             query=request.query,
-            prompt=request.prompt,
             certainty=request.certainty,
+            filters=filters,
             limit=request.limit,
             return_metadata=["certainty", "distance"],
         )
-    else:
-        # Generative search on all objects
+    return collection.query.fetch_objects(filters=filters, limit=request.limit)
+
+
+def generate_single(collection: Any, prompt: str, objects: list) -> tuple[dict[str, str | None], int]:
+    """
+    Per-object generations for the given objects, served from the generation cache
+    where possible. All misses go to Weaviate in one batched call.
+    Returns ({uuid: text}, number of cache hits).
+    """
+    results: dict[str, str | None] = {}
+    keys: dict[str, tuple] = {}
+    for obj in objects:
+        uuid = str(obj.uuid)
+        keys[uuid] = ("single", prompt, uuid, content_hash(obj))
+        cached = generation_cache.get(keys[uuid])
+        if cached is not None:
+            results[uuid] = cached
+    hits = len(results)
+
+    missing = [uuid for uuid in keys if uuid not in results]
+    if missing:
+        with timed("generate"):
+            response = collection.generate.fetch_objects(
+                filters=Filter.by_id().contains_any(missing),
+                single_prompt=prompt,
+                limit=len(missing),
+            )
+        for obj in response.objects:
+            uuid = str(obj.uuid)
+            text = obj.generative.text if obj.generative else None
+            results[uuid] = text
+            if text is not None and uuid in keys:
+                generation_cache.set(keys[uuid], text)
+    return results, hits
+
+
+def generate_grouped(collection: Any, task: str, objects: list, properties: list[str]) -> tuple[str | None, bool]:
+    """One grouped-task generation over all objects, cached on the task and object contents."""
+    key = ("grouped", task, tuple((str(obj.uuid), content_hash(obj)) for obj in objects))
+    cached = generation_cache.get(key)
+    if cached is not None:
+        return cached, True
+    with timed("generate"):
         response = collection.generate.fetch_objects(
-            prompt=request.prompt,
-            limit=request.limit,
+            filters=Filter.by_id().contains_any([str(obj.uuid) for obj in objects]),
+            grouped_task=task,
+            grouped_properties=properties,
+            limit=len(objects),
         )
+    text = response.generative.text if response.generative else None
+    if text is not None:
+        generation_cache.set(key, text)
+    return text, False
+
+
+@app.post("/class/{class_name}/generate")
+def generative_search(
+    class_name: str,
+    request: GenerativeRequest,
+):
+    """
+    Generative search (RAG) - uses an LLM to generate responses based on retrieved objects.
+    Objects are retrieved first (semantic, bm25 or hybrid, with optional filters); then a
+    per-object prompt and/or a single grouped task runs over them. Generations for
+    unchanged objects are served from the generation cache.
+    """
+    if not request.prompt and not request.grouped_task:
+        raise HTTPException(status_code=422, detail="Provide prompt and/or grouped_task")
+    c = get_client()
+    collection = c.collections.get(class_name)
+    
+    # Get property names if not provided
+    properties = get_property_names(c, class_name, request.properties)
+    
+    with timed("query"):
+        response = retrieve_for_generation(c, class_name, request)
+    objects = response.objects
+    
+    single: dict[str, str | None] = {}
+    cache_hits = 0
+    if request.prompt and objects:
+        single, cache_hits = generate_single(collection, request.prompt, objects)
+    
+    grouped = None
+    grouped_cached = False
+    if request.grouped_task and objects:
+        grouped, grouped_cached = generate_grouped(collection, request.grouped_task, objects, properties)
     
     data = []
-    for obj in response.objects:
-        formatted = format_object(obj, properties)
-        if obj.generated:
-            formatted["generated"] = obj.generated
-        data.append(formatted)
+    with timed("serialize"):
+        for obj in objects:
+            formatted = format_object(obj, properties)
+            generated = single.get(str(obj.uuid))
+            if generated:
+                formatted["generated"] = generated
+            data.append(formatted)
     
     return {
         "data": data,
         "count": len(data),
         "search_type": "generative",
+        "grouped": grouped,
+        "cache": {"single_hits": cache_hits, "grouped_hit": grouped_cached},
     }
 
 
+async def run_in_generation_slot(http_request: Request, func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run func in the threadpool once a generation slot is free. Raises RequestCancelled instead
+    of starting the LLM call if the client disconnected while waiting. The slot is held until
+    the worker thread returns, even when the caller is cancelled first, so abandoned streams
+    cannot push more than GENERATION_CONCURRENCY calls at the LLM.
+    """
+    await generation_slots.acquire()
+    try:
+        if await http_request.is_disconnected():
+            raise RequestCancelled("disconnected")
+        call = asyncio.ensure_future(run_in_threadpool(func, *args))
+    except BaseException:
+        generation_slots.release()
+        raise
+
+    def finished(future: asyncio.Future):
+        generation_slots.release()
+        if not future.cancelled():
+            future.exception()  # mark retrieved when the caller was cancelled meanwhile
+
+    call.add_done_callback(finished)
+    return await asyncio.shield(call)
+
+
+async def stream_generation(
+    c: weaviate.WeaviateClient,
+    class_name: str,
+    request: GenerativeRequest,
+    http_request: Request,
+):
+    """
+    Yield SSE events: retrieved objects first, then one `generation` event per
+    object as each LLM call finishes, then the `grouped` result and `done`.
+    Stops issuing LLM calls once the client disconnects.
+    """
+    collection = c.collections.get(class_name)
+    properties = await run_in_threadpool(get_property_names, c, class_name, request.properties)
+
+    response = await run_in_threadpool(retrieve_for_generation, c, class_name, request)
+    objects = response.objects
+    data = [format_object(obj, properties) for obj in objects]
+    yield sse_event("objects", {"data": data, "count": len(data)})
+
+    async def generate_one(obj: Any) -> tuple[str, str | None]:
+        results, _ = await run_in_generation_slot(http_request, generate_single, collection, request.prompt, [obj])
+        return str(obj.uuid), results.get(str(obj.uuid))
+
+    tasks: list[asyncio.Task] = []
+    try:
+        if request.prompt and objects:
+            tasks = [asyncio.create_task(generate_one(obj)) for obj in objects]
+            for next_done in asyncio.as_completed(tasks):
+                if await http_request.is_disconnected():
+                    logger.info(f"[generate/stream] Client disconnected, cancelling {class_name} generations")
+                    return
+                try:
+                    uuid, text = await next_done
+                except RequestCancelled:
+                    logger.info(f"[generate/stream] Client disconnected, cancelling {class_name} generations")
+                    return
+                except Exception as e:
+                    yield sse_event("error", {"detail": str(e)})
+                    continue
+                yield sse_event("generation", {"uuid": uuid, "generated": text})
+
+        if request.grouped_task and objects:
+            try:
+                text, _ = await run_in_generation_slot(
+                    http_request, generate_grouped, collection, request.grouped_task, objects, properties,
+                )
+            except RequestCancelled:
+                return
+            yield sse_event("grouped", {"generated": text})
+
+        yield sse_event("done", {"count": len(data)})
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@app.post("/class/{class_name}/generate/stream")
+async def generative_search_stream(
+    class_name: str,
+    request: GenerativeRequest,
+    http_request: Request,
+):
+    """
+    Streaming generative search (RAG) over Server-Sent Events.
+    Objects arrive immediately; per-object and grouped generations follow as they finish.
+    """
+    if not request.prompt and not request.grouped_task:
+        raise HTTPException(status_code=422, detail="Provide prompt and/or grouped_task")
+    c = get_client()
+    return StreamingResponse(
+        stream_generation(c, class_name, request, http_request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def run_aggregate(
+    c: weaviate.WeaviateClient,
+    class_name: str,
+    request: AggregateRequest,
+) -> dict:
+    """
+    Aggregate the (filtered) collection: total count and property metrics in one call,
+    then one grouped aggregate per group_by property (with the same metrics if group_metrics).
+    """
+    collection = c.collections.get(class_name)
+    filters = build_filter(request.filters)
+    
+    metrics = None
+    if request.metrics:
+        names = None if request.metrics == ["*"] else request.metrics
+        metrics = property_metrics(get_collection_config(c, class_name).properties, names, request.top_occurrences)
+    
+    with timed("aggregate"):
+        response = collection.aggregate.over_all(filters=filters, total_count=True, return_metrics=metrics or None)
+    result = {"total_count": response.total_count}
+    if metrics:
+        result["properties"] = properties_payload(response.properties)
+    
+    if request.group_by:
+        result["groups"] = {}
+        for prop in request.group_by:
+            with timed("aggregate"):
+                grouped = collection.aggregate.over_all(
+                    filters=filters,
+                    group_by=facet_group_by(prop, request.group_limit),
+                    total_count=True,
+                    return_metrics=metrics if request.group_metrics and metrics else None,
+                )
+            result["groups"][prop] = groups_payload(grouped)
+    return result
+
+
 @app.post("/class/{class_name}/aggregate")
 def aggregate_collection(
     class_name: str,
     request: AggregateRequest,
 ):
     """
-    Aggregate a collection, optionally grouping by a property.
+    Aggregate a collection: total count, per-property stats (`metrics`) and value counts
+    per `group_by` property. Unfiltered results come from the background-refreshed facet cache.
     """
     c = get_client()
+    if request.filters is not None:
+        return run_aggregate(c, class_name, request)
+    key = (scoped(class_name), request.model_dump_json())
+    return facet_cache.get(key, lambda: run_aggregate(c, class_name, request))
+
+
+@app.get("/class/{class_name}/facets")
+def get_facets(
+    class_name: str,
+    group_by: str | None = None,
+    top: int = 10,
+):
+    """
+    Facet panel data in one cached call: stats for every aggregatable property,
+    plus value counts for the comma-separated group_by properties.
+    """
+    request = AggregateRequest(
+        metrics=["*"],
+        top_occurrences=top,
+        group_by=[name.strip() for name in group_by.split(",") if name.strip()] if group_by else None,
+    )
+    return aggregate_collection(class_name, request)
+
+
+def compute_projection(c: weaviate.WeaviateClient, class_name: str, request: ProjectionRequest) -> dict:
+    """Read vectors through the collection iterator and reduce them to 2D/3D."""
     collection = c.collections.get(class_name)
+    objects = collection.iterator(include_vector=True, return_properties=[request.label] if request.label else [])
+    try:
+        with timed("query"):
+            uuids, matrix, labels, truncated = collect_vectors(
+                objects, request.limit, request.vector_name, request.label,
+            )
+    except VectorError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     
-    if request.group_by:
-        response = collection.aggregate.group_by_by(
-            property=request.group_by,
-            total_count=True,
-        )
-        return {
-            "total_count": response.total_count,
-            "grouped_by": request.group_by,
-            "groups": response.groups if hasattr(response, "groups") else None,
-        }
+    explained = None
+    with timed("project"):
+        if request.method == "pca":
+            points, explained = pca(matrix, request.dimensions, seed=request.seed)
+        else:
+            points = random_projection(matrix, request.dimensions, seed=request.seed)
+    
+    payload = {
+        "method": request.method,
+        "dimensions": request.dimensions,
+        "source_dimensions": matrix.shape[1],
+        "count": len(uuids),
+        "truncated": truncated,
+        "uuid": uuids,
+        "encoding": request.encoding,
+        "points": encode_points(points) if request.encoding == "base64" else points.tolist(),
+    }
+    if explained is not None:
+        payload["explained_variance"] = explained
+    if labels is not None:
+        payload["labels"] = labels
+    return payload
+
+
+@app.post("/class/{class_name}/vectors/projection")
+def project_vectors(
+    class_name: str,
+    request: ProjectionRequest,
+):
+    """
+    Project up to `limit` object vectors to 2D/3D with PCA or random projection.
+    `points` is row-major float32 (base64 by default), aligned with `uuid`.
+    Cached per collection version, so repeated scatter loads skip the raw vectors.
+    """
+    if not 0 < request.limit <= PROJECTION_MAX_POINTS:
+        raise HTTPException(status_code=422, detail=f"limit must be between 1 and {PROJECTION_MAX_POINTS}")
+    c = get_client()
+    version = collection_version(c, class_name)
+    key = request.model_dump_json()
+    body = projection_cache.get(scoped(class_name), key, version) if version is not None else None
+    if body is not None:
+        return Response(body, media_type="application/json", headers={"X-Cache": "HIT"})
+    
+    payload = compute_projection(c, class_name, request)
+    with timed("serialize"):
+        response = ORJSONResponse(payload, headers={"X-Cache": "MISS"})
+    if version is not None:
+        projection_cache.set(scoped(class_name), key, version, response.body)
+    return response
+
+
+@app.post("/class/{class_name}/analysis/duplicates", status_code=202)
+def start_duplicate_analysis(
+    class_name: str,
+    request: DuplicateAnalysisRequest,
+):
+    """
+    Start a background job finding near-duplicate pairs (cosine >= threshold) and
+    low-density outliers over all vectors of a collection. Poll GET /analysis/jobs/{id}
+    for progress; results page through /analysis/jobs/{id}/duplicates and /outliers.
+    """
+    if not 0 < request.threshold <= 1:
+        raise HTTPException(status_code=422, detail="threshold must be in (0, 1]")
+    if not 0 <= request.outlier_quantile <= 1:
+        raise HTTPException(status_code=422, detail="outlier_quantile must be in [0, 1]")
+    if request.block_rows < 1 or request.neighbors < 1:
+        raise HTTPException(status_code=422, detail="block_rows and neighbors must be positive")
+    c = get_client()
+    collection = c.collections.get(class_name)
+    expected = get_total_count(c, class_name)
+    
+    job = analysis_jobs.create("duplicates", class_name, current_cluster.get(), request.model_dump())
+    
+    def run(job):
+        objects = collection.iterator(include_vector=True, return_properties=[])
+        return run_duplicate_analysis(job, objects, min(expected, request.limit or expected))
+    
+    analysis_jobs.submit(job, run)
+    logger.info(f"[analysis] Started duplicates job {job.id} on {class_name}")
+    return job.to_dict()
+
+
+def get_job(job_id: str):
+    """Look up an analysis job, 404 if unknown."""
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown analysis job: {job_id}")
+    return job
+
+
+def finished_job(job_id: str):
+    """Look up an analysis job whose results are ready, 409 while it is still running."""
+    job = get_job(job_id)
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job.status}")
+    return job
+
+
+@app.get("/analysis/jobs")
+def list_analysis_jobs():
+    """List analysis jobs, newest first."""
+    return {"jobs": [job.to_dict() for job in analysis_jobs.list()]}
+
+
+@app.get("/analysis/jobs/{job_id}")
+def get_analysis_job(job_id: str):
+    """Job status with progress (phase, processed, total) and, once done, a result summary."""
+    return get_job(job_id).to_dict()
+
+
+@app.post("/analysis/jobs/{job_id}/cancel")
+def cancel_analysis_job(job_id: str):
+    """Ask a queued or running job to stop; it ends as cancelled at the next block."""
+    job = get_job(job_id)
+    job.cancel()
+    return job.to_dict()
+
+
+@app.delete("/analysis/jobs/{job_id}")
+def delete_analysis_job(job_id: str):
+    """
+    Cancel a job if it is still running and delete its persisted results.
+    409 if the job does not stop within a few seconds; retry the delete later.
+    """
+    try:
+        deleted = analysis_jobs.delete(job_id)
+    except JobRunning as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not deleted:
+        raise HTTPException(status_code=404, detail=f"Unknown analysis job: {job_id}")
+    return {"deleted": job_id}
+
+
+@app.get("/analysis/jobs/{job_id}/duplicates")
+def get_job_duplicates(job_id: str, offset: int = Query(0, ge=0), limit: int = Query(100, ge=1)):
+    """Duplicate pairs, most similar first: {data: [{uuid, duplicate_uuid, similarity}], count}."""
+    return page_duplicates(finished_job(job_id), offset, limit)
+
+
+@app.get("/analysis/jobs/{job_id}/outliers")
+def get_job_outliers(job_id: str, offset: int = Query(0, ge=0), limit: int = Query(100, ge=1)):
+    """Outliers, least dense first: {data: [{uuid, density}], count}."""
+    return page_outliers(finished_job(job_id), offset, limit)
+
+
+@app.get("/class/{class_name}/object/{object_id}")
+def get_object(
+    class_name: str,
+    object_id: UUID,
+    fields: str | None = None,
+):
+    """
+    Fetch one object with full property values, e.g. to expand a truncated preview cell.
+    `fields` is a comma-separated projection pushed down to Weaviate.
+    """
+    c = get_client()
+    collection = c.collections.get(class_name)
+
+    property_names = [p.strip() for p in fields.split(",") if p.strip()] if fields else None
+    with timed("query"):
+        obj = collection.query.fetch_object_by_id(object_id, return_properties=property_names)
+    if obj is None:
+        raise HTTPException(status_code=404, detail=f"Object not found: {object_id}")
+
+    with timed("serialize"):
+        return format_object(obj, property_names or list(obj.properties))
+
+
+@app.get("/class/{class_name}/export")
+def export_collection(
+    class_name: str,
+    format: Literal["ndjson", "csv", "parquet"] = "ndjson",
+    properties: str | None = None,
+    include_vector: bool = False,
+):
+    """
+    Stream a whole collection as NDJSON, CSV or Parquet.
+    Uses the collection iterator, so memory stays flat regardless of collection size.
+    `properties` is a comma-separated projection pushed down to Weaviate.
+    """
+    c = get_client()
+    collection = c.collections.get(class_name)
+
+    if format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+
+    property_names = [p.strip() for p in properties.split(",") if p.strip()] if properties else None
+    if format == "csv" and property_names is None:
+        # CSV needs a stable header, so fix the columns from the schema up front
+        property_names = get_property_names(c, class_name, None)
+
+    rows = (
+        object_row(obj, property_names, include_vector)
+        for obj in collection.iterator(include_vector=include_vector, return_properties=property_names)
+    )
+    writers = {"ndjson": iter_ndjson, "csv": iter_csv, "parquet": iter_parquet}
+
+    return StreamingResponse(
+        writers[format](rows),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{class_name}.{format}"'},
+    )
+
+
+IMPORT_FORMATS = {media_type: format for format, media_type in EXPORT_MEDIA_TYPES.items()}
+
+
+def invalidate_collection_caches(collection_name: str):
+    """Drop cached counts, facets, search results and page cursors after a collection's data changed."""
+    key = scoped(collection_name)
+    count_cache.invalidate(lambda k: k == key)
+    facet_cache.invalidate(lambda k: k[0] == key)
+    query_cache.invalidate(key)
+    projection_cache.invalidate(key)
+    cursor_index.invalidate(key)
+
+
+class UploadStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for endpoints that keep reading the request body while streaming.
+    The default disconnect listener would consume the upload's receive() messages;
+    disconnects surface as ClientDisconnect from request.stream() instead.
+    """
+
+    async def listen_for_disconnect(self, receive):
+        await anyio.sleep_forever()
+
+
+async def stream_import(
+    c: weaviate.WeaviateClient,
+    class_name: str,
+    objects: Callable[[], Any],
+    batch: Any,
+    http_request: Request | None = None,
+    retried: tuple[str, str] | None = None,
+):
+    """
+    Yield SSE events for an import running in a worker thread: `progress` (objects/sec,
+    errors, backpressure), `error` per unparsable row, then `done` with the final stats and,
+    when objects failed, the import_id to retry them with.
+    The upload body is fed to the worker through a bounded queue, so a slow Weaviate
+    slows the upload instead of buffering it.
+    `retried` is the import_failures key being re-sent; it is dropped only once the
+    import ran to completion, so a failed retry can be retried again.
+    """
+    collection = c.collections.get(class_name)
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    chunks: queue.Queue = queue.Queue(maxsize=16)
+    stop = threading.Event()
+
+    def emit(event: str, data: dict):
+        loop.call_soon_threadsafe(events.put_nowait, (event, data))
+
+    def put_chunk(chunk: bytes | None):
+        while not stop.is_set():
+            try:
+                chunks.put(chunk, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def body_chunks():
+        while not stop.is_set():
+            try:
+                chunk = chunks.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if chunk is None:
+                return
+            yield chunk
+
+    def worker():
+        try:
+            stats, errors = import_objects(collection, objects(body_chunks()), batch, emit)
+            if retried is not None:
+                import_failures.invalidate(lambda key: key == retried)
+            failed = [failed_object(error) for error in errors]
+            done = {**stats}
+            if failed:
+                import_id = uuid4().hex
+                import_failures.set((scoped(class_name), import_id), failed[:IMPORT_MAX_FAILED])
+                done.update({
+                    "import_id": import_id,
+                    "retryable": min(len(failed), IMPORT_MAX_FAILED),
+                    "failures": [{"uuid": str(e.object_.uuid), "detail": e.message} for e in errors[:20]],
+                })
+            emit("done", done)
+        except Exception as e:
+            logger.exception(f"[import] {class_name} import failed")
+            emit("error", {"detail": str(e)})
+        finally:
+            invalidate_collection_caches(class_name)
+            emit("", {})  # end of stream
+
+    async def feed():
+        try:
+            if http_request is not None:
+                async for chunk in http_request.stream():
+                    if chunk:
+                        await run_in_threadpool(put_chunk, chunk)
+        finally:
+            await run_in_threadpool(put_chunk, None)
+
+    feeder = asyncio.create_task(feed())
+    worker_task = asyncio.create_task(run_in_threadpool(worker))
+    try:
+        while True:
+            event, data = await events.get()
+            if not event:
+                break
+            yield sse_event(event, data)
+    finally:
+        stop.set()
+        feeder.cancel()
+        await asyncio.shield(worker_task)
+
+
+@app.post("/class/{class_name}/import")
+async def import_collection(
+    class_name: str,
+    http_request: Request,
+    format: Literal["ndjson", "csv", "parquet"] | None = None,
+    batching: Batching = "dynamic",
+    batch_size: int = IMPORT_BATCH_SIZE,
+    concurrent_requests: int = IMPORT_CONCURRENT_REQUESTS,
+    requests_per_minute: int | None = None,
+):
+    """
+    Bulk import a streamed NDJSON, CSV or Parquet upload (the raw request body) with
+    Weaviate's dynamic, fixed-size or rate-limited batching. Rows use the export layout.
+    Progress is reported as Server-Sent Events; failed objects can be re-sent with
+    POST /class/{name}/import/{import_id}/retry.
+    """
+    if format is None:
+        content_type = http_request.headers.get("content-type", "").split(";")[0].strip()
+        format = IMPORT_FORMATS.get(content_type, "ndjson")
+    if format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="Parquet import requires pyarrow")
+    if batching == "rate_limit" and not requests_per_minute:
+        raise HTTPException(status_code=422, detail="rate_limit batching needs requests_per_minute")
+    
+    c = get_client()
+    collection = c.collections.get(class_name)
+    
+    if format == "csv":
+        config = await run_in_threadpool(get_collection_config, c, class_name)
+        data_types = {p.name: getattr(p.data_type, "value", p.data_type) for p in config.properties}
+        parse = lambda chunks: iter_csv_rows(chunks, data_types)
     else:
-        response = collection.aggregate.over_all(total_count=True)
-        return {
-            "total_count": response.total_count,
-        }
+        parse = iter_parquet_rows if format == "parquet" else iter_ndjson_rows
+    
+    batch = open_batch(collection, batching, batch_size, concurrent_requests, requests_per_minute)
+    logger.info(f"[import] {class_name}: {format} upload, {batching} batching")
+    return UploadStreamingResponse(
+        stream_import(c, class_name, lambda chunks: iter_objects(parse(chunks)), batch, http_request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/class/{class_name}/import/{import_id}/retry")
+async def retry_import(
+    class_name: str,
+    import_id: str,
+    batching: Batching = "dynamic",
+    batch_size: int = IMPORT_BATCH_SIZE,
+    concurrent_requests: int = IMPORT_CONCURRENT_REQUESTS,
+    requests_per_minute: int | None = None,
+):
+    """Re-send the failed objects of an earlier import; streams the same SSE events."""
+    if batching == "rate_limit" and not requests_per_minute:
+        raise HTTPException(status_code=422, detail="rate_limit batching needs requests_per_minute")
+    key = (scoped(class_name), import_id)
+    failed = import_failures.get(key)
+    if failed is None:
+        raise HTTPException(status_code=404, detail=f"No failed objects for import {import_id}")
+    c = get_client()
+    batch = open_batch(c.collections.get(class_name), batching, batch_size, concurrent_requests, requests_per_minute)
+    objects = lambda _: ((i, obj, None) for i, obj in enumerate(failed, start=1))
+    return StreamingResponse(
+        stream_import(c, class_name, objects, batch, retried=key),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
-# Mount static files for frontend
-app.mount("/", StaticFiles(directory="static", html=True), name="static")
+# Mount static files for frontend; precompressed variants and cache headers, see weaviate_spy/static.py
+app.mount("/", PrecompressedStaticFiles(directory="static", html=True), name="static")
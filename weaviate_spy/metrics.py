@@ -0,0 +1,246 @@
+"""
+Request metrics for Weaviate Spy.
+Prometheus text-format histograms, gauges and counters, plus per-request phase
+timings (Weaviate query, aggregate, config.get, serialization) reported both to
+/metrics and to the browser through a Server-Timing header.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Iterator, TypeVar
+
+from starlette.routing import Match, Route
+
+# Seconds; Prometheus client defaults plus a finer low end for cache hits
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+T = TypeVar("T")
+
+# Collections remembered as error labels; names past this are reported as "unknown"
+MAX_COLLECTION_LABELS = 1000
+
+# Phase timings of the current request, in seconds; None outside a tracked request
+_timings: ContextVar[dict[str, float] | None] = ContextVar("weaviate_spy_timings", default=None)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = list(self._values.items())
+        for values, value in items:
+            yield f"{self.name}{_format_labels(self.labels, values)} {value}"
+
+
+class Gauge(Counter):
+    """Value that goes up and down, e.g. requests in flight."""
+
+    kind = "gauge"
+
+    def dec(self, *label_values: str, amount: float = 1.0):
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        with self._lock:
+            series = self._values.get(label_values)
+            if series is None:
+                series = self._values[label_values] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            else:
+                series[len(self.buckets)] += 1
+            series[-1] += value
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = [(values, list(series)) for values, series in self._values.items()]
+        for values, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = 'le="%s"' % bound
+                yield f"{self.name}_bucket{_format_labels(self.labels, values, le)} {cumulative}"
+            cumulative += series[len(self.buckets)]
+            le = 'le="+Inf"'
+            yield f"{self.name}_bucket{_format_labels(self.labels, values, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, values)} {series[-1]}"
+            yield f"{self.name}_count{_format_labels(self.labels, values)} {cumulative}"
+
+
+class Registry:
+    """Collection of metrics rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        self.metrics: list[Counter | Histogram] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+request_seconds = registry.register(Histogram(
+    "weaviate_spy_request_duration_seconds",
+    "Time spent per request and phase (query, aggregate, config, serialize, generate, total)",
+    ("endpoint", "phase"),
+))
+requests_in_flight = registry.register(Gauge(
+    "weaviate_spy_requests_in_flight",
+    "Requests currently being handled",
+    ("endpoint",),
+))
+request_errors = registry.register(Counter(
+    "weaviate_spy_request_errors_total",
+    "Responses with a 4xx/5xx status or an unhandled exception",
+    ("endpoint", "collection", "status"),
+))
+
+
+@contextmanager
+def timed(phase: str):
+    """Add the time spent in the block to the current request's phase total."""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - start
+
+
+async def timed_await(phase: str, awaitable: Awaitable[T]) -> T:
+    """Await under timed(phase); concurrent phases (asyncio.gather) overlap in the totals."""
+    with timed(phase):
+        return await awaitable
+
+
+def server_timing(timings: dict[str, float]) -> str:
+    """Render phase timings as a Server-Timing header value (milliseconds)."""
+    return ", ".join(f"{phase};dur={seconds * 1000:.1f}" for phase, seconds in timings.items())
+
+
+def match_route(scope: dict) -> tuple[str | None, dict]:
+    """Return (path template, path params) of the API route handling the request, if any."""
+    for route in scope["app"].router.routes:
+        if not isinstance(route, Route):
+            continue
+        match, child_scope = route.matches(scope)
+        if match == Match.FULL:
+            return route.path, child_scope.get("path_params", {})
+    return None, {}
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-endpoint latency, in-flight requests and errors,
+    and adding a Server-Timing header with the phase breakdown to every API response.
+    Static files and unknown paths are not tracked. Errors are labelled with their
+    collection only once it has answered a request successfully, so made-up names
+    in the URL cannot grow the label set.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._collections: set[str] = set()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        endpoint, path_params = match_route(scope)
+        if endpoint is None or endpoint == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        collection = path_params.get("class_name") or path_params.get("collection_name") or ""
+        timings: dict[str, float] = {}
+        token = _timings.set(timings)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timings["total"] = time.perf_counter() - start
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(timings).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        requests_in_flight.inc(endpoint)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            requests_in_flight.dec(endpoint)
+            _timings.reset(token)
+            timings["total"] = time.perf_counter() - start
+            for phase, seconds in timings.items():
+                request_seconds.observe(seconds, endpoint, phase)
+            if status < 400:
+                if collection and len(self._collections) < MAX_COLLECTION_LABELS:
+                    self._collections.add(collection)
+            else:
+                label = collection if not collection or collection in self._collections else "unknown"
+                request_errors.inc(endpoint, label, str(status))
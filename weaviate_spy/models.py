@@ -0,0 +1,155 @@
+"""
+Request models shared by the sync and async apps.
+"""
+
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, field_validator
+
+from weaviate_spy.filters import FilterSpec
+from weaviate_spy.fusion import FusionMethod
+from weaviate_spy.projection import ProjectionMethod
+
+# How the "count" field of a search response is computed:
+#   none      - number of returned objects, no extra Weaviate call
+#   exact     - aggregate matching the search query
+#   estimated - offset + returned objects (+1 when the page is full, so pagers offer a next page)
+#   cached    - collection total from count_cache, refreshed in the background
+CountStrategy = Literal["none", "exact", "estimated", "cached"]
+
+
+# Pydantic models for request/response
+class SearchRequest(BaseModel):
+    """Base search request model."""
+    query: str | None = None
+    keyword: str | None = None  # For semantic search
+    limit: int = Field(default=20, ge=1)
+    offset: int = Field(default=0, ge=0)
+    certainty: float = 0.65
+    properties: list[str] | None = None  # Also pushed down to Weaviate as return_properties
+    preview_chars: int | None = None  # Truncate longer text values; see GET /class/{name}/object/{uuid}
+    count: CountStrategy = "exact"
+    filters: FilterSpec | None = None  # Pushed down to the query and its count aggregate
+    # Fetch (no query) only: "cursor" pages with after=UUID; the page is
+    # taken from `cursor` if given, otherwise from offset // limit + 1
+    pagination: Literal["offset", "cursor"] = "offset"
+    cursor: str | None = None
+
+
+class HybridSearchRequest(BaseModel):
+    """Hybrid search request model."""
+    query: str
+    alpha: float = 0.5  # Balance between BM25 (0) and vector (1)
+    limit: int = Field(default=20, ge=1)
+    offset: int = Field(default=0, ge=0)
+    properties: list[str] | None = None
+    preview_chars: int | None = None
+    count: CountStrategy = "none"
+    filters: FilterSpec | None = None
+
+
+class BM25SearchRequest(BaseModel):
+    """BM25 (keyword) search request model."""
+    query: str
+    limit: int = Field(default=20, ge=1)
+    offset: int = Field(default=0, ge=0)
+    properties: list[str] | None = None
+    preview_chars: int | None = None
+    count: CountStrategy = "none"
+    filters: FilterSpec | None = None
+
+
+class GenerativeRequest(BaseModel):
+    """Generative search request model: per-object prompt and/or one grouped task."""
+    prompt: str | None = None
+    grouped_task: str | None = None
+    query: str | None = None
+    search_mode: Literal["semantic", "bm25", "hybrid"] = "semantic"  # Retrieval used when query is set
+    alpha: float = 0.5  # Hybrid retrieval only
+    limit: int = 10
+    certainty: float = 0.65
+    properties: list[str] | None = None
+    filters: FilterSpec | None = None
+
+
+class BatchQuery(BaseModel):
+    """One search in a batch; `alphas` runs a hybrid query once per alpha."""
+    mode: Literal["semantic", "bm25", "hybrid"] = "semantic"
+    query: str | None = None
+    label: str | None = None
+    alpha: float = 0.5
+    alphas: list[float] | None = None
+    certainty: float = 0.65
+    filters: FilterSpec | None = None  # Overrides the batch-wide filters
+
+
+class BatchSearchRequest(BaseModel):
+    """Several searches over one collection, run concurrently with shared settings."""
+    queries: list[BatchQuery]
+    limit: int = 20
+    properties: list[str] | None = None
+    preview_chars: int | None = None
+    count: CountStrategy = "none"
+    filters: FilterSpec | None = None
+
+
+FusionSource = Literal["bm25", "semantic", "near_object"]
+
+
+class FusionRequest(BaseModel):
+    """Candidates from several search modes, fused locally and optionally reranked."""
+    query: str
+    near_object: str | None = None  # Object uuid for the near_object source
+    sources: list[FusionSource] | None = None  # Default: bm25 and semantic, plus near_object when given
+    weights: dict[str, float] | None = None  # Per source, default 1
+    method: FusionMethod = "rrf"
+    rrf_k: int = 60
+    candidates: int = 100  # Fetched per source
+    alphas: list[float] | None = None  # Also rank with weights bm25 = 1 - alpha, semantic = alpha
+    certainty: float | None = None
+    limit: int = 20
+    properties: list[str] | None = None
+    preview_chars: int | None = None
+    filters: FilterSpec | None = None
+    rerank: bool = False
+    rerank_top: int = 50
+    rerank_properties: list[str] | None = None  # Text passed to the reranker, default all text values
+
+
+class ProjectionRequest(BaseModel):
+    """Vector projection request model."""
+    method: ProjectionMethod = "pca"
+    dimensions: Literal[2, 3] = 2
+    limit: int = 10000  # Objects read in iterator (uuid) order, which is effectively random for uuid4
+    vector_name: str | None = None  # Named vector; default/only vector if None
+    label: str | None = None  # Property returned alongside each point, e.g. for hover text
+    encoding: Literal["base64", "list"] = "base64"  # base64 of float32 rows, or nested lists
+    seed: int = 0
+
+
+class DuplicateAnalysisRequest(BaseModel):
+    """Near-duplicate / outlier job request model."""
+    threshold: float = 0.95  # Cosine similarity at or above which two objects are duplicates
+    neighbors: int = 10  # k for the outlier density (mean similarity to the k nearest objects)
+    outlier_quantile: float = 0.01  # Flag objects in this lowest-density fraction
+    max_outliers: int = 10000
+    max_pairs: int = 1_000_000
+    block_rows: int = 4096  # Rows per block in the blocked similarity products
+    vector_name: str | None = None
+    limit: int | None = None  # Analyse only the first N objects
+
+
+class AggregateRequest(BaseModel):
+    """Aggregate request model."""
+    group_by: list[str] | None = None  # One facet (value counts) per property
+    group_limit: int | None = 100  # Max values per facet
+    metrics: list[str] | None = None  # Properties to compute stats for; ["*"] for all
+    group_metrics: bool = False  # Also compute the metrics within each group
+    top_occurrences: int = 10  # Top values returned for text properties
+    filters: FilterSpec | None = None  # Filtered aggregates bypass the facet cache
+
+    @field_validator("group_by", mode="before")
+    @classmethod
+    def single_group_by(cls, value: Any) -> Any:
+        """Accept a single property name as well as a list."""
+        return [value] if isinstance(value, str) else value
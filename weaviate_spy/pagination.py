@@ -0,0 +1,136 @@
+"""
+Cursor pagination for the object grid.
+Opaque cursor tokens over Weaviate's `after=` UUID cursor, plus a bounded
+index of page number -> cursor so deep page jumps start from a nearby anchor.
+"""
+
+import base64
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+
+def encode_cursor(collection_name: str, after: str, page: int | None = None) -> str:
+    """Encode the UUID to continue after (and the page it starts) as an opaque token."""
+    payload = {"c": collection_name, "a": after}
+    if page is not None:
+        payload["p"] = page
+    raw = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(collection_name: str, token: str) -> tuple[str, int | None]:
+    """
+    Decode a cursor token back to (after, page).
+    Raises ValueError if the token is invalid or belongs to another collection.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        after = str(payload["a"])
+        owner = payload["c"]
+        page = payload.get("p")
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+    if owner != collection_name:
+        raise ValueError(f"Cursor belongs to collection {owner!r}")
+    return after, page
+
+
+class CursorIndex:
+    """
+    Bounded map of (collection, page_size, page) -> UUID the page starts after.
+    Page 1 needs no cursor. Groups of pages are evicted least recently used first
+    once max_entries is exceeded. Inserts and deletes shift every later page
+    boundary, so a collection's anchors are dropped when its version changes.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._groups: OrderedDict[tuple[str, int], dict[int, str]] = OrderedDict()
+        self._versions: dict[str, Hashable] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def record(self, collection_name: str, page_size: int, page: int, after: str):
+        """Remember that `page` starts after the given UUID."""
+        if page <= 1:
+            return
+        with self._lock:
+            group = self._groups.setdefault((collection_name, page_size), {})
+            self._groups.move_to_end((collection_name, page_size))
+            if page not in group:
+                self._size += 1
+            group[page] = after
+            while self._size > self.max_entries and len(self._groups) > 1:
+                _, evicted = self._groups.popitem(last=False)
+                self._size -= len(evicted)
+
+    def anchor(self, collection_name: str, page_size: int, page: int) -> tuple[int, str | None]:
+        """Return the closest known (page, after) at or before the requested page."""
+        with self._lock:
+            group = self._groups.get((collection_name, page_size))
+            if not group:
+                return 1, None
+            self._groups.move_to_end((collection_name, page_size))
+            if page in group:
+                return page, group[page]
+            known = [p for p in group if p <= page]
+            if not known:
+                return 1, None
+            best = max(known)
+            return best, group[best]
+
+    def _drop(self, collection_name: str | None) -> int:
+        keys = [k for k in self._groups if collection_name is None or k[0] == collection_name]
+        dropped = 0
+        for k in keys:
+            dropped += len(self._groups.pop(k))
+        self._size -= dropped
+        return dropped
+
+    def invalidate(self, collection_name: str | None = None) -> int:
+        """Forget cursors for one collection (or all). Returns the number dropped."""
+        with self._lock:
+            if collection_name is None:
+                self._versions.clear()
+            else:
+                self._versions.pop(collection_name, None)
+            return self._drop(collection_name)
+
+    def sync(self, collection_name: str, version: Hashable) -> int:
+        """Forget a collection's cursors if its version changed since they were recorded."""
+        with self._lock:
+            previous = self._versions.get(collection_name)
+            self._versions[collection_name] = version
+            if previous is None or previous == version:
+                return 0
+            return self._drop(collection_name)
+
+    def resolve(
+        self,
+        collection_name: str,
+        page_size: int,
+        page: int,
+        walk: Callable[[str | None, int], list[str]],
+        walk_batch: int = 10_000,
+    ) -> tuple[str | None, bool]:
+        """
+        Find the UUID that `page` starts after, returning (after, exists).
+        Starts from the nearest known anchor and calls walk(after, limit) to fetch
+        UUID-only batches, recording every page boundary passed on the way.
+        """
+        start_page, after = self.anchor(collection_name, page_size, page)
+        pages_per_batch = max(1, walk_batch // page_size)
+        while start_page < page:
+            pages = min(pages_per_batch, page - start_page)
+            uuids = walk(after, pages * page_size)
+            for i in range(page_size - 1, len(uuids), page_size):
+                start_page += 1
+                after = uuids[i]
+                self.record(collection_name, page_size, start_page, after)
+            if len(uuids) < pages * page_size:
+                # Ran off the end of the collection
+                return after, start_page == page
+        return after, True
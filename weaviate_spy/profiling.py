@@ -0,0 +1,455 @@
+"""
+Collection profiling.
+Per-property data-quality statistics (fill rate, distinct count, text lengths, value
+quantiles, frequent values) built from one streamed pass over a collection into
+fixed-size sketches. Profiles persist with the last-update-time watermark of their
+scan, so a refresh only reads objects created or updated since; updates and deletes
+the sketches cannot subtract are tracked and trigger a full rescan past a threshold.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Literal
+from urllib.parse import quote
+
+from loguru import logger
+from weaviate.classes.query import Filter, MetadataQuery, Sort
+
+from weaviate_spy.facets import BOOLEAN_TYPES, DATE_TYPES, NUMERIC_TYPES, TEXT_TYPES
+from weaviate_spy.sketches import HyperLogLog, TDigest, TopK
+
+RefreshStatus = Literal["running", "done", "failed", "cancelled"]
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+TOP_VALUES = 10
+# Text values are cut to this many characters before frequency counting
+MAX_VALUE_CHARS = 200
+PROGRESS_EVERY = 1000
+
+
+class RefreshCancelled(Exception):
+    """Raised inside a refresh once the store is closing."""
+
+
+class TiedUpdates(Exception):
+    """More objects share one update time than the largest page may hold; the refresh rescans instead."""
+
+
+def to_millis(value: datetime | None) -> int | None:
+    return int(value.timestamp() * 1000) if value is not None else None
+
+
+def from_millis(millis: int) -> datetime:
+    return datetime.fromtimestamp(millis / 1000, tz=timezone.utc)
+
+
+def iso(seconds: float | None) -> str | None:
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).isoformat() if seconds is not None else None
+
+
+class PropertyProfile:
+    """Sketches of one property's values; array properties are profiled per element."""
+
+    def __init__(self, name: str, data_type: str):
+        self.name = name
+        self.data_type = data_type
+        self.filled = 0  # Objects with a value (non-empty string or array)
+        self.empty = 0  # Objects with an empty string or array
+        self.true = 0
+        self.false = 0
+        is_text = data_type in TEXT_TYPES
+        is_numeric = data_type in NUMERIC_TYPES
+        self.distinct = HyperLogLog() if is_text or is_numeric else None
+        self.lengths = TDigest() if is_text else None
+        # Numbers, or dates as epoch seconds
+        self.values = TDigest() if is_numeric or data_type in DATE_TYPES else None
+        self.top = TopK() if is_text or data_type in ("int", "int[]") else None
+
+    def add(self, value: Any):
+        if value is None:
+            return
+        elements = value if isinstance(value, list) else [value]
+        if not elements or elements == [""]:
+            self.empty += 1
+            return
+        self.filled += 1
+        for element in elements:
+            if element is None:
+                continue
+            if self.data_type in TEXT_TYPES:
+                self.lengths.add(len(element))
+                self.distinct.add(element)
+                self.top.add(element[:MAX_VALUE_CHARS])
+            elif self.data_type in NUMERIC_TYPES:
+                self.values.add(float(element))
+                self.distinct.add(element)
+                if self.top is not None:
+                    self.top.add(element)
+            elif self.data_type in BOOLEAN_TYPES:
+                if element:
+                    self.true += 1
+                else:
+                    self.false += 1
+            elif self.data_type in DATE_TYPES:
+                if isinstance(element, str):
+                    element = datetime.fromisoformat(element.replace("Z", "+00:00"))
+                self.values.add(element.timestamp())
+
+    def summary(self, objects: int) -> dict:
+        summary: dict[str, Any] = {
+            "name": self.name,
+            "data_type": self.data_type,
+            "filled": self.filled,
+            "empty": self.empty,
+            "fill_rate": self.filled / objects if objects else None,
+        }
+        if self.distinct is not None:
+            summary["distinct"] = self.distinct.estimate()
+        if self.lengths is not None:
+            summary["length"] = digest_summary(self.lengths)
+        if self.values is not None:
+            summary["values"] = digest_summary(self.values, iso if self.data_type in DATE_TYPES else None)
+        if self.top is not None:
+            summary["top"] = [{"value": v, "count": c} for v, c in self.top.top(TOP_VALUES)]
+            summary["top_error"] = self.top.error
+        if self.data_type in BOOLEAN_TYPES:
+            summary["true"] = self.true
+            summary["false"] = self.false
+        return summary
+
+    def to_state(self) -> dict:
+        state = {"name": self.name, "data_type": self.data_type, "filled": self.filled, "empty": self.empty,
+                 "true": self.true, "false": self.false}
+        for key in ("distinct", "lengths", "values", "top"):
+            sketch = getattr(self, key)
+            state[key] = sketch.to_state() if sketch is not None else None
+        return state
+
+    @classmethod
+    def from_state(cls, state: dict) -> "PropertyProfile":
+        prop = cls(state["name"], state["data_type"])
+        for key in ("filled", "empty", "true", "false"):
+            setattr(prop, key, state[key])
+        for key, sketch_type in (("distinct", HyperLogLog), ("lengths", TDigest), ("values", TDigest), ("top", TopK)):
+            if state[key] is not None:
+                setattr(prop, key, sketch_type.from_state(state[key]))
+        return prop
+
+
+def digest_summary(digest: TDigest, render=None) -> dict:
+    """min, max, mean and quantiles of a digest, optionally rendered (e.g. epoch seconds as ISO dates)."""
+    render = render or (lambda value: value)
+    if not digest.count:
+        return {"count": 0}
+    return {
+        "count": digest.count,
+        "min": render(digest.min),
+        "max": render(digest.max),
+        "mean": render(digest.mean()),
+        "quantiles": {f"p{round(q * 100)}": render(digest.quantile(q)) for q in QUANTILES},
+    }
+
+
+class CollectionProfile:
+    """
+    Property profiles of a collection plus the watermark of what they cover: every
+    object last updated before `watermark` (ms) is profiled, as are the `boundary`
+    uuids updated exactly at it.
+    """
+
+    def __init__(self, properties: list[tuple[str, str]]):
+        self.properties = {name: PropertyProfile(name, data_type) for name, data_type in properties}
+        self.objects = 0  # Objects profiled, counting re-profiled updated objects again
+        self.updated = 0  # Objects re-profiled after an update; their old values are still in the sketches
+        self.deleted = 0  # Estimated from the total count; deletes cannot be read incrementally
+        self.watermark: int | None = None
+        self.boundary: list[str] = []
+        self.incremental = True  # False when the collection does not index timestamps
+        self.scanned_at: float | None = None
+        self.updated_at: float | None = None
+
+    def schema(self) -> list[tuple[str, str]]:
+        return [(p.name, p.data_type) for p in self.properties.values()]
+
+    def add(self, obj: Any, updated: bool = False):
+        self.objects += 1
+        if updated:
+            self.updated += 1
+        values = obj.properties or {}
+        for name, prop in self.properties.items():
+            prop.add(values.get(name))
+
+    def drift(self) -> float:
+        """Share of profiled values that are stale (overwritten or deleted objects)."""
+        live = self.objects - self.updated - self.deleted
+        return (self.updated + self.deleted) / live if live > 0 else float(bool(self.objects))
+
+    def summary(self) -> dict:
+        objects = self.objects - self.updated - self.deleted
+        return {
+            "objects": objects,
+            "properties": [prop.summary(objects) for prop in self.properties.values()],
+            "stale": {"updated": self.updated, "deleted": self.deleted, "drift": self.drift()},
+            "incremental": self.incremental,
+            "watermark": from_millis(self.watermark).isoformat() if self.watermark is not None else None,
+            "scanned_at": iso(self.scanned_at),
+            "updated_at": iso(self.updated_at),
+        }
+
+    def to_state(self) -> dict:
+        return {
+            "properties": [prop.to_state() for prop in self.properties.values()],
+            "objects": self.objects,
+            "updated": self.updated,
+            "deleted": self.deleted,
+            "watermark": self.watermark,
+            "boundary": self.boundary,
+            "incremental": self.incremental,
+            "scanned_at": self.scanned_at,
+            "updated_at": self.updated_at,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "CollectionProfile":
+        profile = cls([])
+        profile.properties = {p["name"]: PropertyProfile.from_state(p) for p in state["properties"]}
+        for key in ("objects", "updated", "deleted", "watermark", "boundary", "incremental", "scanned_at", "updated_at"):
+            setattr(profile, key, state[key])
+        return profile
+
+
+class ProfileRefresh:
+    """Progress of one (full or incremental) profile refresh."""
+
+    def __init__(self, mode: str, cancel: threading.Event):
+        self.mode = mode
+        self.status: RefreshStatus = "running"
+        self.processed = 0
+        self.total: int | None = None
+        self.error: str | None = None
+        self.started_at = time.time()
+        self.finished_at: float | None = None
+        self._cancel = cancel
+
+    def progress(self, processed: int):
+        self.processed = processed
+        if self._cancel.is_set():
+            raise RefreshCancelled()
+
+    def to_dict(self) -> dict:
+        return {
+            "mode": self.mode,
+            "status": self.status,
+            "processed": self.processed,
+            "total": self.total,
+            "error": self.error,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+def latest_update(collection: Any) -> tuple[int | None, list[str]]:
+    """
+    Watermark before a full scan: the newest last-update time and the uuids updated at it.
+    Filters on update time, so it raises when the collection does not index timestamps.
+    """
+    response = collection.query.fetch_objects(
+        filters=Filter.by_update_time().greater_or_equal(from_millis(0)),
+        sort=Sort.by_update_time(ascending=False),
+        limit=100,
+        return_metadata=MetadataQuery(last_update_time=True),
+        return_properties=[],
+    )
+    if not response.objects:
+        return None, []
+    watermark = to_millis(response.objects[0].metadata.last_update_time)
+    boundary = [str(o.uuid) for o in response.objects if to_millis(o.metadata.last_update_time) == watermark]
+    return watermark, boundary
+
+
+def scan_profile(collection: Any, schema: list[tuple[str, str]], task: ProfileRefresh) -> CollectionProfile:
+    """Profile every object. Objects written during the scan may be read again by the next update."""
+    profile = CollectionProfile(schema)
+    try:
+        profile.watermark, profile.boundary = latest_update(collection)
+    except Exception as e:
+        logger.warning(f"[profile] No update-time watermark, refreshes will rescan: {e}")
+        profile.incremental = False
+    for obj in collection.iterator(return_properties=list(profile.properties)):
+        profile.add(obj)
+        if profile.objects % PROGRESS_EVERY == 0:
+            task.progress(profile.objects)
+    task.progress(profile.objects)
+    profile.scanned_at = profile.updated_at = time.time()
+    return profile
+
+
+def update_profile(
+    collection: Any, profile: CollectionProfile, task: ProfileRefresh, page_size: int, max_page: int,
+) -> int:
+    """
+    Profile objects created or updated since the watermark, paging by ascending update
+    time. Objects that existed at the previous watermark count as updates. Returns the
+    number of objects read; raises TiedUpdates when more than max_page objects share
+    one update time, since paging by that time cannot get past them.
+    """
+    previous = profile.watermark or 0
+    profiled = set(profile.boundary)
+    since = previous
+    seen = set(profiled)
+    read = 0
+    limit = page_size
+    names = list(profile.properties)
+    while True:
+        response = collection.query.fetch_objects(
+            filters=Filter.by_update_time().greater_or_equal(from_millis(since)),
+            sort=Sort.by_update_time(ascending=True),
+            limit=limit,
+            return_metadata=MetadataQuery(creation_time=True, last_update_time=True),
+            return_properties=names,
+        )
+        fresh = 0
+        for obj in response.objects:
+            updated_at = to_millis(obj.metadata.last_update_time)
+            if updated_at > since:
+                since = updated_at
+                seen = set()
+            uuid = str(obj.uuid)
+            if uuid in seen:
+                continue
+            seen.add(uuid)
+            created_at = to_millis(obj.metadata.creation_time)
+            profile.add(obj, updated=created_at < previous or (created_at == previous and uuid in profiled))
+            fresh += 1
+        read += fresh
+        task.progress(read)
+        if len(response.objects) < limit:
+            break
+        if fresh:
+            limit = page_size
+            continue
+        # A full page with nothing new: more objects share one update time than fit a page
+        if limit >= max_page:
+            raise TiedUpdates(f"more than {max_page} objects updated at {from_millis(since).isoformat()}")
+        limit = min(limit * 2, max_page)
+    profile.watermark = since if read or profile.watermark is not None else None
+    profile.boundary = sorted(seen)
+    profile.updated_at = time.time()
+    return read
+
+
+class ProfileStore:
+    """
+    Collection profiles persisted under a root directory, keyed on "cluster/collection"
+    and refreshed on a small worker pool; at most one refresh runs per collection.
+    """
+
+    def __init__(self, root: str, refresh_after: float, rebuild_ratio: float, page_size: int = 1000,
+                 max_page: int = 10000, max_workers: int = 1):
+        self.root = root
+        self.refresh_after = refresh_after
+        self.rebuild_ratio = rebuild_ratio
+        self.page_size = page_size
+        self.max_page = max(max_page, page_size)
+        self.profiles: dict[str, CollectionProfile] = {}
+        self.refreshes: dict[str, ProfileRefresh] = {}
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="profile")
+
+    def _path(self, key: str) -> str:
+        cluster, collection = key.split("/", 1)
+        return os.path.join(self.root, quote(cluster, safe=""), quote(collection, safe="") + ".json")
+
+    def get(self, key: str) -> CollectionProfile | None:
+        """Look a profile up in memory, falling back to its persisted state."""
+        with self._lock:
+            profile = self.profiles.get(key)
+            if profile is None and os.path.exists(self._path(key)):
+                try:
+                    with open(self._path(key)) as f:
+                        profile = self.profiles[key] = CollectionProfile.from_state(json.load(f))
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning(f"[profile] Ignoring unreadable profile of {key}: {e}")
+            return profile
+
+    def _save(self, key: str, profile: CollectionProfile):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w") as f:
+            json.dump(profile.to_state(), f)
+        os.replace(path + ".tmp", path)
+        with self._lock:
+            self.profiles[key] = profile
+
+    def status(self, key: str) -> dict | None:
+        """The running or last finished refresh of a collection."""
+        refresh = self.refreshes.get(key)
+        return refresh.to_dict() if refresh is not None else None
+
+    def stale(self, key: str, schema: list[tuple[str, str]]) -> bool:
+        """No profile yet, a changed schema, or not refreshed for refresh_after seconds."""
+        profile = self.get(key)
+        return (
+            profile is None
+            or profile.schema() != schema
+            or time.time() - (profile.updated_at or 0) > self.refresh_after
+        )
+
+    def refresh(self, key: str, collection: Any, schema: list[tuple[str, str]], full: bool = False) -> ProfileRefresh:
+        """Start a refresh in a copy of the caller's context, unless one is already running."""
+        with self._lock:
+            refresh = self.refreshes.get(key)
+            if refresh is not None and refresh.status == "running":
+                return refresh
+            refresh = self.refreshes[key] = ProfileRefresh("full" if full else "incremental", self._cancel)
+        self._executor.submit(contextvars.copy_context().run, self._run, key, collection, schema, refresh)
+        return refresh
+
+    def _run(self, key: str, collection: Any, schema: list[tuple[str, str]], refresh: ProfileRefresh):
+        try:
+            refresh.total = collection.aggregate.over_all(total_count=True).total_count
+            profile = self.get(key)
+            if (
+                refresh.mode == "incremental"
+                and profile is not None
+                and profile.incremental
+                and profile.schema() == schema
+            ):
+                # Update a copy; readers keep summarising the saved profile meanwhile
+                profile = CollectionProfile.from_state(profile.to_state())
+                try:
+                    update_profile(collection, profile, refresh, self.page_size, self.max_page)
+                except TiedUpdates as e:
+                    logger.info(f"[profile] {key}: {e}, rescanning")
+                else:
+                    profile.deleted = max(profile.objects - profile.updated - refresh.total, 0)
+                    if profile.drift() <= self.rebuild_ratio:
+                        self._save(key, profile)
+                        refresh.status = "done"
+                        return
+                    logger.info(f"[profile] {key} drifted by {profile.drift():.0%}, rescanning")
+            refresh.mode = "full"
+            refresh.processed = 0
+            start = time.perf_counter()
+            profile = scan_profile(collection, schema, refresh)
+            self._save(key, profile)
+            logger.info(f"[profile] Scanned {profile.objects} objects of {key} in {time.perf_counter() - start:.1f}s")
+            refresh.status = "done"
+        except RefreshCancelled:
+            refresh.status = "cancelled"
+        except Exception as e:
+            logger.exception(f"[profile] Refreshing {key} failed")
+            refresh.status = "failed"
+            refresh.error = str(e)
+        finally:
+            refresh.finished_at = time.time()
+
+    def close(self):
+        self._cancel.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,97 @@
+"""
+Vector projection.
+Collects object vectors into a float32 matrix and reduces them to 2 or 3
+dimensions with PCA or a Gaussian random projection, for scatter plots.
+"""
+
+import base64
+from typing import Any, Iterable, Literal
+
+import numpy as np
+
+ProjectionMethod = Literal["pca", "random"]
+
+
+class VectorError(ValueError):
+    """Objects have no usable vector (missing, unknown name, multi-vector or mixed dimensions)."""
+
+
+def pick_vector(vector: Any, vector_name: str | None) -> Any:
+    """Select the vector to use from an object's vector (a list, or a dict of named vectors)."""
+    if not isinstance(vector, dict):
+        return vector
+    if vector_name is not None:
+        if vector_name not in vector:
+            raise VectorError(f"Object has no vector named {vector_name!r} (has: {', '.join(vector)})")
+        return vector[vector_name]
+    if "default" in vector:
+        return vector["default"]
+    if len(vector) == 1:
+        return next(iter(vector.values()))
+    raise VectorError(f"Collection has named vectors, pick one with vector_name: {', '.join(vector)}")
+
+
+def collect_vectors(
+    objects: Iterable[Any],
+    limit: int,
+    vector_name: str | None = None,
+    label: str | None = None,
+) -> tuple[list[str], np.ndarray, list | None, bool]:
+    """
+    Read up to limit objects into (uuids, float32 matrix, labels, truncated).
+    Objects without a vector are skipped; truncated means more objects were available.
+    """
+    uuids: list[str] = []
+    labels: list | None = [] if label else None
+    matrix: np.ndarray | None = None
+    for obj in objects:
+        if len(uuids) >= limit:
+            return uuids, matrix, labels, True
+        vector = pick_vector(obj.vector, vector_name) if obj.vector else None
+        if not vector:
+            continue
+        if isinstance(vector[0], (list, tuple)):
+            raise VectorError("Multi-vector embeddings cannot be projected")
+        if matrix is None:
+            matrix = np.empty((limit, len(vector)), dtype=np.float32)
+        elif len(vector) != matrix.shape[1]:
+            raise VectorError(f"Mixed vector dimensions: {len(vector)} and {matrix.shape[1]}")
+        matrix[len(uuids)] = vector
+        uuids.append(str(obj.uuid))
+        if labels is not None:
+            labels.append(obj.properties.get(label))
+    if matrix is None:
+        raise VectorError("No objects with vectors")
+    return uuids, matrix[:len(uuids)], labels, False
+
+
+def pca(matrix: np.ndarray, dimensions: int, fit_rows: int = 10_000, seed: int = 0) -> tuple[np.ndarray, list[float]]:
+    """
+    Project onto the top principal components; returns (points, explained variance ratios).
+    Components are fitted on at most fit_rows randomly chosen rows, then applied to all rows.
+    """
+    mean = matrix.mean(axis=0)
+    fit = matrix
+    if len(matrix) > fit_rows:
+        fit = matrix[np.random.default_rng(seed).choice(len(matrix), fit_rows, replace=False)]
+    centered = fit - mean
+    # Eigen-decomposition of the d x d covariance is cheaper than an SVD of the n x d matrix
+    covariance = centered.T @ centered / max(len(fit) - 1, 1)
+    eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+    order = np.argsort(eigenvalues)[::-1][:dimensions]
+    components = eigenvectors[:, order]
+    total = eigenvalues.sum()
+    ratios = [float(v / total) if total > 0 else 0.0 for v in eigenvalues[order]]
+    return ((matrix - mean) @ components).astype(np.float32), ratios
+
+
+def random_projection(matrix: np.ndarray, dimensions: int, seed: int = 0) -> np.ndarray:
+    """Gaussian random projection: one matrix product, distances preserved only roughly."""
+    rng = np.random.default_rng(seed)
+    basis = rng.standard_normal((matrix.shape[1], dimensions)).astype(np.float32) / np.sqrt(dimensions)
+    return (matrix - matrix.mean(axis=0)) @ basis
+
+
+def encode_points(points: np.ndarray) -> str:
+    """Base64 of the row-major little-endian float32 buffer (Float32Array in the browser)."""
+    return base64.b64encode(np.ascontiguousarray(points, dtype="<f4").tobytes()).decode()
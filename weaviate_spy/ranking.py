@@ -0,0 +1,77 @@
+"""
+Result list comparison and retrieval quality.
+Overlap and rank correlation between ranked lists of object UUIDs, used to
+compare search modes and parameter sweeps side by side, and recall@k, reciprocal
+rank and nDCG@k of a ranked list against graded relevance judgements.
+"""
+
+import math
+
+
+def overlap_stats(a: list[str], b: list[str]) -> dict:
+    """Shared items, Jaccard similarity and Kendall tau (over the shared items) of two ranked lists."""
+    common = set(a) & set(b)
+    union = set(a) | set(b)
+    return {
+        "overlap": len(common),
+        "jaccard": len(common) / len(union) if union else 1.0,
+        "kendall_tau": kendall_tau(a, b),
+    }
+
+
+def kendall_tau(a: list[str], b: list[str]) -> float | None:
+    """
+    Kendall rank correlation of the items both lists contain, in [-1, 1].
+    None when fewer than two items are shared.
+    """
+    rank_b = {item: i for i, item in enumerate(b)}
+    shared = [rank_b[item] for item in a if item in rank_b]
+    n = len(shared)
+    if n < 2:
+        return None
+    concordant = discordant = 0
+    for i in range(n):
+        for j in range(i + 1, n):
+            if shared[i] < shared[j]:
+                concordant += 1
+            else:
+                discordant += 1
+    return (concordant - discordant) / (n * (n - 1) / 2)
+
+
+def recall_at_k(ranked: list[str], relevant: dict[str, float], k: int) -> float:
+    """Share of the relevant items (grade > 0) found in the top k."""
+    wanted = {item for item, grade in relevant.items() if grade > 0}
+    if not wanted:
+        return 0.0
+    return len(wanted.intersection(ranked[:k])) / len(wanted)
+
+
+def reciprocal_rank(ranked: list[str], relevant: dict[str, float], k: int | None = None) -> float:
+    """1 / position of the first relevant item within the top k, 0 when there is none."""
+    for position, item in enumerate(ranked[:k], start=1):
+        if relevant.get(item, 0) > 0:
+            return 1.0 / position
+    return 0.0
+
+
+def ndcg_at_k(ranked: list[str], relevant: dict[str, float], k: int) -> float:
+    """Normalised discounted cumulative gain of the top k, with gain 2^grade - 1."""
+    dcg = sum((2 ** relevant.get(item, 0) - 1) / math.log2(i + 2) for i, item in enumerate(ranked[:k]))
+    ideal = sorted((g for g in relevant.values() if g > 0), reverse=True)[:k]
+    idcg = sum((2 ** g - 1) / math.log2(i + 2) for i, g in enumerate(ideal))
+    return dcg / idcg if idcg else 0.0
+
+
+def pareto_front(points: list[tuple[float, float]]) -> list[bool]:
+    """
+    For (quality, cost) points, whether each is Pareto-optimal: no other point has
+    quality at least as high and cost at least as low, and is strictly better in one.
+    """
+    return [
+        not any(
+            q2 >= q and c2 <= c and (q2 > q or c2 < c)
+            for j, (q2, c2) in enumerate(points) if j != i
+        )
+        for i, (q, c) in enumerate(points)
+    ]
@@ -0,0 +1,53 @@
+"""
+Result reranking for fused searches.
+A pluggable Reranker scores (query, passage) pairs; the built-in one is a local
+sentence-transformers cross-encoder, loaded on first use so startup stays fast.
+"""
+
+import threading
+from typing import Any, Protocol
+
+from loguru import logger
+
+
+class Reranker(Protocol):
+    """Anything that scores passages against a query, higher is more relevant. Tests can pass a stub."""
+
+    model: str
+
+    def score(self, query: str, texts: list[str]) -> list[float]:
+        ...
+
+
+class CrossEncoderReranker:
+    """Local cross-encoder reranker. Requires sentence-transformers."""
+
+    def __init__(self, model: str, batch_size: int = 32):
+        self.model = model
+        self.batch_size = batch_size
+        self._encoder: Any = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Any:
+        with self._lock:
+            if self._encoder is None:
+                from sentence_transformers import CrossEncoder
+
+                logger.info(f"Loading cross-encoder {self.model}")
+                self._encoder = CrossEncoder(self.model)
+            return self._encoder
+
+    def score(self, query: str, texts: list[str]) -> list[float]:
+        if not texts:
+            return []
+        encoder = self._encoder or self._load()
+        return [float(s) for s in encoder.predict([(query, text) for text in texts], batch_size=self.batch_size)]
+
+
+def build_reranker(kind: str, model: str) -> Reranker | None:
+    """Build the configured reranker, or None when reranking is off."""
+    if not kind:
+        return None
+    if kind != "cross-encoder":
+        raise ValueError(f"Unknown reranker: {kind}")
+    return CrossEncoderReranker(model)
@@ -0,0 +1,137 @@
+"""
+Compact response serialization.
+Columnar result pages (one array per property plus a shared uuid array) and an
+orjson-backed response class that skips FastAPI's jsonable_encoder pass.
+"""
+
+from typing import Any, Literal
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+# "rows" - list of flat objects (format_object); "columnar" - arrays per property
+ResponseFormat = Literal["rows", "columnar"]
+
+METADATA_FIELDS = ("certainty", "distance", "score", "explain_score")
+
+
+def _default(value: Any) -> Any:
+    """Fallback for types orjson does not know (e.g. Weaviate geo/phone values)."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    return str(value)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson; content is not passed through jsonable_encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def columnar_objects(objects: list, property_names: list[str], preview_chars: int | None = None) -> dict:
+    """
+    Lay out result objects column by column.
+    List properties stay arrays; metadata columns are only included when set on some object.
+    With preview_chars, long text values are cut and their row indices listed under "truncated".
+    """
+    properties = {name: [None] * len(objects) for name in property_names}
+    metadata = {name: [None] * len(objects) for name in METADATA_FIELDS}
+    uuids = []
+    for i, obj in enumerate(objects):
+        uuids.append(str(obj.uuid))
+        values = obj.properties
+        for name, column in properties.items():
+            column[i] = values.get(name)
+        meta = obj.metadata
+        if meta is not None:
+            for name, column in metadata.items():
+                column[i] = getattr(meta, name, None)
+    result = {
+        "uuid": uuids,
+        "properties": properties,
+        "metadata": {
+            name: column for name, column in metadata.items()
+            if any(value is not None for value in column)
+        },
+    }
+    if preview_chars is not None:
+        truncated = {}
+        for name, column in properties.items():
+            rows = [i for i, value in enumerate(column) if isinstance(value, str) and len(value) > preview_chars]
+            for i in rows:
+                column[i] = column[i][:preview_chars]
+            if rows:
+                truncated[name] = rows
+        result["truncated"] = truncated
+    return result
+
+
+def extract_properties(obj: Any, property_names: list[str]) -> dict:
+    """Extract properties from a Weaviate object."""
+    result = {}
+    for prop in property_names:
+        value = obj.properties.get(prop)
+        if isinstance(value, list):
+            result[prop] = ", ".join(str(v) for v in value)
+        else:
+            result[prop] = value
+    return result
+
+
+def truncate_previews(values: dict, preview_chars: int) -> list[str]:
+    """Cut text values longer than preview_chars in place. Returns the truncated property names."""
+    truncated = []
+    for prop, value in values.items():
+        if isinstance(value, str) and len(value) > preview_chars:
+            values[prop] = value[:preview_chars]
+            truncated.append(prop)
+    return truncated
+
+
+def format_object(obj: Any, property_names: list[str], preview_chars: int | None = None) -> dict:
+    """
+    Format a Weaviate object for API response.
+    With preview_chars, long text values are cut and listed under "truncated".
+    """
+    result = extract_properties(obj, property_names)
+    if preview_chars is not None:
+        truncated = truncate_previews(result, preview_chars)
+        if truncated:
+            result["truncated"] = truncated
+    uuid = str(obj.uuid)
+    result["uuid"] = uuid
+    result["key"] = uuid
+    
+    # Add metadata if available
+    if obj.metadata:
+        if hasattr(obj.metadata, "certainty"):
+            result["certainty"] = obj.metadata.certainty
+        if hasattr(obj.metadata, "distance"):
+            result["distance"] = obj.metadata.distance
+        if hasattr(obj.metadata, "score"):
+            result["score"] = obj.metadata.score
+        if hasattr(obj.metadata, "explain_score"):
+            result["explain_score"] = obj.metadata.explain_score
+    
+    return result
+
+
+def serialize_objects(
+    objects: list,
+    property_names: list[str],
+    format: ResponseFormat,
+    preview_chars: int | None = None,
+) -> list[dict] | dict:
+    """Shape result objects as rows (format_object) or as columns."""
+    if format == "columnar":
+        return columnar_objects(objects, property_names, preview_chars)
+    return [format_object(obj, property_names, preview_chars) for obj in objects]
+
+
+def render_response(payload: dict, format: ResponseFormat, headers: dict) -> JSONResponse:
+    """Serialize a search payload: orjson for columnar pages, FastAPI's encoder for rows."""
+    if format == "columnar":
+        return ORJSONResponse(payload, headers=headers)
+    return JSONResponse(jsonable_encoder(payload), headers=headers)
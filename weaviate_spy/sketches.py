@@ -0,0 +1,171 @@
+"""
+Streaming sketches for collection profiling.
+Fixed-size summaries that are updated one value at a time and serialise to
+JSON: HyperLogLog distinct counts, merging t-digest quantiles and a top-k
+frequency counter with batched eviction.
+"""
+
+import base64
+import hashlib
+import math
+from typing import Any
+
+import numpy as np
+
+
+class HyperLogLog:
+    """Distinct-count estimate with 2^p one-byte registers (p=12: 4 KiB, about 1.6% error)."""
+
+    def __init__(self, p: int = 12):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def add(self, value: Any):
+        h = int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), "big")
+        index = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = 64 - self.p - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.ldexp(1.0, -self.registers.astype(np.int32)).sum()
+        zeros = int((self.registers == 0).sum())
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate while many registers are still empty
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+    def to_state(self) -> dict:
+        return {"p": self.p, "registers": base64.b64encode(self.registers.tobytes()).decode()}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "HyperLogLog":
+        sketch = cls(state["p"])
+        sketch.registers = np.frombuffer(base64.b64decode(state["registers"]), dtype=np.uint8).copy()
+        return sketch
+
+
+class TDigest:
+    """
+    Merging t-digest: values are buffered and merged into at most about `compression`
+    centroids, kept small near the tails so extreme quantiles stay accurate.
+    """
+
+    def __init__(self, compression: int = 100):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer: list[float] = []
+
+    def add(self, value: float):
+        self._buffer.append(value)
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self._buffer) >= 10 * self.compression:
+            self._merge()
+
+    def _scale(self, q: np.ndarray | float) -> np.ndarray | float:
+        """k1 scale function: centroid sizes shrink towards q = 0 and q = 1."""
+        return self.compression / (2 * math.pi) * np.arcsin(2 * np.clip(q, 0, 1) - 1)
+
+    def _merge(self):
+        if not self._buffer:
+            return
+        means = np.concatenate([self.means, self._buffer])
+        weights = np.concatenate([self.weights, np.ones(len(self._buffer))])
+        self._buffer = []
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+
+        merged_means, merged_weights = [means[0]], [weights[0]]
+        done = 0.0
+        k_left = self._scale(0.0)
+        for mean, weight in zip(means[1:], weights[1:]):
+            if self._scale((done + merged_weights[-1] + weight) / total) - k_left <= 1:
+                w = merged_weights[-1] + weight
+                merged_means[-1] += (mean - merged_means[-1]) * weight / w
+                merged_weights[-1] = w
+            else:
+                done += merged_weights[-1]
+                k_left = self._scale(done / total)
+                merged_means.append(mean)
+                merged_weights.append(weight)
+        self.means = np.asarray(merged_means)
+        self.weights = np.asarray(merged_weights)
+
+    def quantile(self, q: float) -> float | None:
+        self._merge()
+        if not self.count:
+            return None
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], centers, [self.count]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(q * self.count, positions, values))
+
+    def mean(self) -> float | None:
+        self._merge()
+        return float((self.means * self.weights).sum() / self.count) if self.count else None
+
+    def to_state(self) -> dict:
+        self._merge()
+        return {
+            "compression": self.compression,
+            "means": self.means.tolist(),
+            "weights": self.weights.tolist(),
+            "count": self.count,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "TDigest":
+        sketch = cls(state["compression"])
+        sketch.means = np.asarray(state["means"], dtype=np.float64)
+        sketch.weights = np.asarray(state["weights"], dtype=np.float64)
+        sketch.count = state["count"]
+        if sketch.count:
+            sketch.min, sketch.max = state["min"], state["max"]
+        return sketch
+
+
+class TopK:
+    """
+    Approximate most frequent values. Counts are exact until more than 4 x capacity
+    distinct values are tracked; then all but the top `capacity` are dropped, and
+    `error` (the largest dropped count) bounds how much any count may be undercounted.
+    """
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self.counts: dict[Any, int] = {}
+        self.error = 0
+
+    def add(self, value: Any):
+        self.counts[value] = self.counts.get(value, 0) + 1
+        if len(self.counts) > 4 * self.capacity:
+            ranked = sorted(self.counts.items(), key=lambda item: -item[1])
+            self.error = max(self.error, ranked[self.capacity][1])
+            self.counts = dict(ranked[:self.capacity])
+
+    def top(self, k: int) -> list[tuple[Any, int]]:
+        return sorted(self.counts.items(), key=lambda item: -item[1])[:k]
+
+    def to_state(self) -> dict:
+        return {"capacity": self.capacity, "counts": [[v, c] for v, c in self.top(self.capacity)], "error": self.error}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "TopK":
+        sketch = cls(state["capacity"])
+        sketch.counts = {value: count for value, count in state["counts"]}
+        sketch.error = state["error"]
+        return sketch
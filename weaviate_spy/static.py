@@ -0,0 +1,156 @@
+"""
+Static frontend serving.
+Serves the Vite bundle from precompressed brotli/gzip variants written next to each
+file at image build time (python -m weaviate_spy.static static), so nothing is
+compressed per request. Content-hashed assets are cached as immutable; everything
+else (index.html) is revalidated with its ETag and answered 304 when unchanged.
+
+Build-time brotli comes from requirements.txt; without it only gzip variants are written.
+"""
+
+import argparse
+import gzip
+import mimetypes
+import os
+import re
+import sys
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# Preferred first; suffix of the variant file next to the original
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+COMPRESSIBLE = (".html", ".js", ".mjs", ".css", ".svg", ".json", ".map", ".txt", ".xml", ".ico", ".wasm")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+# Vite's default output: assets/<name>-<8 char hash>.<ext>
+HASHED_ASSET = re.compile(r"(^|[\\/])assets[\\/][^\\/]+-[A-Za-z0-9_-]{8}\.\w+$")
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """Codings in an Accept-Encoding header, without those refused with q=0."""
+    accepted = set()
+    for part in header.split(","):
+        coding, *params = [item.strip() for item in part.split(";")]
+        q = next((param[2:] for param in params if param.startswith("q=")), "1")
+        try:
+            weight = float(q)
+        except ValueError:
+            continue
+        if coding and weight > 0:
+            accepted.add(coding.lower())
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that prefers .br/.gz variants and sets Cache-Control by whether names are content-hashed."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Original path -> (original mtime, [(encoding, variant path, variant stat)])
+        self._variants: dict[str, tuple[float, list[tuple[str, str, os.stat_result]]]] = {}
+
+    def _lookup_variants(self, path: str, stat_result: os.stat_result) -> list[tuple[str, str, os.stat_result]]:
+        cached = self._variants.get(path)
+        if cached is not None and cached[0] == stat_result.st_mtime:
+            return cached[1]
+        variants = []
+        for encoding, suffix in ENCODINGS:
+            try:
+                variant_stat = os.stat(path + suffix)
+            except OSError:
+                continue
+            # A variant older than its original is left over from a previous build
+            if variant_stat.st_mtime >= stat_result.st_mtime:
+                variants.append((encoding, path + suffix, variant_stat))
+        self._variants[path] = (stat_result.st_mtime, variants)
+        return variants
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        path = os.fspath(full_path)
+        headers = {"Cache-Control": IMMUTABLE if HASHED_ASSET.search(path) else REVALIDATE}
+        variants = self._lookup_variants(path, stat_result)
+        response = None
+        if variants:
+            headers["Vary"] = "Accept-Encoding"
+            accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+            for encoding, variant_path, variant_stat in variants:
+                if encoding in accepted:
+                    # The variant's own stat gives each encoding a distinct ETag and length
+                    response = FileResponse(
+                        variant_path,
+                        status_code=status_code,
+                        headers={**headers, "Content-Encoding": encoding},
+                        media_type=mimetypes.guess_type(path)[0] or "text/plain",
+                        stat_result=variant_stat,
+                    )
+                    break
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, headers=headers, stat_result=stat_result)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def precompress(directory: str, min_size: int = 512) -> tuple[int, int, int]:
+    """
+    Write .gz (and .br when brotli is installed) next to every compressible file of at
+    least min_size bytes, keeping only variants smaller than the original.
+    Returns (files, original bytes, smallest variant bytes).
+    """
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+        print("brotli not installed, writing gzip variants only", file=sys.stderr)
+
+    files = original = compressed = 0
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if not name.endswith(COMPRESSIBLE):
+                continue
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                data = f.read()
+            if len(data) < min_size:
+                continue
+            variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                variants[".br"] = brotli.compress(data, quality=11)
+            smallest = len(data)
+            for suffix, body in variants.items():
+                if len(body) < len(data):
+                    with open(path + suffix, "wb") as f:
+                        f.write(body)
+                    smallest = min(smallest, len(body))
+            files += 1
+            original += len(data)
+            compressed += smallest
+    return files, original, compressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompress a static frontend build (brotli and gzip)")
+    parser.add_argument("directory", help="Build output, e.g. static or frontend/dist")
+    parser.add_argument("--min-size", type=int, default=512, help="Skip smaller files (bytes)")
+    args = parser.parse_args()
+    if not os.path.isdir(args.directory):
+        print(f"Not a directory: {args.directory}", file=sys.stderr)
+        return 2
+    files, original, compressed = precompress(args.directory, args.min_size)
+    print(f"Precompressed {files} files: {original} -> {compressed} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())